@@ -0,0 +1,175 @@
+"""
+BENCHMARK DOS COLETORES (OFFLINE)
+Sobe os servidores de benchmarks/servidores.py, aponta cada coletor para eles
+e mede tempo total, vazão (unidades/s) e latência por unidade de trabalho
+(site, gráfico, painel, linha do Pulsar), lidas do manifesto de execução.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.coletores
+    python -m benchmarks.coletores --coletores reme,graficos --hosts 10000 --latencia-ms 30
+    python -m benchmarks.coletores --sites 200 --json resultado.json
+
+Pulsar precisa de Chromium + chromedriver; sem eles é pulado (a não ser com PULSAR_MODO=api). Sites roda sem navegador,
+mas aí as páginas que só funcionam com JS saem como "navegador indisponível".
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from benchmarks.servidores import iniciar_servidores, parar_servidores
+
+# Categoria do manifesto que representa a "unidade de trabalho" de cada coletor
+UNIDADES = {
+    "providers": None,
+    "graficos": "grafico",
+    "reme": "painel_grafana",
+    "pulsar": "pulsar_linha",
+    "sites": "site",
+}
+
+def percentil(valores, p):
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    k = max(0, min(len(ordenados) - 1, round(p / 100 * len(ordenados) + 0.5) - 1))
+    return ordenados[k]
+
+def navegador_disponivel():
+    return any(shutil.which(b) for b in ("chromium", "chromium-browser", "google-chrome", "chrome"))
+
+def configurar(urls, sites_json):
+    """Aponta as constantes dos módulos para os servidores locais e devolve {nome: funcao}"""
+    from modules import providers, graficos, reme, pulsar, pulsar_api, sites
+
+    for item in providers.PROVEDORES + providers.TUNEIS:
+        item["teste"] = item["teste"].split()[0] + " 127.0.0.1"
+        item["timeout"], item["count"] = 1, 1
+
+    for n in ("1", "2", "3"):
+        setattr(graficos, f"ZABBIX{n}_URL", urls["zabbix"])
+        setattr(graficos, f"ZABBIX{n}_USER", "bench")
+        setattr(graficos, f"ZABBIX{n}_PASS", "bench")
+
+    reme.ZABBIX_API_URL = urls["zabbix_api"]
+    reme.GRAFANA_URL = urls["grafana"]
+    reme.GRAFANA_TOKEN = "bench"
+    reme.USERNAME = reme.PASSWORD = "bench"
+
+    pulsar.LOGIN_URL = urls["pulsar_login"]
+    pulsar.STARLINK_URL = urls["pulsar_starlink"]
+    pulsar.USER_EMAIL = pulsar.USER_PASSWORD = "bench"
+    pulsar_api.API_LOGIN = urls["pulsar_api_login"]
+    pulsar_api.API_TERMINAIS = urls["pulsar_api_terminais"]
+    pulsar_api.USER_EMAIL = pulsar_api.USER_PASSWORD = "bench"
+
+    Path(sites_json).write_text(json.dumps(urls["sites"]), encoding="utf-8")
+    sites.JSON_FILE = str(sites_json)
+
+    return {
+        "providers": providers.collect_providers_data,
+        "graficos": graficos.collect_graph_images,
+        "reme": reme.collect_reme_data,
+        "pulsar": lambda: pulsar.extrair_dados_starlink(headless=True),
+        "sites": sites.collect_sites_data,
+    }
+
+def medir(nome, funcao, repeticoes):
+    from modules import manifesto
+
+    execucoes = []
+    for _ in range(repeticoes):
+        manifesto.iniciar()
+        inicio = time.perf_counter()
+        erro = None
+        try:
+            funcao()
+        except BaseException as e:
+            erro = str(e) or e.__class__.__name__
+        total = time.perf_counter() - inicio
+        unidades = manifesto.etapas(UNIDADES[nome]) if UNIDADES[nome] else []
+        esperas = manifesto.etapas("espera")
+        execucoes.append({"total_s": total, "erro": erro, "latencias": [u["duracao"] for u in unidades],
+                          "espera_s": sum(e["duracao"] for e in esperas),
+                          "esperas_timeout": sum(1 for e in esperas if e["resultado"] == "timeout")})
+
+    latencias = [l for e in execucoes for l in e["latencias"]]
+    total_medio = sum(e["total_s"] for e in execucoes) / len(execucoes)
+    unidades_por_exec = len(latencias) / len(execucoes)
+    return {
+        "coletor": nome,
+        "repeticoes": repeticoes,
+        "total_s": round(total_medio, 3),
+        "unidades": unidades_por_exec,
+        "vazao_por_s": round(unidades_por_exec / total_medio, 2) if total_medio and latencias else None,
+        "latencia_p50_s": percentil(latencias, 50),
+        "latencia_p95_s": percentil(latencias, 95),
+        "latencia_max_s": max(latencias) if latencias else None,
+        # Tempo parado em esperas por condição (Selenium) e quantas estouraram o timeout
+        "espera_s": round(sum(e["espera_s"] for e in execucoes) / len(execucoes), 3),
+        "esperas_timeout": sum(e["esperas_timeout"] for e in execucoes),
+        "erros": [e["erro"] for e in execucoes if e["erro"]],
+    }
+
+def imprimir(resultados):
+    print(f"\n{'COLETOR':<10} {'TOTAL(s)':>9} {'UNID':>6} {'UNID/s':>8} {'p50(s)':>8} {'p95(s)':>8} {'max(s)':>8} {'ESPERA(s)':>10}")
+    fmt = lambda v: f"{v:.3f}" if isinstance(v, float) else ("-" if v is None else str(v))
+    for r in resultados:
+        print(f"{r['coletor']:<10} {r['total_s']:>9.3f} {r['unidades']:>6.0f} {fmt(r['vazao_por_s']):>8} "
+              f"{fmt(r['latencia_p50_s']):>8} {fmt(r['latencia_p95_s']):>8} {fmt(r['latencia_max_s']):>8} {r['espera_s']:>10.3f}"
+              + (f"   ⚠ {r['erros'][0][:60]}" if r["erros"] else ""))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline dos coletores do relatório")
+    parser.add_argument("--coletores", default="providers,graficos,reme,pulsar,sites",
+                        help="lista separada por vírgula")
+    parser.add_argument("--sites", type=int, default=48)
+    parser.add_argument("--hosts", type=int, default=500, help="hosts no host.get do Zabbix falso")
+    parser.add_argument("--secoes", type=int, default=4, help="seções do dashboard do Grafana falso")
+    parser.add_argument("--paineis", type=int, default=12, help="painéis por seção")
+    parser.add_argument("--terminais", type=int, default=45, help="linhas na tabela do Pulsar falso")
+    parser.add_argument("--latencia-ms", type=float, default=20, help="latência artificial por requisição")
+    parser.add_argument("--repeticoes", type=int, default=1)
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args()
+
+    destino_json = Path(args.json).resolve() if args.json else None
+    servidores, urls = iniciar_servidores(sites=args.sites, hosts=args.hosts, secoes=args.secoes,
+                                          paineis=args.paineis, terminais=args.terminais,
+                                          latencia_ms=args.latencia_ms)
+    pasta = tempfile.mkdtemp(prefix="orf-bench-")
+    cwd = os.getcwd()
+    try:
+        # Os módulos gravam em caminhos relativos (output/...): roda tudo numa pasta temporária
+        os.chdir(pasta)
+        funcoes = configurar(urls, Path(pasta) / "sites.json")
+
+        resultados = []
+        for nome in [c.strip() for c in args.coletores.split(",") if c.strip()]:
+            if nome not in funcoes:
+                print(f"⚠ Coletor desconhecido: {nome}")
+                continue
+            if nome == "pulsar" and not navegador_disponivel() and os.getenv("PULSAR_MODO") != "api":
+                print(f"⚠ Pulando '{nome}': Chromium não encontrado")
+                continue
+            print(f"\n>>> Benchmark: {nome}")
+            resultados.append(medir(nome, funcoes[nome], args.repeticoes))
+
+        imprimir(resultados)
+        if destino_json:
+            destino_json.write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding="utf-8")
+            print(f"\n>> Resultados gravados em {destino_json}")
+    finally:
+        os.chdir(cwd)
+        parar_servidores(servidores)
+        shutil.rmtree(pasta, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
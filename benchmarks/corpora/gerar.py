@@ -0,0 +1,73 @@
+"""
+Gera os corpora sintéticos usados por benchmarks/micro.py.
+Os arquivos gerados ficam versionados; rode de novo só se quiser mudar o tamanho base:
+    python -m benchmarks.corpora.gerar
+"""
+import json
+import random
+from pathlib import Path
+
+from benchmarks.servidores import gerar_hosts_zabbix
+
+PASTA = Path(__file__).resolve().parent
+
+def gerar_portal(noticias=600, seed=1):
+    """Portal grande no estilo dos sites .eb.mil.br: scripts, estilos, menus, carrosséis e contadores"""
+    rnd = random.Random(seed)
+    partes = ["<!doctype html><html lang='pt-br'><head><meta charset='utf-8'><title>Portal da OM</title>"]
+    for s in range(15):
+        partes.append(f"<script>window.cfg{s} = {{a: {s}, b: '{'x' * 400}'}};\nfunction f{s}() {{ return {s}; }}</script>")
+    for s in range(6):
+        partes.append(f"<style>.c{s} {{ color: #{s}{s}{s}; margin: {s}px }}\n.d{s} {{ padding: 0 }}</style>")
+    partes.append("</head><body><header id='topo'><nav class='menu-principal'><ul>")
+    partes.extend(f"<li><a href='/secao/{m}'>Seção {m}</a><ul>"
+                  + "".join(f"<li><a href='/secao/{m}/{k}'>Item {m}.{k}</a></li>" for k in range(6))
+                  + "</ul></li>" for m in range(25))
+    partes.append("</ul></nav></header>")
+    for c in range(3):
+        partes.append(f"<div class='carousel slide' id='car{c}'><div class='carousel-inner'>"
+                      + "".join(f"<div class='item'><img src='/images/car{c}_{i}.jpg' alt='Destaque {i}'>"
+                                f"<div class='carousel-caption'>Destaque {c}.{i}</div></div>" for i in range(6))
+                      + "</div></div>")
+    partes.append("<div id='banner-lateral'>" + "".join(f"<img data-src='/img/b{i}.png'>" for i in range(4))
+                  + "<img src='data:image/png;base64,AAAA'></div>")
+    partes.append("<main>")
+    for n in range(noticias):
+        dia, mes = rnd.randint(1, 28), rnd.randint(1, 12)
+        partes.append(
+            f"<article class='noticia'><h2><a href='/noticia/{n}'>Notícia {n}: operação na área {rnd.randint(1, 99)}</a></h2>\n"
+            f"<span class='data'>{dia:02d}/{mes:02d}/2025 {rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}</span>\n"
+            f"<p>{' '.join(rnd.choice(['tropa', 'apoio', 'fronteira', 'logística', 'saúde', 'comunicações', 'instrução', 'rio']) for _ in range(40))}</p>\n"
+            f"<div class='slider-mini'><img src='/thumbs/{n}.jpg'></div>"
+            f"<span class='views'>Visualizações: {rnd.randint(10, 9999)}</span></article>\n")
+    partes.append("</main>")
+    partes.append("<footer><p>Visitas: 123456\nUsuários online: 12\nÚltima atualização 10/11/2025 08:15</p>"
+                  "<p>Exército Brasileiro - Braço Forte, Mão Amiga</p></footer></body></html>")
+    return "".join(partes)
+
+def gerar_linhas_tabelas(quantidade=300, seed=3):
+    """Linhas no formato exato que os coletores entregam para main.generate_unified_report"""
+    rnd = random.Random(seed)
+    return {
+        "provedores": [{"link": f"EMPRESA {i}*", "teste_str": f"ping 10.0.0.{i % 250}", "link_wan": "INTERNET",
+                        "observacao": "(deve passar por 172.30.192.129)" if i % 3 == 0 else "",
+                        "status": rnd.choice(["GREEN", "RED"])} for i in range(quantidade)],
+        "reme": [{"om": f"OM {i} - Área {i % 40}", "ip": f"10.78.{i % 250}.{i % 200 + 1}",
+                  "status": rnd.choice(["UP", "DOWN", "Via BBS", "SEM DADOS"]),
+                  "cor": rnd.choice(["GREEN", "RED", "YELLOW", "GRAY"])} for i in range(quantidade)],
+        "pulsar": [{"om": f"Service Line {i}", "pop": rnd.choice([f"KIT30{4000000 + i:07d}", "KIT304059853", "N/A"]),
+                    "status": rnd.choice(["VERDE", "VERMELHO", "DESCONHECIDO"]), "OCORRÊNCIA": ""} for i in range(quantidade)],
+        "sites": [[str(i + 1), f"OM{i}", f"https://om{i}.eb.mil.br/caminho/{i}", rnd.choice(["S/A", "C.O."]),
+                   rnd.choice(["-", "1", "2"]), rnd.choice(["GREEN", "RED"])] for i in range(quantidade)],
+    }
+
+def main():
+    (PASTA / "portal.html").write_text(gerar_portal(), encoding="utf-8")
+    (PASTA / "zabbix_hosts.json").write_text(json.dumps(gerar_hosts_zabbix(1000), ensure_ascii=False), encoding="utf-8")
+    (PASTA / "linhas_tabelas.json").write_text(json.dumps(gerar_linhas_tabelas(), ensure_ascii=False), encoding="utf-8")
+    for arquivo in sorted(PASTA.glob("*.*")):
+        if arquivo.suffix != ".py":
+            print(f"{arquivo.name}: {arquivo.stat().st_size / 1024:.0f} KB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+MICRO-BENCHMARKS DAS FUNÇÕES PURAS
+Mede ops/s e pico de memória (tracemalloc) das funções chamadas uma vez por item:
+    - sites.normalize_html / sites.extract_image_sets (portal grande, referência BeautifulSoup)
+    - fingerprint.calcular (mesmo hash numa passada só)
+    - reme.clean_host_key / reme.get_best_ip (hosts do Zabbix)
+    - montagem das tabelas do relatorio.gerar_pdf (linhas de tabela)
+
+As entradas vêm de benchmarks/corpora (escala 1 = tamanho realista) e são
+replicadas para as outras escalas (10 = 10k hosts, ~3.8 MB de HTML, 3000 linhas).
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.micro
+    python -m benchmarks.micro --casos html --escalas 1,10 --tempo 2
+    python -m benchmarks.micro --json micro.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+CORPORA = Path(__file__).resolve().parent / "corpora"
+sys.path.insert(0, str(RAIZ))
+
+# --- ENTRADAS ---
+
+def carregar_portal(escala):
+    html = (CORPORA / "portal.html").read_text(encoding="utf-8")
+    inicio, fim = html.index("<main>") + len("<main>"), html.index("</main>")
+    return html[:inicio] + html[inicio:fim] * escala + html[fim:]
+
+def carregar_hosts(escala):
+    base = json.loads((CORPORA / "zabbix_hosts.json").read_text(encoding="utf-8"))
+    return [dict(h, host=f"{h['host']}-{r}", name=f"{h['name']} {r}") for r in range(escala) for h in base]
+
+def carregar_linhas(tabela, escala):
+    base = json.loads((CORPORA / "linhas_tabelas.json").read_text(encoding="utf-8"))[tabela]
+    return base * escala
+
+# --- CASOS ---
+
+def montar_casos():
+    """Retorna [(nome, funcao(entrada), carregar(escala))]; imports atrasados para não pesar no --help"""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from modules import sites, reme, relatorio, fingerprint
+
+    styles = getSampleStyleSheet()
+    style_cell = ParagraphStyle('CellC', fontSize=9)
+
+    return [
+        ("html.normalize_html", sites.normalize_html, carregar_portal),
+        ("html.extract_image_sets", sites.extract_image_sets, carregar_portal),
+        ("html.fingerprint", fingerprint.calcular, carregar_portal),
+        ("hosts.clean_host_key", lambda hosts: [reme.clean_host_key(h["name"]) for h in hosts], carregar_hosts),
+        ("hosts.get_best_ip", lambda hosts: [reme.get_best_ip(h["interfaces"]) for h in hosts], carregar_hosts),
+        ("tabela.provedores", lambda linhas: relatorio.tabela_provedores(linhas, style_cell, style_cell),
+         lambda e: carregar_linhas("provedores", e)),
+        ("tabela.reme", relatorio.tabela_reme, lambda e: carregar_linhas("reme", e)),
+        ("tabela.pulsar", lambda linhas: relatorio.tabela_pulsar(linhas, styles), lambda e: carregar_linhas("pulsar", e)),
+        ("tabela.sites", relatorio.tabela_sites, lambda e: carregar_linhas("sites", e)),
+    ]
+
+def conferir_fingerprint():
+    """O caminho rápido só vale se o hash for idêntico ao da referência BeautifulSoup"""
+    import hashlib
+    from modules import sites, fingerprint
+
+    html = carregar_portal(1)
+    referencia = f"TEXT:{sites.normalize_html(html)}|IMAGES:{sorted(sites.extract_image_sets(html).items())}"
+    igual = hashlib.sha256(referencia.encode("utf-8")).hexdigest() == fingerprint.calcular(html)["hash"]
+    print(f"fingerprint.calcular == normalize_html + extract_image_sets: {'ok' if igual else 'DIVERGENTE'}\n")
+    return igual
+
+# --- MEDIÇÃO ---
+
+def medir(funcao, entrada, tempo_min):
+    funcao(entrada)  # aquecimento
+    execucoes = 0
+    inicio = time.perf_counter()
+    while True:
+        funcao(entrada)
+        execucoes += 1
+        decorrido = time.perf_counter() - inicio
+        if decorrido >= tempo_min and execucoes >= 3:
+            break
+
+    tracemalloc.start()
+    funcao(entrada)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return execucoes / decorrido, decorrido / execucoes, pico
+
+def tamanho(entrada):
+    return len(entrada) if not isinstance(entrada, str) else len(entrada.encode("utf-8"))
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks das funções executadas por item")
+    parser.add_argument("--casos", default="", help="filtro por substring (ex: html, hosts, tabela)")
+    parser.add_argument("--escalas", default="1,10")
+    parser.add_argument("--tempo", type=float, default=1.0, help="tempo mínimo de medição por caso (s)")
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args()
+
+    destino_json = Path(args.json).resolve() if args.json else None
+    escalas = [int(e) for e in args.escalas.split(",") if e.strip()]
+
+    # sites.py cria output/hashes no import: isola numa pasta temporária
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp(prefix="orf-micro-"))
+    try:
+        casos = [c for c in montar_casos() if args.casos in c[0]]
+        if any(c[0].startswith("html.") for c in casos):
+            conferir_fingerprint()
+    finally:
+        os.chdir(cwd)
+
+    resultados = []
+    print(f"{'CASO':<26} {'ESCALA':>6} {'ITENS':>9} {'OPS/s':>10} {'ms/op':>10} {'ITENS/s':>12} {'PICO MB':>9}")
+    for nome, funcao, carregar in casos:
+        for escala in escalas:
+            entrada = carregar(escala)
+            ops, seg_por_op, pico = medir(funcao, entrada, args.tempo)
+            itens = tamanho(entrada)
+            r = {"caso": nome, "escala": escala, "itens": itens, "ops_por_s": round(ops, 3),
+                 "ms_por_op": round(seg_por_op * 1000, 3), "itens_por_s": round(itens * ops, 1),
+                 "pico_mb": round(pico / 1024 / 1024, 2)}
+            resultados.append(r)
+            print(f"{nome:<26} {escala:>6} {itens:>9} {r['ops_por_s']:>10.2f} {r['ms_por_op']:>10.2f} "
+                  f"{r['itens_por_s']:>12.0f} {r['pico_mb']:>9.2f}")
+
+    print("\n(ITENS = bytes de HTML, hosts ou linhas de tabela)")
+    if destino_json:
+        destino_json.write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f">> Resultados gravados em {destino_json}")
+
+if __name__ == "__main__":
+    main()
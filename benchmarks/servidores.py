@@ -0,0 +1,347 @@
+"""
+SERVIDORES DE TESTE (OFFLINE)
+Imitações locais de Grafana, Zabbix, portal Pulsar e dos sites hospedados,
+para medir os coletores sem tocar nos servidores de produção.
+
+Uso isolado (mantém os servidores no ar até Ctrl+C):
+    python -m benchmarks.servidores --sites 48 --latencia-ms 30
+"""
+import argparse
+import json
+import random
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# --- GERAÇÃO DE DADOS SINTÉTICOS ---
+
+def gerar_png(largura=1200, altura=200):
+    """PNG válido (faixas horizontais) sem depender de PIL"""
+    linhas = b"".join(b"\x00" + bytes([(y * 7) % 256, 80, 160]) * largura for y in range(altura))
+    def chunk(tipo, dados):
+        return struct.pack(">I", len(dados)) + tipo + dados + struct.pack(">I", zlib.crc32(tipo + dados) & 0xffffffff)
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", largura, altura, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(linhas, 6))
+            + chunk(b"IEND", b""))
+
+def gerar_hosts_zabbix(quantidade, seed=42):
+    """Lista no formato do host.get com selectInterfaces"""
+    rnd = random.Random(seed)
+    prefixos = ["SW_", "4CTA_", "RTR_", "FG_", ""]
+    hosts = []
+    for i in range(quantidade):
+        nome = f"{rnd.choice(prefixos)}OM-{i:05d} Área {i % 97}"
+        ips = [f"10.147.{i % 250}.{rnd.randint(1, 254)}", f"10.{rnd.choice([78, 79, 83, 90])}.{i % 250}.{rnd.randint(1, 254)}"]
+        if i % 13 == 0:
+            ips.insert(0, "127.0.0.1")
+        hosts.append({"host": f"host-{i}", "name": nome, "interfaces": [{"ip": ip} for ip in ips]})
+    return hosts
+
+def gerar_dashboard(secoes, paineis_por_secao):
+    """Dashboard no formato do /api/dashboards/uid lido por reme.collect_reme_data"""
+    panels = []
+    for s in range(secoes):
+        panels.append({"title": "", "fieldConfig": {"defaults": {"noValue": f"CIDADE-{s}"}}})
+        for p in range(paineis_por_secao):
+            i = s * paineis_por_secao + p
+            item = "Latência BBS" if i % 5 == 0 else "ICMP ping"
+            panels.append({"title": f"OM-{i:05d} Área {i % 97}",
+                           "targets": [{"host": {"filter": f"host-{i}"}, "item": {"filter": item}}]})
+    return {"dashboard": {"uid": "ngTcCD04z", "panels": panels}}
+
+def gerar_terminais(quantidade, seed=7):
+    rnd = random.Random(seed)
+    return [{"serviceLineName": f"OM Satelital {i:03d}", "kitSerialNumber": f"KIT30{4000000 + i * 17:07d}",
+             "online": rnd.random() > 0.2, "usage": f"{rnd.uniform(0, 90):.1f} GB"} for i in range(quantidade)]
+
+def gerar_pagina_site(indice, visitas):
+    """Portal institucional sintético: menu, notícias, carrossel e contador de visitas volátil"""
+    noticias = "".join(
+        f"<article class='noticia'><h3>Notícia {n} da OM {indice}</h3>"
+        f"<p>Texto da notícia {n}. Publicado em 0{n % 9 + 1}/10/2025.</p></article>\n" for n in range(40))
+    imagens = "".join(f"<img src='/static/{indice}/banner{b}.jpg'>" for b in range(5))
+    return (f"<!doctype html><html><head><title>OM {indice}</title>"
+            f"<style>body {{ font-family: sans-serif }}</style><script>var x = {indice};</script></head><body>"
+            f"<nav><ul>" + "".join(f"<li><a href='/m{m}'>Menu {m}</a></li>" for m in range(20)) + "</ul></nav>"
+            f"<div class='carousel slide'>{imagens}</div>"
+            f"<div id='banner-topo'><img data-src='/static/{indice}/topo.png'></div>"
+            f"<main>{noticias}</main>"
+            f"<footer>Visitas: {visitas}\nAcessos hoje: {visitas % 100}\nAtualizado 12:{visitas % 60:02d}</footer>"
+            f"</body></html>")
+
+PAGINA_JS = ("<!doctype html><html><head><title>Portal</title></head><body><div id='root'></div>"
+             "<script>document.getElementById('root').innerHTML = '<h1>Conteúdo renderizado via JS</h1>';</script>"
+             "</body></html>")
+
+LOGIN_PULSAR = """<!doctype html><html><head><title>Pulsar Login</title></head><body>
+<form onsubmit="return false">
+<input name="userName"><input name="password" type="password">
+<button class="loginButton" onclick="document.cookie='sessao=ok; path=/'; location.href='/dashboard'">Login</button>
+</form></body></html>"""
+
+STARLINK_PULSAR = """<!doctype html><html><head><title>Starlink Map</title>
+<style>td,th{padding:4px;border:1px solid #ccc} #tooltip{position:absolute;background:#333;color:#fff;padding:4px}</style>
+</head><body>
+<button id="filtro">Last 7 Days</button>
+<div id="menu" style="display:none"><div id="opcao1d">Last 1 Day</div><button id="apply">Apply</button></div>
+<table><thead><tr><th>Service Line</th><th>Status</th><th>Usage</th></tr></thead><tbody id="corpo"></tbody></table>
+<div>Rows per page: <select id="porPagina"><option>10</option><option>25</option><option>50</option></select>
+<button aria-label="Previous page" id="ant">&lt;</button><button aria-label="Next page" id="prox">&gt;</button></div>
+<div id="tooltip" role="tooltip" style="display:none"></div>
+<script>
+let pagina = 0, porPagina = 10, faixa = '7d', total = 0;
+const corpo = document.getElementById('corpo'), prox = document.getElementById('prox'), tip = document.getElementById('tooltip');
+async function carregar() {
+  const r = await fetch('/api/starlink/terminals?page=' + pagina + '&size=' + porPagina + '&range=' + faixa);
+  const d = await r.json();
+  total = d.total;
+  corpo.innerHTML = d.items.map(t =>
+    '<tr class="MuiTableRow-root"><td>' + t.serviceLineName + '</td><td>' +
+    '<svg width="12" height="12"><circle cx="6" cy="6" r="5" fill="#9e9e9e"></circle></svg>' +
+    '<svg width="12" height="12" data-kit="' + t.kitSerialNumber + '" data-online="' + t.online + '">' +
+    '<circle cx="6" cy="6" r="5" fill="' + (t.online ? '#4caf50' : '#f44336') + '"></circle></svg>' +
+    '</td><td>' + t.usage + '</td></tr>').join('');
+  prox.disabled = (pagina + 1) * porPagina >= total;
+  corpo.querySelectorAll('svg[data-kit]').forEach(s => {
+    s.addEventListener('mouseover', e => setTimeout(() => {
+      tip.textContent = s.dataset.kit + ' ' + (s.dataset.online === 'true' ? 'Online' : 'Offline');
+      const b = s.getBoundingClientRect();
+      tip.style.left = (b.right + 4) + 'px'; tip.style.top = (b.top + window.scrollY) + 'px';
+      tip.style.display = 'block';
+    }, 200));
+    s.addEventListener('mouseout', () => { tip.style.display = 'none'; });
+  });
+}
+document.getElementById('filtro').onclick = () => { document.getElementById('menu').style.display = 'block'; };
+document.getElementById('opcao1d').onclick = () => { faixa = '1d'; };
+document.getElementById('apply').onclick = () => { document.getElementById('menu').style.display = 'none'; pagina = 0; carregar(); };
+document.getElementById('porPagina').onchange = e => { porPagina = parseInt(e.target.value); pagina = 0; carregar(); };
+prox.onclick = () => { pagina += 1; carregar(); };
+document.getElementById('ant').onclick = () => { if (pagina > 0) { pagina -= 1; carregar(); } };
+setTimeout(carregar, 300);
+</script></body></html>"""
+
+# --- HANDLERS ---
+
+class _Handler(BaseHTTPRequestHandler):
+    """Base comum: latência artificial, respostas JSON/HTML e silêncio no log"""
+    latencia = 0.0
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _atrasar(self):
+        if self.latencia:
+            time.sleep(self.latencia)
+
+    def _responder(self, corpo, tipo="text/html; charset=utf-8", status=200, headers=None):
+        if isinstance(corpo, str):
+            corpo = corpo.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(corpo)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _json(self, obj, status=200):
+        self._responder(json.dumps(obj), "application/json", status)
+
+    def _ler_corpo(self):
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(tamanho) if tamanho else b""
+
+class GrafanaHandler(_Handler):
+    dashboard = {}
+
+    def do_GET(self):
+        self._atrasar()
+        if self.path.startswith("/api/dashboards/uid/"):
+            return self._json(self.dashboard)
+        self._json({"message": "not found"}, 404)
+
+    def do_POST(self):
+        self._atrasar()
+        if self.path.startswith("/api/ds/query"):
+            query = json.loads(self._ler_corpo())["queries"][0]
+            host = query.get("host", {}).get("filter", "")
+            n = int(host.rsplit("-", 1)[-1]) if host[-1:].isdigit() else 0
+            valor = 0.15 if "Lat" in query.get("item", {}).get("filter", "") else (0 if n % 11 == 0 else 1)
+            agora = int(time.time() * 1000)
+            frames = [{"data": {"values": [[agora - 60000 * k for k in range(30, 0, -1)],
+                                           [None] * 5 + [valor] * 25]}}]
+            return self._json({"results": {"A": {"frames": frames}}})
+        self._json({"message": "not found"}, 404)
+
+class ZabbixHandler(_Handler):
+    hosts = []
+    png = b""
+
+    def do_GET(self):
+        self._atrasar()
+        caminho = urlparse(self.path).path
+        if caminho in ("/index.php", "/"):
+            if "zbx_session=" in (self.headers.get("Cookie") or ""):
+                return self._responder("<html><body>Dashboard</body></html>")
+            return self._responder('<form><input type="hidden" name="csrf_token" value="tok123">'
+                                   '<input name="enter" value="Sign in"></form>')
+        if caminho == "/chart2.php":
+            if "zbx_session=" not in (self.headers.get("Cookie") or ""):
+                return self._responder("sem sessão", status=403)
+            return self._responder(self.png, "image/png")
+        self._responder("not found", status=404)
+
+    def do_POST(self):
+        self._atrasar()
+        caminho = urlparse(self.path).path
+        corpo = self._ler_corpo()
+        if caminho == "/index.php":
+            return self._responder("ok", headers={"Set-Cookie": "zbx_session=abc; Path=/"})
+        if caminho == "/api_jsonrpc.php":
+            req = json.loads(corpo)
+            if req["method"] == "user.login":
+                return self._json({"jsonrpc": "2.0", "result": "auth-token", "id": req["id"]})
+            if req["method"] == "host.get":
+                return self._json({"jsonrpc": "2.0", "result": self.hosts, "id": req["id"]})
+            return self._json({"jsonrpc": "2.0", "error": {"message": "método"}, "id": req["id"]})
+        self._responder("not found", status=404)
+
+class PulsarHandler(_Handler):
+    """Mapa Starlink (SPA) + API JSON; /api/auth/login devolve token (Bearer) e cookie de sessão"""
+    terminais = []
+    logins = 0
+
+    def _logado(self):
+        return ("sessao=ok" in (self.headers.get("Cookie") or "")
+                or self.headers.get("Authorization") == "Bearer bench-token")
+
+    def do_POST(self):
+        self._atrasar()
+        if urlparse(self.path).path != "/api/auth/login":
+            return self._responder("not found", status=404)
+        credenciais = json.loads(self._ler_corpo() or b"{}")
+        if not credenciais.get("password"):
+            return self._json({"message": "invalid credentials"}, 401)
+        PulsarHandler.logins += 1
+        corpo = json.dumps({"data": {"accessToken": "bench-token", "expiresIn": 3600}})
+        self._responder(corpo, "application/json", headers={"Set-Cookie": "sessao=ok; Path=/"})
+
+    def do_GET(self):
+        self._atrasar()
+        url = urlparse(self.path)
+        if url.path == "/login":
+            return self._responder(LOGIN_PULSAR)
+        if url.path == "/dashboard":
+            return self._responder("<html><body><h1>Dashboard</h1></body></html>")
+        if url.path == "/starlink/starlinkMap":
+            if not self._logado():
+                return self._responder("", status=302, headers={"Location": "/login"})
+            return self._responder(STARLINK_PULSAR)
+        if url.path == "/api/starlink/terminals":
+            if not self._logado():
+                return self._json({"message": "unauthorized"}, 401)
+            q = parse_qs(url.query)
+            pagina, tamanho = int(q.get("page", ["0"])[0]), int(q.get("size", ["10"])[0])
+            itens = self.terminais[pagina * tamanho:(pagina + 1) * tamanho]
+            return self._json({"total": len(self.terminais), "page": pagina, "items": itens})
+        self._responder("not found", status=404)
+
+class SitesHandler(_Handler):
+    """
+    /<i>/ devolve um portal. Alguns índices simulam os casos tratados em sites.py:
+    i % 10 == 6: conteúdo só via JavaScript   i % 10 == 7: redireciona para host externo
+    i % 10 == 8: página "404 - File or directory not found"   i % 10 == 9: redireciona para /error
+    i % 10 == 4: página estática sem validadores   i % 10 == 5: estática com ETag/Last-Modified (responde 304)
+    """
+    visitas = 0
+
+    def do_GET(self):
+        self._atrasar()
+        partes = [p for p in urlparse(self.path).path.split("/") if p]
+        if not partes or not partes[0].isdigit():
+            return self._responder("<html><body>Página de erro</body></html>")
+        indice = int(partes[0])
+        SitesHandler.visitas += 1
+        tipo = indice % 10
+        porta = self.server.server_address[1]
+        if tipo == 6:
+            return self._responder(PAGINA_JS)
+        if tipo == 7:
+            return self._responder("", status=302, headers={"Location": f"http://localhost:{porta}/externo"})
+        if tipo == 8:
+            return self._responder("<html><body><h2>404 - File or directory not found.</h2></body></html>")
+        if tipo == 9:
+            return self._responder("", status=302, headers={"Location": "/error/404"})
+        if tipo == 4:
+            return self._responder(gerar_pagina_site(indice, 0))
+        if tipo == 5:
+            corpo = gerar_pagina_site(indice, 0).encode("utf-8")
+            etag = '"%08x"' % zlib.crc32(corpo)
+            validadores = {"ETag": etag, "Last-Modified": "Wed, 01 Oct 2025 08:00:00 GMT"}
+            if self.headers.get("If-None-Match") == etag:
+                return self._responder(b"", status=304, headers=validadores)
+            return self._responder(corpo, headers=validadores)
+        self._responder(gerar_pagina_site(indice, SitesHandler.visitas))
+
+# --- INICIALIZAÇÃO ---
+
+def _iniciar(handler):
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+def iniciar_servidores(sites=48, hosts=500, secoes=4, paineis=12, terminais=45, latencia_ms=0):
+    """
+    Sobe os quatro servidores em threads e retorna (servidores, urls).
+    urls: {"grafana", "zabbix", "zabbix_api", "pulsar_login", "pulsar_starlink", "pulsar_api_login",
+           "pulsar_api_terminais", "sites": [...]}
+    """
+    latencia = latencia_ms / 1000.0
+    handlers = {
+        "grafana": type("Grafana", (GrafanaHandler,), {"latencia": latencia, "dashboard": gerar_dashboard(secoes, paineis)}),
+        "zabbix": type("Zabbix", (ZabbixHandler,), {"latencia": latencia, "hosts": gerar_hosts_zabbix(hosts), "png": gerar_png()}),
+        "pulsar": type("Pulsar", (PulsarHandler,), {"latencia": latencia, "terminais": gerar_terminais(terminais)}),
+        "sites": type("Sites", (SitesHandler,), {"latencia": latencia}),
+    }
+    servidores = {nome: _iniciar(h) for nome, h in handlers.items()}
+    base = {nome: f"http://127.0.0.1:{s.server_address[1]}" for nome, s in servidores.items()}
+    urls = {
+        "grafana": base["grafana"],
+        "zabbix": base["zabbix"],
+        "zabbix_api": f"{base['zabbix']}/api_jsonrpc.php",
+        "pulsar_login": f"{base['pulsar']}/login",
+        "pulsar_starlink": f"{base['pulsar']}/starlink/starlinkMap",
+        "pulsar_api_login": f"{base['pulsar']}/api/auth/login",
+        "pulsar_api_terminais": f"{base['pulsar']}/api/starlink/terminals?page=0&size=10&range=1d",
+        "sites": [f"{base['sites']}/{i}/" for i in range(sites)],
+    }
+    return servidores, urls
+
+def parar_servidores(servidores):
+    for s in servidores.values():
+        s.shutdown()
+        s.server_close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidores locais que imitam Grafana, Zabbix, Pulsar e os sites")
+    parser.add_argument("--sites", type=int, default=48)
+    parser.add_argument("--hosts", type=int, default=500)
+    parser.add_argument("--terminais", type=int, default=45)
+    parser.add_argument("--latencia-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    servidores, urls = iniciar_servidores(sites=args.sites, hosts=args.hosts,
+                                          terminais=args.terminais, latencia_ms=args.latencia_ms)
+    print(json.dumps({k: v if k != "sites" else f"{v[0]} ... ({len(v)} sites)" for k, v in urls.items()}, indent=2))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        parar_servidores(servidores)
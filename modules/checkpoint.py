@@ -0,0 +1,113 @@
+"""
+CHECKPOINTS DE COLETA
+Salva o resultado de cada coletor bem-sucedido em output/checkpoints/<data>/<coletor>.json.
+Quando o launcher tenta de novo, só os coletores sem checkpoint são executados.
+Imagens (BytesIO) são gravadas como arquivos .png ao lado do JSON.
+"""
+import datetime
+import io
+import json
+import os
+import shutil
+from pathlib import Path
+
+CHECKPOINT_DIR = Path("output/checkpoints")
+# Mesmo limite do launcher.sh: na última tentativa o relatório sai com o que houver
+MAX_TENTATIVAS = int(os.getenv("COLETA_MAX_TENTATIVAS", "10"))
+
+# Progresso parcial dos coletores (ex.: páginas já lidas do Pulsar): só no fluxo completo do
+# relatório. 'collect' e 'report --only' não usam checkpoints e deixam desligado.
+_progresso_ativo = False
+
+def ativar_progresso(ativo=True):
+    global _progresso_ativo
+    _progresso_ativo = ativo
+
+def progresso_ativo():
+    return _progresso_ativo
+
+def get_pasta(data=None):
+    """Pasta de checkpoints do dia (YYYY-MM-DD)"""
+    data = data or datetime.datetime.now().strftime('%Y-%m-%d')
+    return CHECKPOINT_DIR / data
+
+def _gravar_atomico(caminho, conteudo):
+    """Grava em arquivo temporário e renomeia, para nunca deixar um JSON pela metade"""
+    tmp = caminho.with_name(caminho.name + ".tmp")
+    modo = "wb" if isinstance(conteudo, bytes) else "w"
+    with open(tmp, modo, **({} if modo == "wb" else {"encoding": "utf-8"})) as f:
+        f.write(conteudo)
+    os.replace(tmp, caminho)
+
+def codificar(valor, pasta, prefixo, contador):
+    """Converte o retorno do coletor em algo serializável (tuplas viram listas, BytesIO vira .png)"""
+    if isinstance(valor, io.BytesIO):
+        contador[0] += 1
+        nome_arquivo = f"{prefixo}_{contador[0]}.png"
+        _gravar_atomico(pasta / nome_arquivo, valor.getvalue())
+        return {"__arquivo__": nome_arquivo}
+    if isinstance(valor, (list, tuple)):
+        return [codificar(v, pasta, prefixo, contador) for v in valor]
+    if isinstance(valor, dict):
+        return {k: codificar(v, pasta, prefixo, contador) for k, v in valor.items()}
+    return valor
+
+def decodificar(valor, pasta):
+    if isinstance(valor, list):
+        return [decodificar(v, pasta) for v in valor]
+    if isinstance(valor, dict):
+        if set(valor) == {"__arquivo__"}:
+            return io.BytesIO((pasta / valor["__arquivo__"]).read_bytes())
+        return {k: decodificar(v, pasta) for k, v in valor.items()}
+    return valor
+
+def salvar(nome, dados, data=None):
+    """Grava o checkpoint de um coletor"""
+    pasta = get_pasta(data)
+    pasta.mkdir(parents=True, exist_ok=True)
+    conteudo = codificar(dados, pasta, nome, [0])
+    _gravar_atomico(pasta / f"{nome}.json", json.dumps(conteudo, ensure_ascii=False))
+
+def carregar(nome, data=None):
+    """Retorna os dados salvos do coletor ou None se não houver checkpoint válido"""
+    pasta = get_pasta(data)
+    arquivo = pasta / f"{nome}.json"
+    if not arquivo.exists():
+        return None
+    try:
+        return decodificar(json.loads(arquivo.read_text(encoding="utf-8")), pasta)
+    except Exception as e:
+        print(f"⚠ Checkpoint de '{nome}' ilegível, será coletado de novo: {e}")
+        return None
+
+def remover(nome, data=None):
+    """Apaga o checkpoint de um coletor (ou de um progresso parcial que já não serve)"""
+    try:
+        (get_pasta(data) / f"{nome}.json").unlink()
+    except FileNotFoundError:
+        pass
+
+def carregar_todos(nomes, data=None):
+    """Retorna {nome: dados} apenas para os coletores que já têm checkpoint"""
+    salvos = {}
+    for nome in nomes:
+        dados = carregar(nome, data)
+        if dados is not None:
+            salvos[nome] = dados
+    return salvos
+
+def registrar_tentativa(data=None):
+    """Incrementa e retorna o número da tentativa do dia"""
+    pasta = get_pasta(data)
+    pasta.mkdir(parents=True, exist_ok=True)
+    arquivo = pasta / "tentativas"
+    try:
+        tentativa = int(arquivo.read_text().strip()) + 1
+    except (FileNotFoundError, ValueError):
+        tentativa = 1
+    _gravar_atomico(arquivo, str(tentativa))
+    return tentativa
+
+def limpar(data=None):
+    """Remove os checkpoints do dia (chamado depois que o relatório foi gerado)"""
+    shutil.rmtree(get_pasta(data), ignore_errors=True)
@@ -0,0 +1,138 @@
+"""
+ESCALONADOR DE COLETA
+Executa os coletores do relatório em paralelo, cada um com seu próprio prazo.
+Um coletor que estoura o prazo é marcado como indisponível e o relatório segue sem ele.
+"""
+import importlib
+import os
+import threading
+import time
+import traceback
+
+from modules import manifesto
+
+# --- PRAZOS PADRÃO (segundos) ---
+# Podem ser sobrescritos no .env com COLETA_TIMEOUT_<NOME> (ex: COLETA_TIMEOUT_PULSAR=2400)
+TIMEOUTS_PADRAO = {
+    "providers": 180,
+    "graficos": 300,
+    "reme": 600,
+    "pulsar": 1800,
+    "sites": 1200,
+}
+TIMEOUT_GENERICO = 600
+
+# --- REGISTRO DOS COLETORES ---
+# nome -> (módulo, função, argumentos). O módulo só é importado quando o coletor roda,
+# assim 'main.py collect reme' não carrega selenium nem reportlab.
+COLETORES = {
+    "providers": ("modules.providers", "collect_providers_data", {}),
+    "graficos": ("modules.graficos", "collect_graph_images", {}),
+    "reme": ("modules.reme", "collect_reme_data", {}),
+    # headless=True para rodar em servidor
+    "pulsar": ("modules.pulsar", "extrair_dados_starlink", {"headless": True}),
+    "sites": ("modules.sites", "collect_sites_data", {}),
+}
+
+# Valor usado no lugar dos dados quando o coletor falha ou estoura o prazo
+DADOS_PADRAO = {
+    "providers": ([], []),
+    "graficos": [],
+    "reme": [],
+    "pulsar": [],
+    "sites": ([], []),
+}
+
+# Última thread de cada coletor. No modo serviço as tentativas rodam no mesmo processo e uma
+# thread que estourou o prazo continua viva: a próxima do mesmo coletor espera por ela em vez
+# de rodar junto (mesmo perfil do Chrome, progresso do Pulsar, cache de KITs, banco dos sites).
+_threads = {}
+
+def get_coletor(nome):
+    """Retorna a função do coletor; o import acontece na primeira chamada, dentro da thread dele"""
+    modulo, funcao, kwargs = COLETORES[nome]
+    return lambda: getattr(importlib.import_module(modulo), funcao)(**kwargs)
+
+def coleta_valida(nome, dados):
+    """
+    Os coletores engolem boa parte dos erros e devolvem listas vazias.
+    Resultado vazio não gera checkpoint, para que o launcher tente de novo.
+    """
+    if nome in ("providers", "sites"):
+        return bool(dados[0])
+    return bool(dados)
+
+def get_timeout(nome):
+    """Retorna o prazo (em segundos) do coletor, priorizando o .env"""
+    padrao = TIMEOUTS_PADRAO.get(nome, TIMEOUT_GENERICO)
+    valor = os.getenv(f"COLETA_TIMEOUT_{nome.upper()}")
+    if not valor:
+        return padrao
+    try:
+        return float(valor)
+    except ValueError:
+        print(f"⚠ COLETA_TIMEOUT_{nome.upper()} inválido ({valor}), usando {padrao} s")
+        return padrao
+
+def _executar(nome, funcao, saida, anterior=None, limite=None):
+    """Roda o coletor dentro da thread e guarda o resultado em 'saida'."""
+    inicio = time.monotonic()
+    manifesto.vincular_coletor(nome)
+    try:
+        if anterior is not None and anterior.is_alive():
+            print(f"   [Coleta] '{nome}' da tentativa anterior ainda rodando, aguardando...")
+            anterior.join(max(0, limite - time.monotonic()))
+            if anterior.is_alive():
+                raise RuntimeError("execução anterior do coletor ainda em andamento")
+        saida["dados"] = funcao()
+        saida["status"] = "ok"
+    except BaseException as e:
+        # BaseException: um exit() perdido num coletor não derruba o relatório inteiro
+        saida["status"] = "erro"
+        saida["erro"] = f"exit({e.code})" if isinstance(e, SystemExit) else (str(e) or e.__class__.__name__)
+        print(f"❌ Coletor '{nome}' falhou: {saida['erro']}")
+        traceback.print_exc()
+    finally:
+        saida["duracao"] = time.monotonic() - inicio
+
+def executar_coletores(coletores):
+    """
+    Recebe uma lista de (nome, funcao) e executa todas ao mesmo tempo.
+    As funções são bloqueantes (Selenium, subprocess, requests), por isso
+    cada uma roda na sua thread. Threads que estouram o prazo são abandonadas
+    (daemon) para não segurarem o relatório.
+
+    Retorno: {nome: {"status": "ok"|"timeout"|"erro", "dados", "erro", "duracao", "prazo"}}
+    """
+    inicio = time.monotonic()
+    execucoes = {}
+
+    for nome, funcao in coletores:
+        saida = {"status": "executando", "dados": None, "erro": None, "duracao": None}
+        thread = threading.Thread(target=_executar, args=(nome, funcao, saida, _threads.get(nome),
+                                                          inicio + get_timeout(nome)),
+                                  name=f"coleta-{nome}", daemon=True)
+        _threads[nome] = thread
+        thread.start()
+        execucoes[nome] = (thread, saida)
+        print(f"   [Coleta] '{nome}' iniciado (prazo {get_timeout(nome):.0f} s)")
+
+    resultados = {}
+    for nome, (thread, saida) in execucoes.items():
+        prazo = get_timeout(nome)
+        thread.join(max(0, inicio + prazo - time.monotonic()))
+
+        if thread.is_alive():
+            # A thread continua rodando, mas o resultado dela não será mais usado
+            print(f"⏱ Coletor '{nome}' excedeu o prazo de {prazo:.0f} s. Seção marcada como indisponível.")
+            resultados[nome] = {"status": "timeout", "dados": None, "erro": None,
+                                "duracao": time.monotonic() - inicio, "prazo": prazo}
+        else:
+            resultados[nome] = dict(saida, prazo=prazo)
+            if saida["status"] == "ok":
+                print(f"   [Coleta] '{nome}' concluído em {saida['duracao']:.1f} s")
+
+        r = resultados[nome]
+        manifesto.registrar("coletor", nome, r["duracao"], r["status"], prazo=prazo, erro=r["erro"])
+
+    return resultados
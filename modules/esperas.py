@@ -0,0 +1,165 @@
+"""
+ESPERAS POR CONDIÇÃO (Selenium)
+Substitui os time.sleep fixos: cada espera tem uma condição e um timeout, termina assim que
+a condição vale e fica registrada no manifesto (categoria "espera"), com duração e resultado
+("ok" ou "timeout"). Assim dá para ver onde o tempo do Pulsar realmente vai.
+
+    esperas.aguardar(driver, "login: formulário", esperas.elemento_presente(By.NAME, "userName"), 20)
+
+As condições são funções driver -> valor; qualquer valor verdadeiro encerra a espera
+e é devolvido por aguardar(). Exceções dentro da condição contam como "ainda não".
+"""
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from modules import manifesto
+
+INTERVALO = 0.2
+
+# Conta fetch/XHR em andamento e o instante da última atividade; instalado antes dos scripts da página
+SCRIPT_REDE = """
+(() => {
+  if (window.__orfRede) return;
+  const estado = window.__orfRede = {pendentes: 0, ultima: Date.now()};
+  const inicio = () => { estado.pendentes++; estado.ultima = Date.now(); };
+  const fim = () => { estado.pendentes = Math.max(0, estado.pendentes - 1); estado.ultima = Date.now(); };
+  const fetchOriginal = window.fetch;
+  if (fetchOriginal) {
+    window.fetch = function () {
+      inicio();
+      return fetchOriginal.apply(this, arguments).finally(fim);
+    };
+  }
+  const enviarOriginal = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    inicio();
+    this.addEventListener('loadend', fim, {once: true});
+    return enviarOriginal.apply(this, arguments);
+  };
+})();
+"""
+
+def aguardar(driver, nome, condicao, timeout, intervalo=INTERVALO, obrigatoria=False, registrar=True):
+    """
+    Espera condicao(driver) ser verdadeira por até 'timeout' segundos.
+    Retorna o valor da condição, ou None no timeout (TimeoutException se obrigatoria=True).
+    """
+    inicio = time.monotonic()
+    limite = inicio + timeout
+    valor = None
+    while True:
+        try:
+            valor = condicao(driver)
+        except Exception:
+            valor = None
+        if valor or time.monotonic() >= limite:
+            break
+        time.sleep(intervalo)
+
+    duracao = time.monotonic() - inicio
+    if registrar:
+        manifesto.registrar("espera", nome, duracao, "ok" if valor else "timeout", timeout=timeout)
+    if not valor and obrigatoria:
+        raise TimeoutException(f"{nome}: condição não atendida em {timeout:.0f} s")
+    return valor
+
+def instrumentar_rede(driver):
+    """
+    Instala o contador de requisições (fetch/XHR) em todo documento novo (DevTools, só Chrome).
+    Sem ele, rede_ociosa() cai para a contagem de recursos do performance timeline.
+    """
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": SCRIPT_REDE})
+        return True
+    except Exception:
+        return False
+
+# --- CONDIÇÕES ---
+
+def url_contem(trecho):
+    return lambda d: trecho.lower() in d.current_url.lower()
+
+def url_nao_contem(trecho):
+    return lambda d: trecho.lower() not in d.current_url.lower()
+
+def documento_pronto():
+    return lambda d: d.execute_script("return document.readyState") == "complete"
+
+def elemento_presente(by, seletor):
+    """Primeiro elemento encontrado"""
+    def condicao(d):
+        elementos = d.find_elements(by, seletor)
+        return elementos[0] if elementos else None
+    return condicao
+
+def elemento_visivel(by, seletor):
+    """Primeiro elemento visível"""
+    def condicao(d):
+        for elemento in d.find_elements(by, seletor):
+            if elemento.is_displayed():
+                return elemento
+        return None
+    return condicao
+
+def rede_ociosa(ociosidade=0.5):
+    """
+    Nenhuma requisição em andamento há 'ociosidade' segundos (com documento carregado).
+    Sem o contador de instrumentar_rede(), usa o número de recursos do performance timeline.
+    """
+    estado = {"contagem": None, "desde": None}
+
+    def condicao(d):
+        info = d.execute_script(
+            "return [document.readyState, window.__orfRede ? window.__orfRede.pendentes : -1,"
+            " window.__orfRede ? Date.now() - window.__orfRede.ultima : 0,"
+            " performance.getEntriesByType('resource').length];")
+        pronto, pendentes, parado_ms, recursos = info
+        if pronto != "complete":
+            return False
+        if pendentes >= 0:
+            return pendentes == 0 and parado_ms >= ociosidade * 1000
+        agora = time.monotonic()
+        if recursos != estado["contagem"]:
+            estado.update(contagem=recursos, desde=agora)
+            return False
+        return agora - estado["desde"] >= ociosidade
+    return condicao
+
+def linhas_estaveis(xpath="//table//tbody//tr[td]", estabilidade=1.0, minimo=1):
+    """A tabela tem pelo menos 'minimo' linhas e a quantidade não muda há 'estabilidade' segundos"""
+    estado = {"contagem": None, "desde": None}
+
+    def condicao(d):
+        contagem = len(d.find_elements(By.XPATH, xpath))
+        agora = time.monotonic()
+        if contagem != estado["contagem"]:
+            estado.update(contagem=contagem, desde=agora)
+            return False
+        return contagem >= minimo and agora - estado["desde"] >= estabilidade
+    return condicao
+
+def assinatura_tabela(driver):
+    """Texto da primeira e da última linha da tabela: muda quando a página troca"""
+    return driver.execute_script(
+        "const l = document.querySelectorAll('table tbody tr');"
+        "return l.length ? l.length + '|' + l[0].innerText + '|' + l[l.length - 1].innerText : '';")
+
+def tabela_mudou(assinatura_anterior):
+    return lambda d: (assinatura_tabela(d) or assinatura_anterior) != assinatura_anterior
+
+def tooltip_com_texto(trecho="KIT"):
+    """Texto do tooltip visível (role=tooltip, ou classes tooltip/Popper do MUI) que contém 'trecho'"""
+    seletores = ("//div[@role='tooltip']",
+                 "//*[contains(@class, 'tooltip') or contains(@class, 'Tooltip') or contains(@class, 'Popper')]")
+
+    def condicao(d):
+        for seletor in seletores:
+            for tooltip in reversed(d.find_elements(By.XPATH, seletor)):
+                if tooltip.is_displayed() and tooltip.size['height'] > 0 and tooltip.size['width'] > 0:
+                    texto = tooltip.text.strip()
+                    if trecho in texto:
+                        return texto
+        return None
+    return condicao
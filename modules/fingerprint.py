@@ -0,0 +1,246 @@
+"""
+IMPRESSÃO DIGITAL DAS PÁGINAS (sites.py)
+Uma única passada de html.parser, sem montar árvore, extrai o que é comparado entre execuções:
+    - texto visível (sem script/style), sem as linhas voláteis (datas, horas, contadores de acesso)
+    - conjuntos de imagens de carrosséis, sliders e banners
+O hash é o mesmo de sites.normalize_html + sites.extract_image_sets (BeautifulSoup, duas árvores),
+que ficam em sites.py como referência. Por isso o parser abaixo reproduz as regras de árvore
+do BeautifulSoup com html.parser: elementos vazios, fechamento até a tag aberta mais recente
+com o mesmo nome, fronteiras entre strings e conversão de entidades.
+"""
+import hashlib
+import re
+from html.entities import html5
+from html.parser import HTMLParser
+
+# Linhas com data, hora ou contador de acessos mudam a cada visita
+LINHA_VOLATIL = re.compile(r'(\d{1,2}[:/]\d{1,2}[:/]\d{2,4}|\d+:\d+|visualizaç|views?:|acess|visit|online)', re.I)
+
+# Mesmos seletores de sites.extract_image_sets: (seletor, atributo, trecho procurado)
+SELETORES_IMAGENS = [
+    ('[class*="carousel"]', "class", "carousel"),
+    ('[class*="slider"]', "class", "slider"),
+    ('[class*="banner"]', "class", "banner"),
+    ('[id*="banner"]', "id", "banner"),
+]
+
+# Elementos que o BeautifulSoup fecha na hora (não recebem filhos)
+ELEMENTOS_VAZIOS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem",
+    "meta", "param", "source", "track", "wbr", "basefont", "bgsound", "command", "frame",
+    "image", "isindex", "nextid", "spacer",
+}
+# Texto dentro destes elementos não entra no get_text() (script e style ainda são removidos)
+CONTEINERES_IGNORADOS = {"script", "style", "template", "rt", "rp"}
+
+# Entidades nomeadas sem o ';' final, primeira ocorrência vence (igual ao BeautifulSoup)
+ENTIDADES = {}
+for _nome, _caractere in sorted(html5.items()):
+    ENTIDADES.setdefault(_nome[:-1] if _nome.endswith(";") else _nome, _caractere)
+
+def _caractere(codigo):
+    if codigo == 0 or codigo > 0x10FFFF or 0xD800 <= codigo <= 0xDFFF:
+        return "\ufffd"
+    if 0x80 <= codigo <= 0x9F:
+        try:
+            return bytes([codigo]).decode("cp1252")
+        except UnicodeDecodeError:
+            pass
+    return chr(codigo)
+
+def _referencia_numerica(nome):
+    """&#NNN; / &#xHH; como o BeautifulSoup resolve (inclui o remapeamento windows-1252)"""
+    base, padrao = 10, r"([0-9]+)(.*)"
+    if nome[:1] in ("x", "X"):
+        nome, base, padrao = nome[1:], 16, r"([0-9a-f]+)(.*)"
+    try:
+        return _caractere(int(nome, base))
+    except ValueError:
+        m = re.match(padrao, nome)
+        if not m:
+            return nome
+        return _caractere(int(m.group(1), base)) + m.group(2)
+
+class ExtratorFingerprint(HTMLParser):
+    """
+    Parser de passada única. Use feed()/close() e depois resultado().
+    Só guarda a pilha de tags abertas, a linha de texto corrente e as URLs dos conjuntos
+    de imagens ainda abertos; o texto normalizado vai direto para o sha256.
+    """
+
+    def __init__(self, guardar_texto=False):
+        super().__init__(convert_charrefs=False)
+        self._pilha = []            # (tag, registros de imagem, é contêiner ignorado)
+        self._abertas = {}          # tag -> quantas abertas (atalho para fechamentos sem par)
+        self._ja_fechados = {}      # elemento vazio -> quantos </tag> ainda devem ser ignorados
+        self._conteineres = 0
+        self._dados = []
+        self._contadores = [0] * len(SELETORES_IMAGENS)
+        self._registros = []        # conjuntos de imagens dos elementos abertos, na ordem da pilha
+        self.imagens = {}
+
+        self._sha = hashlib.sha256(b"TEXT:")
+        self.tamanho_texto = 0
+        self._primeira_string = True
+        self._linha = []
+        self._linha_descartada = False
+        self._texto = [] if guardar_texto else None
+
+    # --- texto ---
+
+    def _encerrar_dados(self):
+        """Fronteira de string do BeautifulSoup: tudo entre dois eventos de tag vira uma string"""
+        if not self._dados:
+            return
+        texto = "".join(self._dados)
+        self._dados = []
+        if not self._conteineres:
+            self._adicionar_string(texto)
+
+    def _adicionar_string(self, texto):
+        # get_text(separator=" ", strip=True) seguido de split('\n')
+        texto = texto.strip()
+        if not texto:
+            return
+        partes = texto.split("\n")
+        self._adicionar_trecho(partes[0] if self._primeira_string else " " + partes[0])
+        self._primeira_string = False
+        for parte in partes[1:]:
+            self._fechar_linha()
+            self._adicionar_trecho(parte)
+
+    def _adicionar_trecho(self, trecho):
+        # Nenhum padrão volátil contém espaço, então basta testar cada trecho:
+        # a linha cai assim que um deles casar e o resto dela nem é guardado
+        if self._linha_descartada:
+            return
+        if LINHA_VOLATIL.search(trecho):
+            self._linha_descartada = True
+            self._linha = []
+        else:
+            self._linha.append(trecho)
+
+    def _fechar_linha(self):
+        if not self._linha_descartada:
+            for palavra in "".join(self._linha).split():
+                if self.tamanho_texto:
+                    palavra = " " + palavra
+                self._sha.update(palavra.encode("utf-8"))
+                self.tamanho_texto += len(palavra)
+                if self._texto is not None:
+                    self._texto.append(palavra)
+        self._linha = []
+        self._linha_descartada = False
+
+    # --- árvore ---
+
+    def _abrir(self, tag, attrs):
+        self._encerrar_dados()
+        atributos = {}
+        for chave, valor in attrs:
+            atributos[chave] = "" if valor is None else valor
+
+        if tag == "img":
+            url = atributos.get("src") or atributos.get("data-src")
+            if url and not url.startswith("data:"):
+                for registro in self._registros:
+                    registro[1].add(url)
+
+        registros = []
+        for n, (seletor, atributo, trecho) in enumerate(SELETORES_IMAGENS):
+            if trecho in atributos.get(atributo, ""):
+                registros.append((f"{seletor}_{self._contadores[n]}", set()))
+                self._contadores[n] += 1
+        self._registros.extend(registros)
+
+        conteiner = tag in CONTEINERES_IGNORADOS
+        self._conteineres += conteiner
+        self._pilha.append((tag, len(registros), conteiner))
+        self._abertas[tag] = self._abertas.get(tag, 0) + 1
+
+    def _desempilhar(self):
+        tag, qtd_registros, conteiner = self._pilha.pop()
+        self._abertas[tag] -= 1
+        self._conteineres -= conteiner
+        if qtd_registros:
+            for chave, urls in self._registros[-qtd_registros:]:
+                if urls:
+                    self.imagens[chave] = hashlib.md5("|".join(sorted(urls)).encode()).hexdigest()
+            del self._registros[-qtd_registros:]
+
+    def _fechar_ate(self, tag):
+        """Fecha a tag aberta mais recente com esse nome e tudo que estiver acima dela"""
+        if not self._abertas.get(tag):
+            return
+        while self._pilha:
+            fechada = self._pilha[-1][0]
+            self._desempilhar()
+            if fechada == tag:
+                break
+
+    # --- eventos do html.parser ---
+
+    def handle_starttag(self, tag, attrs):
+        self._abrir(tag, attrs)
+        if tag in ELEMENTOS_VAZIOS:
+            self._fechar_ate(tag)
+            self._ja_fechados[tag] = self._ja_fechados.get(tag, 0) + 1
+
+    def handle_startendtag(self, tag, attrs):
+        self._abrir(tag, attrs)
+        self._fechar_ate(tag)
+
+    def handle_endtag(self, tag):
+        if self._ja_fechados.get(tag):
+            # </img> depois de <img>: o BeautifulSoup ignora sem encerrar a string corrente
+            self._ja_fechados[tag] -= 1
+            return
+        self._encerrar_dados()
+        self._fechar_ate(tag)
+
+    def handle_data(self, data):
+        self._dados.append(data)
+
+    def handle_entityref(self, name):
+        self._dados.append(ENTIDADES.get(name, "&" + name))
+
+    def handle_charref(self, name):
+        self._dados.append(_referencia_numerica(name))
+
+    def handle_comment(self, data):
+        self._encerrar_dados()
+
+    def handle_decl(self, decl):
+        self._encerrar_dados()
+
+    def handle_pi(self, data):
+        self._encerrar_dados()
+
+    def unknown_decl(self, data):
+        self._encerrar_dados()
+        # Seções CDATA contam como texto, mesmo dentro de <template>
+        if data.upper().startswith("CDATA["):
+            self._adicionar_string(data[len("CDATA["):])
+
+    def close(self):
+        super().close()
+        self._encerrar_dados()
+        while self._pilha:
+            self._desempilhar()
+        self._fechar_linha()
+
+    def resultado(self):
+        """{"hash", "tamanho_texto", "imagens"} (+ "texto" se guardar_texto=True); chamar depois de close()"""
+        sha = self._sha.copy()
+        sha.update(f"|IMAGES:{sorted(self.imagens.items())}".encode("utf-8"))
+        saida = {"hash": sha.hexdigest(), "tamanho_texto": self.tamanho_texto, "imagens": dict(self.imagens)}
+        if self._texto is not None:
+            saida["texto"] = "".join(self._texto)
+        return saida
+
+def calcular(html, guardar_texto=False):
+    """Impressão digital de uma página já baixada"""
+    extrator = ExtratorFingerprint(guardar_texto)
+    extrator.feed(html)
+    extrator.close()
+    return extrator.resultado()
@@ -5,6 +5,8 @@ import io
 import os
 from dotenv import load_dotenv
 
+from modules import manifesto, recursos
+
 # Carrega variáveis de ambiente
 load_dotenv()
 
@@ -107,6 +109,25 @@ def create_authenticated_session(base_url, user, password):
         print(f"❌ Erro crítico no login Zabbix ({base_url}): {e}")
         return None
 
+def sessao_zabbix_valida(base_url):
+    """Sessão guardada ainda logada? (a tela de login tem o botão name="enter")"""
+    base_url = base_url.rstrip('/')
+    def valido(session):
+        resp = session.get(f"{base_url}/index.php", verify=False, timeout=10)
+        return resp.status_code == 200 and 'name="enter"' not in resp.text
+    return valido
+
+def obter_sessao(base_url, user, password):
+    """Sessão autenticada, reaproveitada entre execuções no modo serviço"""
+    if not base_url or not user or not password:
+        return None
+    return recursos.obter(f"zabbix_web:{base_url.rstrip('/')}:{user}",
+                          lambda: create_authenticated_session(base_url, user, password),
+                          valido=sessao_zabbix_valida(base_url))
+
+def liberar_sessao(base_url, user, session):
+    recursos.liberar(f"zabbix_web:{base_url.rstrip('/')}:{user}", session)
+
 def download_graphs_from_server(session, base_url, graph_list):
     """Baixa uma lista de gráficos usando uma sessão autenticada."""
     images = []
@@ -128,14 +149,19 @@ def download_graphs_from_server(session, base_url, graph_list):
         if "hostid" in item:
             chart_url += f"&hostids[0]={item['hostid']}"
         
-        try:
-            resp = session.get(chart_url, stream=True, verify=False)
-            if resp.status_code == 200:
-                images.append((title, io.BytesIO(resp.content)))
-            else:
-                print(f"⚠ Erro HTTP {resp.status_code} no gráfico: {title}")
-        except Exception as e:
-            print(f"⚠ Erro de conexão no gráfico {title}: {e}")
+        with manifesto.etapa("grafico", title, servidor=base_url, graphid=gid) as et:
+            try:
+                resp = session.get(chart_url, stream=True, verify=False)
+                if resp.status_code == 200:
+                    images.append((title, io.BytesIO(resp.content)))
+                    et["bytes"] = len(resp.content)
+                else:
+                    print(f"⚠ Erro HTTP {resp.status_code} no gráfico: {title}")
+                    et["resultado"] = f"HTTP {resp.status_code}"
+            except Exception as e:
+                print(f"⚠ Erro de conexão no gráfico {title}: {e}")
+                et["resultado"] = "erro"
+                et["erro"] = str(e)[:300]
             
     return images
 
@@ -149,31 +175,34 @@ def collect_graph_images():
 
     # 1. Servidor Principal (Links Internet)
     if ZABBIX1_URL and ZABBIX1_USER and ZABBIX1_PASS:
-        session1 = create_authenticated_session(ZABBIX1_URL, ZABBIX1_USER, ZABBIX1_PASS)
+        session1 = obter_sessao(ZABBIX1_URL, ZABBIX1_USER, ZABBIX1_PASS)
         if session1:
             print(f">>> Baixando {len(GRAPHS_CONFIG_1)} gráficos do Servidor 1...")
             imgs = download_graphs_from_server(session1, ZABBIX1_URL, GRAPHS_CONFIG_1)
             all_images.extend(imgs)
+            liberar_sessao(ZABBIX1_URL, ZABBIX1_USER, session1)
     else:
         print("⚠ Configuração do Servidor 1 incompleta no .env")
 
     # 2. Servidor EBNET (.210)
     if ZABBIX2_USER and ZABBIX2_PASS:
-        session2 = create_authenticated_session(ZABBIX2_URL, ZABBIX2_USER, ZABBIX2_PASS)
+        session2 = obter_sessao(ZABBIX2_URL, ZABBIX2_USER, ZABBIX2_PASS)
         if session2:
             print(f">>> Baixando {len(GRAPHS_CONFIG_2)} gráficos do Servidor 2...")
             imgs = download_graphs_from_server(session2, ZABBIX2_URL, GRAPHS_CONFIG_2)
             all_images.extend(imgs)
+            liberar_sessao(ZABBIX2_URL, ZABBIX2_USER, session2)
     else:
         print("⚠ Pular Servidor 2: ZABBIX2_USER/PASS ausentes.")
 
     # 3. Servidor Novo (.208)
     if ZABBIX3_USER and ZABBIX3_PASS:
-        session3 = create_authenticated_session(ZABBIX3_URL, ZABBIX3_USER, ZABBIX3_PASS)
+        session3 = obter_sessao(ZABBIX3_URL, ZABBIX3_USER, ZABBIX3_PASS)
         if session3:
             print(f">>> Baixando {len(GRAPHS_CONFIG_3)} gráficos do Servidor 3...")
             imgs = download_graphs_from_server(session3, ZABBIX3_URL, GRAPHS_CONFIG_3)
             all_images.extend(imgs)
+            liberar_sessao(ZABBIX3_URL, ZABBIX3_USER, session3)
     else:
         print("⚠ Pular Servidor 3: ZABBIX3_USER/PASS ausentes no .env")
 
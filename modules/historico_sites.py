@@ -0,0 +1,262 @@
+"""
+HISTÓRICO DE IMPRESSÕES DIGITAIS DOS SITES
+Banco SQLite (modo WAL) em output/hashes.db, no lugar dos arquivos output/hashes/*.txt:
+    paginas   -> último hash de cada (url, método), com tamanho do texto e conjuntos de imagens
+    historico -> uma linha por hash novo (primeira verificação e cada alteração), com data
+Cada registro é uma transação (BEGIN IMMEDIATE): verificações em paralelo, e até outro
+processo (modo serviço + execução manual), não corrompem nem perdem alterações.
+A tabela saude acompanha cada URL entre execuções: média e variância (móveis) do tempo de
+carga no navegador, que definem o timeout do site, e falhas seguidas, que abrem o circuito.
+Para o método http, paginas também guarda os validadores da última resposta analisada
+(ETag, Last-Modified e sha256 do corpo), usados na revalidação condicional de sites.py.
+"""
+import datetime
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+DB_PATH = Path(os.getenv("SITES_HASH_DB", "output/hashes.db"))
+# Peso da execução mais recente na média móvel do tempo de carga
+PESO_CARGA = 0.3
+
+_lock = threading.Lock()
+_conexao = None
+_caminho_conexao = None
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS paginas (
+    url TEXT NOT NULL,
+    metodo TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    tamanho_texto INTEGER,
+    imagens TEXT,
+    primeira_vez TEXT NOT NULL,
+    alterado_em TEXT NOT NULL,
+    verificado_em TEXT NOT NULL,
+    mudancas INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (url, metodo)
+);
+CREATE TABLE IF NOT EXISTS historico (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    metodo TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    tamanho_texto INTEGER,
+    imagens TEXT,
+    registrado_em TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_historico_url ON historico (url, metodo, registrado_em);
+CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT);
+CREATE TABLE IF NOT EXISTS saude (
+    url TEXT PRIMARY KEY,
+    amostras INTEGER NOT NULL DEFAULT 0,
+    media_carga REAL,
+    variancia_carga REAL,
+    falhas_seguidas INTEGER NOT NULL DEFAULT 0,
+    ultima_falha TEXT,
+    motivo_falha TEXT,
+    atualizado_em TEXT NOT NULL
+);
+"""
+
+# Colunas acrescentadas depois da criação do banco: (tabela, coluna, tipo)
+COLUNAS_NOVAS = [
+    ("paginas", "etag", "TEXT"),
+    ("paginas", "last_modified", "TEXT"),
+    ("paginas", "digest_corpo", "TEXT"),
+]
+
+def _agora():
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+def _conectar():
+    """Uma conexão por processo (protegida por _lock), reaberta se DB_PATH mudar"""
+    global _conexao, _caminho_conexao
+    caminho = DB_PATH.resolve()
+    if _conexao is None or _caminho_conexao != caminho:
+        if _conexao is not None:
+            _conexao.close()
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: as transações são abertas explicitamente com BEGIN IMMEDIATE
+        _conexao = sqlite3.connect(str(caminho), timeout=30, isolation_level=None, check_same_thread=False)
+        _conexao.execute("PRAGMA journal_mode=WAL")
+        _conexao.execute("PRAGMA synchronous=NORMAL")
+        _conexao.executescript(ESQUEMA)
+        _migrar(_conexao)
+        _caminho_conexao = caminho
+    return _conexao
+
+def _migrar(con):
+    """ALTER TABLE para bancos criados antes das colunas de COLUNAS_NOVAS"""
+    for tabela, coluna, tipo in COLUNAS_NOVAS:
+        existentes = {linha[1] for linha in con.execute(f"PRAGMA table_info({tabela})")}
+        if coluna not in existentes:
+            con.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {tipo}")
+
+class _Transacao:
+    """with _Transacao() as con: ... (BEGIN IMMEDIATE / COMMIT, ROLLBACK em caso de erro)"""
+    def __enter__(self):
+        _lock.acquire()
+        try:
+            self.con = _conectar()
+            self.con.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            _lock.release()
+            raise
+        return self.con
+
+    def __exit__(self, tipo, *_):
+        try:
+            self.con.execute("ROLLBACK" if tipo else "COMMIT")
+        finally:
+            _lock.release()
+        return False
+
+def registrar(url, metodo, impressao, quando=None, validadores=None):
+    """
+    Grava a impressão digital (retorno de fingerprint.calcular) e compara com a anterior.
+    'validadores' ({"etag", "last_modified", "digest_corpo"}) são os da resposta que gerou
+    a impressão; sem eles os validadores guardados são apagados, já que não valem mais.
+    Retorna "novo" (primeira vez), "igual" ou "alterado".
+    """
+    quando = quando or _agora()
+    imagens = json.dumps(impressao.get("imagens", {}), sort_keys=True)
+    tamanho = impressao.get("tamanho_texto")
+    validadores = validadores or {}
+    etag, last_modified, digest = (validadores.get(c) for c in ("etag", "last_modified", "digest_corpo"))
+
+    with _Transacao() as con:
+        linha = con.execute("SELECT hash FROM paginas WHERE url = ? AND metodo = ?", (url, metodo)).fetchone()
+        if linha and linha[0] == impressao["hash"]:
+            # Tamanho e imagens também: registros importados dos .txt antigos não os têm
+            con.execute("""UPDATE paginas SET verificado_em = ?, tamanho_texto = ?, imagens = ?, etag = ?,
+                           last_modified = ?, digest_corpo = ? WHERE url = ? AND metodo = ?""",
+                        (quando, tamanho, imagens, etag, last_modified, digest, url, metodo))
+            return "igual"
+
+        if linha:
+            con.execute("""UPDATE paginas SET hash = ?, tamanho_texto = ?, imagens = ?, alterado_em = ?,
+                           verificado_em = ?, mudancas = mudancas + 1, etag = ?, last_modified = ?,
+                           digest_corpo = ? WHERE url = ? AND metodo = ?""",
+                        (impressao["hash"], tamanho, imagens, quando, quando, etag, last_modified, digest,
+                         url, metodo))
+        else:
+            con.execute("""INSERT INTO paginas (url, metodo, hash, tamanho_texto, imagens, primeira_vez,
+                           alterado_em, verificado_em, etag, last_modified, digest_corpo)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                        (url, metodo, impressao["hash"], tamanho, imagens, quando, quando, quando,
+                         etag, last_modified, digest))
+        con.execute("""INSERT INTO historico (url, metodo, hash, tamanho_texto, imagens, registrado_em)
+                       VALUES (?, ?, ?, ?, ?, ?)""", (url, metodo, impressao["hash"], tamanho, imagens, quando))
+        return "alterado" if linha else "novo"
+
+def validadores(url, metodo="http"):
+    """
+    Validadores guardados para a revalidação: {"hash", "etag", "last_modified", "digest_corpo"}
+    ou None se a página nunca foi analisada por esse método.
+    """
+    with _lock:
+        con = _conectar()
+        linha = con.execute("""SELECT hash, etag, last_modified, digest_corpo FROM paginas
+                               WHERE url = ? AND metodo = ?""", (url, metodo)).fetchone()
+    if not linha:
+        return None
+    return dict(zip(("hash", "etag", "last_modified", "digest_corpo"), linha))
+
+def confirmar(url, metodo, quando=None):
+    """Página revalidada sem mudança (304 ou mesmo corpo): só atualiza verificado_em"""
+    with _Transacao() as con:
+        con.execute("UPDATE paginas SET verificado_em = ? WHERE url = ? AND metodo = ?",
+                    (quando or _agora(), url, metodo))
+
+def saude(urls):
+    """{url: {"amostras", "media_carga", "variancia_carga", "falhas_seguidas", "motivo_falha"}} das URLs já vistas"""
+    with _lock:
+        con = _conectar()
+        cursor = con.execute("""SELECT url, amostras, media_carga, variancia_carga, falhas_seguidas, motivo_falha
+                                FROM saude""")
+        colunas = [c[0] for c in cursor.description][1:]
+        procuradas = set(urls)
+        return {linha[0]: dict(zip(colunas, linha[1:])) for linha in cursor.fetchall() if linha[0] in procuradas}
+
+def atualizar_saude(registros, quando=None):
+    """
+    Fecha a execução para cada site, numa transação só.
+    'registros': [(url, duracao_carga, falha)] -> falha (motivo) soma uma falha seguida;
+    sem falha zera o contador e, se houve carga no navegador, atualiza média e variância.
+    """
+    quando = quando or _agora()
+    with _Transacao() as con:
+        for url, duracao, falha in registros:
+            linha = con.execute("SELECT amostras, media_carga, variancia_carga FROM saude WHERE url = ?",
+                                (url,)).fetchone()
+            if not linha:
+                con.execute("INSERT INTO saude (url, atualizado_em) VALUES (?, ?)", (url, quando))
+                linha = (0, None, None)
+            if falha:
+                con.execute("""UPDATE saude SET falhas_seguidas = falhas_seguidas + 1, ultima_falha = ?,
+                               motivo_falha = ?, atualizado_em = ? WHERE url = ?""", (quando, falha, quando, url))
+                continue
+
+            amostras, media, variancia = linha
+            if duracao is not None:
+                if not amostras:
+                    media, variancia = duracao, 0.0
+                else:
+                    # Média e variância móveis exponenciais: sites que ficaram mais lentos se ajustam em poucas execuções
+                    diferenca = duracao - media
+                    media += PESO_CARGA * diferenca
+                    variancia = (1 - PESO_CARGA) * (variancia + PESO_CARGA * diferenca * diferenca)
+                amostras += 1
+            con.execute("""UPDATE saude SET amostras = ?, media_carga = ?, variancia_carga = ?, falhas_seguidas = 0,
+                           motivo_falha = NULL, atualizado_em = ? WHERE url = ?""",
+                        (amostras, media, variancia, quando, url))
+
+def importar_arquivos(arquivos):
+    """
+    Importação única dos arquivos antigos de output/hashes.
+    'arquivos': {(url, metodo): Path}. Os arquivos são mantidos; a importação fica marcada na tabela meta.
+    Retorna quantos hashes foram importados (0 se já tinha sido feita).
+    """
+    with _Transacao() as con:
+        if con.execute("SELECT 1 FROM meta WHERE chave = 'importacao_hashes_txt'").fetchone():
+            return 0
+        importados = 0
+        for (url, metodo), caminho in arquivos.items():
+            try:
+                hash_antigo = Path(caminho).read_text(encoding="utf-8").strip()
+                quando = datetime.datetime.fromtimestamp(Path(caminho).stat().st_mtime).isoformat(timespec="seconds")
+            except OSError:
+                continue
+            if not hash_antigo:
+                continue
+            # Sem tamanho nem imagens: os arquivos só guardavam o hash
+            con.execute("""INSERT OR IGNORE INTO paginas (url, metodo, hash, primeira_vez, alterado_em, verificado_em)
+                           VALUES (?, ?, ?, ?, ?, ?)""", (url, metodo, hash_antigo, quando, quando, quando))
+            con.execute("INSERT INTO historico (url, metodo, hash, registrado_em) VALUES (?, ?, ?, ?)",
+                        (url, metodo, hash_antigo, quando))
+            importados += 1
+        con.execute("INSERT INTO meta (chave, valor) VALUES ('importacao_hashes_txt', ?)", (_agora(),))
+    if importados:
+        print(f">>> Módulo Sites: {importados} hashes importados de output/hashes para {DB_PATH}")
+    return importados
+
+def resumo():
+    """Uma linha por (url, método): desde quando é monitorado, última alteração e quantas houve"""
+    with _lock:
+        con = _conectar()
+        cursor = con.execute("""SELECT url, metodo, primeira_vez, alterado_em, verificado_em, mudancas, tamanho_texto
+                                FROM paginas ORDER BY mudancas DESC, alterado_em DESC""")
+        colunas = [c[0] for c in cursor.description]
+        return [dict(zip(colunas, linha)) for linha in cursor.fetchall()]
+
+def historico(url):
+    """Todas as versões registradas de uma URL, da mais recente para a mais antiga"""
+    with _lock:
+        con = _conectar()
+        cursor = con.execute("""SELECT metodo, registrado_em, hash, tamanho_texto, imagens FROM historico
+                                WHERE url = ? ORDER BY registrado_em DESC, id DESC""", (url,))
+        colunas = [c[0] for c in cursor.description]
+        return [dict(zip(colunas, linha)) for linha in cursor.fetchall()]
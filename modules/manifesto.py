@@ -0,0 +1,122 @@
+"""
+MANIFESTO DE EXECUÇÃO
+Registra duração e resultado de cada coletor e de cada unidade de trabalho
+(site, gráfico, painel do Grafana, página/linha do Pulsar, multiBuild, SMTP).
+Cada execução do dia é acrescentada em output/run_<data>.json.
+O coletor de cada registro vem do contexto (vincular_coletor/propagar), não do nome da thread.
+"""
+import contextvars
+import datetime
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+MANIFESTO_DIR = Path("output")
+
+_lock = threading.Lock()
+_etapas = []
+_execucao = {}
+_numero = 0  # incrementado a cada iniciar()
+
+# (coletor, número da execução) de quem está registrando; None fora dos coletores
+_contexto = contextvars.ContextVar("manifesto_contexto", default=None)
+
+def iniciar(**extra):
+    """Zera o registro para uma nova execução"""
+    global _numero
+    with _lock:
+        _numero += 1
+        _etapas.clear()
+        _execucao.clear()
+        _execucao.update(inicio=datetime.datetime.now().isoformat(timespec="seconds"),
+                         _t0=time.monotonic(), **extra)
+
+def vincular_coletor(nome):
+    """Marca o contexto atual (a thread do coletor) como pertencente a 'nome' nesta execução"""
+    with _lock:
+        _contexto.set((nome, _numero))
+
+def propagar(funcao):
+    """
+    Envolve 'funcao' para rodar em outra thread (ThreadPoolExecutor) com o mesmo
+    coletor e execução de quem a criou: threads de pool não herdam o contexto.
+    """
+    contexto = _contexto.get()
+
+    def executar(*args, **kwargs):
+        token = _contexto.set(contexto)
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            _contexto.reset(token)
+    return executar
+
+def registrar(categoria, nome, duracao, resultado="ok", **extra):
+    """
+    Acrescenta uma etapa já medida. Registros de um coletor abandonado numa
+    execução anterior (thread daemon que estourou o prazo) são descartados.
+    """
+    contexto = _contexto.get()
+    registro = {"categoria": categoria, "nome": nome, "coletor": contexto[0] if contexto else None,
+                "duracao": round(duracao, 3), "resultado": resultado}
+    registro.update(extra)
+    with _lock:
+        if contexto is None or contexto[1] == _numero:
+            _etapas.append(registro)
+    return registro
+
+@contextmanager
+def etapa(categoria, nome, **extra):
+    """
+    Mede o bloco e registra no manifesto. O bloco pode ajustar o registro:
+        with manifesto.etapa("site", url) as et:
+            et["resultado"] = "C.O."
+    Exceções são registradas como resultado "erro" e propagadas.
+    """
+    registro = {"resultado": "ok"}
+    registro.update(extra)
+    inicio = time.monotonic()
+    try:
+        yield registro
+    except BaseException as e:
+        registro["resultado"] = "erro"
+        registro["erro"] = str(e)[:300]
+        raise
+    finally:
+        resultado = registro.pop("resultado")
+        registrar(categoria, nome, time.monotonic() - inicio, resultado, **registro)
+
+def etapas(categoria=None):
+    """Cópia das etapas registradas até agora (opcionalmente de uma categoria)"""
+    with _lock:
+        return [dict(e) for e in _etapas if categoria is None or e["categoria"] == categoria]
+
+def get_caminho(data=None):
+    data = data or datetime.datetime.now().strftime('%Y-%m-%d')
+    return MANIFESTO_DIR / f"run_{data}.json"
+
+def salvar(data=None, **extra):
+    """Fecha a execução atual e acrescenta no manifesto do dia"""
+    caminho = get_caminho(data)
+    with _lock:
+        execucao = {k: v for k, v in _execucao.items() if not k.startswith("_")}
+        execucao.update(extra)
+        execucao["fim"] = datetime.datetime.now().isoformat(timespec="seconds")
+        execucao["duracao"] = round(time.monotonic() - _execucao.get("_t0", time.monotonic()), 3)
+        execucao["etapas"] = list(_etapas)
+
+    try:
+        conteudo = json.loads(caminho.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        conteudo = {"data": caminho.stem[len("run_"):], "execucoes": []}
+    conteudo["execucoes"].append(execucao)
+
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    tmp = caminho.with_name(caminho.name + ".tmp")
+    tmp.write_text(json.dumps(conteudo, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, caminho)
+    print(f">> Manifesto da execução: {caminho}")
+    return caminho
@@ -0,0 +1,145 @@
+"""
+INICIALIZAÇÃO DO NAVEGADOR (sites.py e pulsar.py)
+Localiza Chromium e ChromeDriver uma vez, confere se as versões são compatíveis
+(mesma versão principal) e guarda o resultado em output/navegador.json.
+Nas próximas execuções o cache vale enquanto os dois binários não mudarem
+(caminho, tamanho e data), então nem o '--version' é chamado de novo e nada
+depende de rede. O download pelo webdriver-manager fica só como último recurso,
+quando não há ChromeDriver instalado.
+"""
+import json
+import os
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+CACHE_PATH = Path(os.getenv("NAVEGADOR_CACHE", "output/navegador.json"))
+
+# CHROME_BIN / CHROMEDRIVER_BIN no .env têm prioridade sobre os caminhos padrão
+CAMINHOS_CHROMIUM = [
+    os.getenv("CHROME_BIN"),
+    '/usr/bin/chromium',
+    '/usr/bin/chromium-browser',
+    '/snap/bin/chromium',
+    '/usr/bin/google-chrome',
+    '/usr/bin/google-chrome-stable',
+]
+CAMINHOS_CHROMEDRIVER = [
+    os.getenv("CHROMEDRIVER_BIN"),
+    '/usr/bin/chromedriver',
+    '/usr/local/bin/chromedriver',
+    '/snap/bin/chromedriver',
+]
+
+_localizado = None
+
+def _primeiro_existente(caminhos, nome):
+    for caminho in caminhos:
+        if caminho and os.path.isfile(caminho) and os.access(caminho, os.X_OK):
+            return caminho
+    return shutil.which(nome)
+
+def _assinatura(caminho):
+    """O que invalida o cache: o binário foi trocado (apt upgrade, snap refresh)"""
+    if not caminho:
+        return None
+    try:
+        info = os.stat(caminho)
+    except OSError:
+        return None
+    return [caminho, info.st_size, info.st_mtime_ns]
+
+def _versao(binario):
+    """'Chromium 120.0.6099.224 snap' -> '120.0.6099.224' (None se não rodar)"""
+    try:
+        saida = subprocess.run([binario, "--version"], capture_output=True, text=True, timeout=30).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    m = re.search(r"(\d+(?:\.\d+){1,3})", saida)
+    return m.group(1) if m else None
+
+def _principal(versao):
+    return versao.split(".")[0] if versao else None
+
+def _ler_cache():
+    try:
+        return json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def _gravar_cache(info):
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        temporario = CACHE_PATH.with_suffix(".tmp")
+        temporario.write_text(json.dumps(info, indent=2), encoding="utf-8")
+        os.replace(temporario, CACHE_PATH)
+    except OSError as e:
+        print(f"   ⚠️  Não foi possível gravar {CACHE_PATH}: {e}")
+
+def localizar(forcar=False):
+    """
+    {"chromium", "chromedriver", "versao_chromium", "versao_chromedriver", "compativel"}
+    Os caminhos são None quando não encontrados. Resultado guardado em memória e em disco.
+    """
+    global _localizado
+    chromium = _primeiro_existente(CAMINHOS_CHROMIUM, "chromium")
+    chromedriver = _primeiro_existente(CAMINHOS_CHROMEDRIVER, "chromedriver")
+    assinaturas = {"chromium": _assinatura(chromium), "chromedriver": _assinatura(chromedriver)}
+
+    if not forcar:
+        for candidato in (_localizado, _ler_cache()):
+            if candidato and candidato.get("assinaturas") == assinaturas:
+                _localizado = candidato
+                return candidato
+
+    versao_chromium = _versao(chromium) if chromium else None
+    versao_chromedriver = _versao(chromedriver) if chromedriver else None
+    info = {
+        "chromium": chromium,
+        "chromedriver": chromedriver,
+        "versao_chromium": versao_chromium,
+        "versao_chromedriver": versao_chromedriver,
+        # Sem versão legível não dá para afirmar incompatibilidade: deixa o Selenium tentar
+        "compativel": (_principal(versao_chromium) == _principal(versao_chromedriver)
+                       if versao_chromium and versao_chromedriver else True),
+        "assinaturas": assinaturas,
+    }
+    print(f"   🔎 Navegador: {chromium or '?'} ({versao_chromium or '?'}) | "
+          f"ChromeDriver: {chromedriver or '?'} ({versao_chromedriver or '?'})")
+    _gravar_cache(info)
+    _localizado = info
+    return info
+
+def verificar_instalacao():
+    """Lista de problemas encontrados (vazia se está tudo certo)"""
+    info = localizar()
+    erros = []
+    if not info["chromium"]:
+        erros.append("Chromium não encontrado. Instale: sudo apt install chromium-browser (ou defina CHROME_BIN)")
+    if not info["chromedriver"]:
+        erros.append("ChromeDriver não encontrado. Instale: sudo apt install chromium-chromedriver (ou defina CHROMEDRIVER_BIN)")
+    if not info["compativel"]:
+        erros.append(f"Versões incompatíveis: Chromium {info['versao_chromium']} x "
+                     f"ChromeDriver {info['versao_chromedriver']} (a versão principal deve ser a mesma)")
+    return erros
+
+def criar_driver(options):
+    """webdriver.Chrome com o Chromium e o ChromeDriver localizados (binary_location só se não definido)"""
+    info = localizar()
+    if not info["compativel"]:
+        raise RuntimeError(f"Chromium {info['versao_chromium']} e ChromeDriver {info['versao_chromedriver']} "
+                           f"são incompatíveis")
+    if info["chromium"] and not options.binary_location:
+        options.binary_location = info["chromium"]
+
+    if info["chromedriver"]:
+        return webdriver.Chrome(service=Service(executable_path=info["chromedriver"]), options=options)
+
+    print("   ⚠️  ChromeDriver não encontrado no sistema")
+    print("   📥 Tentando baixar automaticamente...")
+    from webdriver_manager.chrome import ChromeDriverManager
+    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
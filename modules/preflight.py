@@ -0,0 +1,135 @@
+"""
+PRÉ-VERIFICAÇÃO DE ALCANCE DOS SITES (sites.py)
+Antes de qualquer download, todos os hosts do sites.json são testados ao mesmo tempo (asyncio):
+resolução DNS, conexão TCP e, para https, handshake TLS, cada etapa com timeout curto.
+A falha sai classificada (DNS, recusada, timeout, TLS, rede), e só os sites alcançáveis seguem
+para a verificação de conteúdo. Hosts repetidos são testados uma vez só.
+Certificados não são validados aqui (a verificação ignora erros de certificado), e o handshake
+aceita TLS 1.0 e cifras legadas como o Chrome da verificação. Mesmo assim, falha de TLS não é
+fatal (ver FATAIS): o site segue para o HTTP/navegador, que têm a palavra final.
+"""
+import asyncio
+import errno
+import os
+import socket
+import ssl
+import time
+from urllib.parse import urlparse
+
+import requests
+
+TIMEOUT = float(os.getenv("SITES_PREFLIGHT_TIMEOUT", "5"))
+CONCORRENCIA = int(os.getenv("SITES_PREFLIGHT_CONCORRENCIA", "64"))
+
+# Mensagens da tabela de ocorrências (todas começam como a de sites.SITE_INACESSIVEL)
+MENSAGENS = {
+    "dns": "Site inacessível: nome não resolvido (DNS)",
+    "recusada": "Site inacessível: conexão recusada",
+    "timeout": "Site inacessível: sem resposta (timeout de conexão)",
+    "rede": "Site inacessível: rede ou host inalcançável",
+}
+
+# Falhas que já dão o veredito de site fora do ar; "tls" fica de fora porque o handshake do
+# OpenSSL daqui pode recusar servidores legados que o navegador ainda abre
+FATAIS = set(MENSAGENS)
+
+def _destino(url):
+    """(host, porta, tls) da URL, ou None se não der para testar direto (sem host ou atrás de proxy)"""
+    partes = urlparse(url)
+    if not partes.hostname or partes.scheme not in ("http", "https"):
+        return None
+    # Com proxy configurado o requests nem fala com o host: conexão direta não diz nada
+    if requests.utils.get_environ_proxies(url):
+        return None
+    tls = partes.scheme == "https"
+    return partes.hostname, partes.port or (443 if tls else 80), tls
+
+def _contexto_tls():
+    contexto = ssl.create_default_context()
+    contexto.check_hostname = False
+    contexto.verify_mode = ssl.CERT_NONE
+    # Piso do OpenSSL (TLS 1.2, SECLEVEL=2, sem renegociação legada) derruba sites antigos
+    contexto.minimum_version = ssl.TLSVersion.MINIMUM_SUPPORTED
+    contexto.options |= getattr(ssl, "OP_LEGACY_SERVER_CONNECT", 0x4)
+    try:
+        contexto.set_ciphers("DEFAULT:@SECLEVEL=0")
+    except ssl.SSLError:
+        pass
+    return contexto
+
+async def _conectar(enderecos, porta):
+    """Tenta os endereços resolvidos em ordem (IPv6 sem rota não derruba um host que tem IPv4)"""
+    erro = None
+    for endereco in dict.fromkeys(info[4][0] for info in enderecos):
+        try:
+            _, escritor = await asyncio.open_connection(endereco, porta)
+            return escritor
+        except OSError as e:
+            erro = e
+    raise erro
+
+async def _testar(destino, timeout, limite, contexto):
+    host, porta, tls = destino
+    inicio = time.monotonic()
+    resultado = {"host": host, "porta": porta, "falha": None, "detalhe": None}
+    async with limite:
+        etapa = "dns"
+        escritor = None
+        try:
+            loop = asyncio.get_running_loop()
+            enderecos = await asyncio.wait_for(
+                loop.getaddrinfo(host, porta, type=socket.SOCK_STREAM), timeout)
+
+            etapa = "tcp"
+            escritor = await asyncio.wait_for(_conectar(enderecos, porta), timeout)
+
+            if tls:
+                etapa = "tls"
+                await asyncio.wait_for(escritor.start_tls(contexto, server_hostname=host), timeout)
+        except socket.gaierror as e:
+            resultado.update(falha="dns", detalhe=str(e))
+        except asyncio.TimeoutError:
+            # Timeout na resolução conta como DNS; no TCP/TLS, como servidor sem resposta
+            resultado.update(falha="dns" if etapa == "dns" else "timeout", detalhe=f"timeout na etapa {etapa}")
+        except ConnectionRefusedError as e:
+            resultado.update(falha="recusada", detalhe=str(e))
+        except (ssl.SSLError, ConnectionResetError) as e:
+            # Reset no meio do handshake também é TLS (servidor que não fala TLS nessa porta)
+            resultado.update(falha="tls" if etapa == "tls" else "recusada", detalhe=str(e))
+        except OSError as e:
+            if e.errno == errno.ETIMEDOUT:
+                resultado.update(falha="timeout", detalhe=str(e))
+            else:
+                resultado.update(falha="rede", detalhe=str(e))
+        finally:
+            if escritor is not None:
+                # Só interessava abrir: fecha sem esperar o encerramento educado (close_notify/FIN)
+                escritor.transport.abort()
+    resultado["duracao"] = time.monotonic() - inicio
+    return resultado
+
+async def _testar_todos(destinos, timeout, concorrencia):
+    limite = asyncio.Semaphore(concorrencia)
+    contexto = _contexto_tls()
+    resultados = await asyncio.gather(*(_testar(d, timeout, limite, contexto) for d in destinos))
+    return dict(zip(destinos, resultados))
+
+def verificar(urls, timeout=TIMEOUT, concorrencia=CONCORRENCIA):
+    """
+    {url: {"host", "porta", "falha", "detalhe", "duracao"}}; falha é None (alcançável) ou
+    "dns" / "recusada" / "timeout" / "tls" / "rede". URLs que não dá para testar ficam de fora.
+    """
+    destinos_por_url = {url: _destino(url) for url in urls}
+    destinos = sorted({d for d in destinos_por_url.values() if d})
+    if not destinos:
+        return {}
+    por_destino = asyncio.run(_testar_todos(destinos, timeout, concorrencia))
+    return {url: por_destino[d] for url, d in destinos_por_url.items() if d}
+
+def fatal(resultado):
+    """A falha basta para marcar o site como inacessível sem passar pelo HTTP/navegador"""
+    return resultado["falha"] in FATAIS
+
+def mensagem(resultado):
+    """Texto da ocorrência para um resultado com falha"""
+    return MENSAGENS.get(resultado["falha"], "Site inacessível / Timeout")
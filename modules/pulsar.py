@@ -2,22 +2,32 @@
 EXTRATOR STARLINK - VERSÃO AUTOMÁTICA COM PAGINAÇÃO
 Otimizado para Ubuntu Server (sem display)
 """
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
 import os
+import re
+from urllib.parse import urljoin
 from dotenv import load_dotenv
 
+from modules import checkpoint, esperas, manifesto, navegador, pulsar_api, pulsar_kits, pulsar_rede, recursos
+
 USER_EMAIL = os.getenv("PULSAR_EMAIL")
 USER_PASSWORD = os.getenv("PULSAR_PASSWORD")
 LOGIN_URL = "https://sport.pulsarconnect.io/login"
 STARLINK_URL = "https://sport.pulsarconnect.io/starlink/starlinkMap"
+# "tabela" (padrão): leitura da tabela linha a linha. "rede": lê os terminais das respostas JSON
+# que o mapa recebe (modules/pulsar_rede.py), sem hover, e cai para a tabela se não achar dados;
+# opcional até o interpretador ser conferido contra o portal de produção.
+# "api": sem navegador (modules/pulsar_api.py); se a API falhar, segue como "rede".
+PULSAR_MODO = os.getenv("PULSAR_MODO", "tabela").lower()
+# Perfil do Chromium mantido entre execuções (cookies e cache do portal); vazio = perfil temporário.
+# Sem ele, a sessão ainda é reaproveitada pelos cookies guardados em output/pulsar_sessao.json.
+PULSAR_PERFIL_DIR = os.getenv("PULSAR_PERFIL_DIR", "")
 
 load_dotenv()
 
@@ -28,22 +38,12 @@ def get_chrome_options(headless=True):
     if headless:
         print("   🖥️  Modo headless ativado")
         
-        # Localizar Chromium no Ubuntu (ANTES de configurar opções)
-        possible_paths = [
-            '/usr/bin/chromium',
-            '/usr/bin/chromium-browser',
-            '/snap/bin/chromium'
-        ]
-        
-        chromium_found = False
-        for path in possible_paths:
-            if os.path.exists(path):
-                options.binary_location = path
-                print(f"   ✓ Chromium: {path}")
-                chromium_found = True
-                break
-        
-        if not chromium_found:
+        # Chromium localizado uma vez e guardado em cache (modules/navegador.py)
+        info = navegador.localizar()
+        if info["chromium"]:
+            options.binary_location = info["chromium"]
+            print(f"   ✓ Chromium: {info['chromium']} ({info['versao_chromium'] or '?'})")
+        else:
             print("   ⚠️  Chromium não encontrado nos caminhos padrão")
         
         # Opções ESSENCIAIS para headless em server (testadas e funcionando)
@@ -65,76 +65,24 @@ def get_chrome_options(headless=True):
     else:
         options.add_argument('--start-maximized')
     
-    return options
-
-def get_chrome_driver():
-    """Localiza o ChromeDriver no sistema"""
-    possible_paths = [
-        '/usr/bin/chromedriver',
-        '/usr/local/bin/chromedriver',
-        '/snap/bin/chromedriver'
-    ]
-    
-    for path in possible_paths:
-        if os.path.exists(path):
-            print(f"   ✓ ChromeDriver: {path}")
-            return path
-    
-    return None
-
-def check_chrome_installation():
-    """Verifica se Chrome/Chromium e ChromeDriver estão instalados"""
-    errors = []
-    
-    # Verificar Chromium
-    chromium_paths = ['/usr/bin/chromium', '/usr/bin/chromium-browser', '/snap/bin/chromium']
-    chromium_found = any(os.path.exists(p) for p in chromium_paths)
-    
-    if not chromium_found:
-        errors.append("Chromium não encontrado. Instale: sudo apt install chromium-browser")
+    if PULSAR_PERFIL_DIR:
+        os.makedirs(PULSAR_PERFIL_DIR, exist_ok=True)
+        options.add_argument(f'--user-data-dir={os.path.abspath(PULSAR_PERFIL_DIR)}')
     
-    # Verificar ChromeDriver
-    driver_paths = ['/usr/bin/chromedriver', '/usr/local/bin/chromedriver', '/snap/bin/chromedriver']
-    driver_found = any(os.path.exists(p) for p in driver_paths)
+    if PULSAR_MODO in ("rede", "api"):
+        pulsar_rede.ativar_captura(options)
     
-    if not driver_found:
-        errors.append("ChromeDriver não encontrado. Instale: sudo apt install chromium-chromedriver")
-    
-    return errors
-
-def extrair_dados_starlink(headless=False):
-    print("="*75)
-    print(" "*20 + "EXTRATOR STARLINK")
-    print("="*75)
-
-    # Verificação prévia
-    if headless:
-        check_errors = check_chrome_installation()
-        if check_errors:
-            print("\n   ❌ PROBLEMAS DETECTADOS:")
-            for error in check_errors:
-                print(f"   • {error}")
-            print("\n   💡 Execute o teste primeiro: python3 test_chrome_ubuntu.py")
-            raise RuntimeError("Chrome/ChromeDriver não está configurado corretamente")
+    return options
 
+def iniciar_navegador(headless=False):
+    """Abre o Chrome/Chromium configurado para o Pulsar"""
     # Configurar opções
     options = get_chrome_options(headless)
     
     # Iniciar driver
     try:
-        driver_path = get_chrome_driver()
-        
-        if driver_path:
-            service = Service(executable_path=driver_path)
-            driver = webdriver.Chrome(service=service, options=options)
-        else:
-            print("   ⚠️  ChromeDriver não encontrado no sistema")
-            print("   📥 Tentando baixar automaticamente...")
-            from webdriver_manager.chrome import ChromeDriverManager
-            driver = webdriver.Chrome(
-                service=Service(ChromeDriverManager().install()),
-                options=options
-            )
+        driver = navegador.criar_driver(options)
+        esperas.instrumentar_rede(driver)
         
         print("   ✅ Navegador iniciado com sucesso!")
         
@@ -155,264 +103,644 @@ def extrair_dados_starlink(headless=False):
         driver = None
         raise
 
-    actions = ActionChains(driver)
+    return driver
 
-    print("\n[1/5] Fazendo login...")
-    driver.get(LOGIN_URL)
-    time.sleep(5)
+def sessao_ativa(driver):
+    """Abre o mapa Starlink direto; se o portal mandar para o login, a sessão expirou"""
+    try:
+        # O que o log tiver de antes (execução anterior do navegador aquecido) não é desta carga
+        pulsar_rede.descartar_log(driver)
+        driver.get(STARLINK_URL)
+        # A SPA só manda para o login depois de consultar a API: espera a rede acalmar
+        esperas.aguardar(driver, "sessão: mapa carregado", esperas.rede_ociosa(1.0), 15)
+        return "/login" not in driver.current_url.lower()
+    except Exception:
+        return False
+
+def restaurar_cookies(driver):
+    """Cookies da última sessão (output/pulsar_sessao.json) no navegador; False se não há sessão válida"""
+    sessao = pulsar_api.sessao_salva()
+    if not sessao or not sessao.get("cookies"):
+        return False
+    try:
+        # add_cookie só aceita cookies do domínio aberto: uma página leve do portal basta
+        driver.get(urljoin(STARLINK_URL, "/favicon.ico"))
+    except Exception:
+        return False
+    restaurados = 0
+    for cookie in sessao["cookies"]:
+        try:
+            driver.add_cookie({k: v for k, v in cookie.items() if v})
+            restaurados += 1
+        except Exception:
+            continue
+    return restaurados > 0
 
+def reaproveitar_sessao(driver):
+    """
+    Tenta entrar no mapa sem login: navegador aquecido ou perfil persistente, depois os
+    cookies guardados. Retorna de onde veio a sessão, ou None se precisa de login.
+    """
+    if recursos.reaproveitado("pulsar.driver", driver) and sessao_ativa(driver):
+        return "navegador aquecido"
+    if PULSAR_PERFIL_DIR and sessao_ativa(driver):
+        return "perfil persistente"
+    if restaurar_cookies(driver) and sessao_ativa(driver):
+        return "cookies guardados"
+    return None
+
+def selecionar_maior_pagina(driver):
+    """Escolhe a maior opção de 'Rows per page' (select nativo ou menu do MUI). Retorna o tamanho ou None"""
     try:
-        email_input = driver.find_element(By.NAME, "userName")
-        pass_input = driver.find_element(By.NAME, "password")
-        email_input.send_keys(USER_EMAIL)
-        pass_input.send_keys(USER_PASSWORD)
-
-        login_button = driver.find_element(By.XPATH, "//button[contains(@class, 'loginButton')]")
-        login_button.click()
-        print("   ✓ Login realizado")
-        time.sleep(15)
+        for elemento in driver.find_elements(By.TAG_NAME, "select"):
+            seletor = Select(elemento)
+            tamanhos = [int(o.text) for o in seletor.options if o.text.strip().isdigit()]
+            if tamanhos:
+                maior = max(tamanhos)
+                if seletor.first_selected_option.text.strip() == str(maior):
+                    return None
+                seletor.select_by_visible_text(str(maior))
+                return maior
+        botoes = driver.find_elements(By.XPATH, "//*[contains(@class, 'MuiTablePagination')]//*[@aria-haspopup='listbox']")
+        if botoes:
+            botoes[0].click()
+            opcoes = [o for o in driver.find_elements(By.XPATH, "//li[@role='option']") if o.text.strip().isdigit()]
+            if opcoes:
+                maior = max(opcoes, key=lambda o: int(o.text))
+                tamanho = int(maior.text)
+                maior.click()
+                return tamanho
     except Exception as e:
-        print(f"   ❌ Erro no login: {e}")
-        driver.quit()
-        exit(1)
+        print(f"   ⚠️  Não foi possível mudar as linhas por página: {str(e)[:80]}")
+    return None
 
-    print("\n[2/5] Navegando para Starlink...")
-    driver.get(STARLINK_URL)
-    time.sleep(15)
+def botao_proxima_pagina(driver):
+    """Botão 'Next page' habilitado, ou None na última página"""
+    botoes = driver.find_elements(By.XPATH, "//button[@aria-label='Next page' or contains(@aria-label, 'next') or contains(@class, 'next')]")
+    if not botoes or botoes[0].get_attribute('disabled'):
+        return None
+    return botoes[0]
 
-    print("\n[3/5] Aplicando filtro 'Last 1 Day'...")
+def extrair_via_rede(driver, coletor):
+    """
+    Terminais lidos das respostas JSON da API (log de performance do Chrome).
+    Retorna [] se nada reconhecível chegar na primeira página: aí a leitura vai pela tabela.
+    """
+    print("   📡 Lendo os terminais das respostas JSON do portal...")
+    inicio = time.monotonic()
+    registros, total, url_api = coletor.aguardar_registros(timeout=20)
+    if not registros or all(r['status'] == "DESCONHECIDO" for r in registros):
+        print("   ⚠️  Nenhuma resposta com terminais reconhecível, lendo pela tabela")
+        return []
+    print(f"   ✓ API: {url_api}")
+    # Endpoint (já com 'Last 1 Day') e cookies da sessão ficam para o modo api
+    pulsar_api.salvar_descoberta(url_api)
     try:
-        time.sleep(8)
-        
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.XPATH, "//button"))
-        )
-        
-        date_buttons = driver.find_elements(By.XPATH, "//button")
-        
-        clicked_filter = False
-        for btn in date_buttons:
-            btn_text = btn.text.strip()
-            if 'Day' in btn_text or 'MTD' in btn_text:
-                try:
-                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
-                    time.sleep(0.5)
-                    btn.click()
-                    print(f"   ✓ Filtro clicado: '{btn_text}'")
-                    time.sleep(2)
-                    clicked_filter = True
-                    break
-                except:
-                    continue
+        pulsar_api.salvar_cookies_navegador(driver.get_cookies())
+    except Exception:
+        pass
+
+    dados = {}
+    for chave, r in pulsar_rede.chaves_registros(registros):
+        dados.setdefault(chave, r)
+    manifesto.registrar("pulsar_pagina", "página 1", time.monotonic() - inicio, linhas=len(registros), modo="rede")
+
+    # Uma página maior cobre tudo (ou quase) numa resposta só
+    if total is None or len(dados) < total:
+        tamanho = selecionar_maior_pagina(driver)
+        if tamanho:
+            print(f"   ✓ {tamanho} linhas por página")
+            inicio = time.monotonic()
+            registros, total_novo, _ = coletor.aguardar_registros(timeout=20)
+            for chave, r in pulsar_rede.chaves_registros(registros):
+                dados.setdefault(chave, r)
+            total = total_novo if total_novo is not None else total
+            manifesto.registrar("pulsar_pagina", "página 1", time.monotonic() - inicio,
+                                linhas=len(registros), modo="rede", por_pagina=tamanho)
+
+    pagina = 1
+    while total is None or len(dados) < total:
+        proximo = botao_proxima_pagina(driver)
+        if proximo is None:
+            break
+        pagina += 1
+        inicio = time.monotonic()
+        try:
+            proximo.click()
+        except Exception as e:
+            print(f"\n   ❌ ERRO AO MUDAR DE PÁGINA")
+            raise RuntimeError(f"Pulsar: falha ao abrir a página {pagina}: {str(e)[:100]}") from e
+        registros, total_novo, _ = coletor.aguardar_registros(timeout=20)
+        if not registros:
+            print(f"\n   ❌ Página {pagina} sem resposta da API")
+            raise RuntimeError(f"Pulsar: página {pagina} sem resposta da API")
+        for chave, r in pulsar_rede.chaves_registros(registros):
+            dados.setdefault(chave, r)
+        total = total_novo if total_novo is not None else total
+        manifesto.registrar("pulsar_pagina", f"página {pagina}", time.monotonic() - inicio,
+                            linhas=len(registros), modo="rede")
+
+    all_data = list(dados.values())
+    for idx, registro in enumerate(all_data, 1):
+        emoji = "🟢" if registro['status'] == "VERDE" else ("🔴" if registro['status'] == "VERMELHO" else "⚪")
+        print(f"   {idx:2d}. {registro['om'][:32]:<32} | {registro['pop']:<17} | {emoji}")
+        manifesto.registrar("pulsar_linha", registro['om'], 0.0, registro['status'], modo="rede")
+    print(f"   ✓ {len(all_data)} terminais em {pagina} página(s)" + (f" (API informa {total})" if total else ""))
+    return all_data
+
+# Leitura da tabela (modos 'tabela' e reserva do 'rede'): "script" lê a página inteira com um
+# execute_script só; "elementos" é a leitura antiga, uma chamada ao WebDriver por célula/atributo.
+PULSAR_LEITURA = os.getenv("PULSAR_LEITURA", "script").lower()
+
+# Palavras que indicam a cor no HTML do SVG (classes, fill, style), quando a cor calculada não resolve
+CORES_VERDES = ('green', '#00ff00', '#0f0', '#00e676', '#4caf50')
+CORES_VERMELHAS = ('red', '#ff0000', '#f00', '#f44336', '#e53935')
+
+# Uma linha por <tr>: OM, uso, cor calculada (fill) do SVG de status, atributos de tooltip e o próprio SVG
+# (volta como WebElement, para o hover quando o KIT não está nos atributos)
+SCRIPT_LINHAS = """
+const dicas = el => el ? ['title', 'aria-label', 'data-tip'].map(a => el.getAttribute(a)).filter(Boolean) : [];
+let linhas = [...document.querySelectorAll('table tbody tr')].filter(tr => tr.querySelector(':scope > td'));
+if (!linhas.length) {
+  linhas = [...document.querySelectorAll('tr[class*="MuiTableRow"]')].filter(tr => tr.querySelector('td'));
+}
+return linhas.map(tr => {
+  const celulas = tr.querySelectorAll(':scope > td');
+  const svgs = celulas.length > 1 ? celulas[1].querySelectorAll('svg') : [];
+  const svg = svgs.length >= 2 ? svgs[1] : null;
+  const formas = svg ? [svg, ...svg.querySelectorAll('path, circle, rect, ellipse, polygon')] : [];
+  return {
+    om: celulas.length ? celulas[0].innerText.trim() : '',
+    uso: celulas.length > 2 ? celulas[2].innerText.trim() : '',
+    celulas: celulas.length,
+    svgs: svgs.length,
+    cores: [...new Set(formas.map(f => getComputedStyle(f).fill).filter(c => c && c !== 'none'))],
+    marcas: formas.map(f => ['class', 'fill', 'stroke', 'style'].map(a => f.getAttribute(a) || '').join(' '))
+                  .join(' ').toLowerCase(),
+    dicas: svg ? [...dicas(svg), ...dicas(svg.parentElement),
+                  ...[...svg.querySelectorAll('title')].map(t => t.textContent)] : [],
+    svg: svg,
+  };
+});
+"""
+
+# KIT que só aparece no tooltip: "eventos" dispara mouseover sintético nos SVGs de dentro da página
+# e lê os tooltips (um execute_async_script por página); "mouse" é o hover real, linha a linha.
+# O que os eventos não resolverem ainda passa pelo mouse.
+PULSAR_TOOLTIP = os.getenv("PULSAR_TOOLTIP", "eventos").lower()
+TOOLTIP_ESPERA_MS = 1500
+TOOLTIP_LOTE = 25
+
+# arguments: SVGs, espera por tooltip (ms), SVGs por lote. Devolve o texto do tooltip de cada SVG (null se não abriu).
+# 1º: lotes abertos juntos, cada tooltip ligado ao SVG pelo aria-describedby/aria-labelledby (MUI);
+# 2º: os que sobraram um por vez, com o tooltip novo ou alterado (MutationObserver) desde o mouseover.
+SCRIPT_TOOLTIPS = """
+const [alvos, esperaMs, lote] = arguments;
+const pronto = arguments[arguments.length - 1];
+const SELETOR = "[role='tooltip'], [class*='tooltip'], [class*='Tooltip'], [class*='Popper']";
+const textos = alvos.map(() => null);
+let tocados = new Set();
+let aoMudar = null;
+
+const observador = new MutationObserver(registros => {
+  for (const r of registros) {
+    for (const no of (r.type === 'characterData' ? [r.target] : r.addedNodes)) {
+      const el = no.nodeType === 1 ? no : no.parentElement;
+      const tooltip = el && (el.closest(SELETOR) || el.querySelector(SELETOR));
+      if (tooltip) tocados.add(tooltip);
+    }
+  }
+  if (aoMudar) aoMudar();
+});
+
+const disparar = (alvo, tipos) => {
+  const r = alvo.getBoundingClientRect();
+  const base = {clientX: r.x + r.width / 2, clientY: r.y + r.height / 2, view: window,
+                cancelable: true, relatedTarget: document.body};
+  for (const tipo of tipos) {
+    const Classe = tipo.startsWith('pointer') ? PointerEvent : MouseEvent;
+    alvo.dispatchEvent(new Classe(tipo, {...base, bubbles: !/enter|leave/.test(tipo)}));
+  }
+};
+const entrar = alvo => disparar(alvo, ['pointerover', 'pointerenter', 'mouseover', 'mouseenter', 'mousemove']);
+const sair = alvo => disparar(alvo, ['pointerout', 'pointerleave', 'mouseout', 'mouseleave']);
+
+const porDescricao = alvo => {
+  for (let el = alvo, n = 0; el && n < 3; el = el.parentElement, n++) {
+    const id = el.getAttribute('aria-describedby') || el.getAttribute('aria-labelledby');
+    const tooltip = id && document.getElementById(id);
+    if (tooltip && tooltip.textContent.includes('KIT')) return tooltip.textContent;
+  }
+  return null;
+};
+const porMutacao = () => {
+  for (const t of tocados) {
+    // Texto já atribuído a outra linha é tooltip atrasado de um SVG anterior
+    if (t.isConnected && t.getClientRects().length && t.textContent.includes('KIT')
+        && !textos.includes(t.textContent)) return t.textContent;
+  }
+  return null;
+};
+
+const emLote = inicio => new Promise(resolver => {
+  const grupo = [];
+  alvos.slice(inicio, inicio + lote).forEach((alvo, k) => { if (alvo && alvo.isConnected) grupo.push([inicio + k, alvo]); });
+  let feito = false;
+  const fim = () => {
+    if (feito) return;
+    feito = true;
+    clearTimeout(limite);
+    aoMudar = null;
+    grupo.forEach(([, alvo]) => sair(alvo));
+    resolver();
+  };
+  const conferir = () => {
+    for (const [i, alvo] of grupo) textos[i] = textos[i] || porDescricao(alvo);
+    if (grupo.every(([i]) => textos[i])) fim();
+  };
+  const limite = setTimeout(fim, esperaMs);
+  aoMudar = conferir;
+  grupo.forEach(([, alvo]) => entrar(alvo));
+  conferir();
+});
+
+const umPorVez = i => new Promise(resolver => {
+  const alvo = alvos[i];
+  tocados = new Set();
+  let feito = false;
+  const fim = texto => {
+    if (feito) return;
+    feito = true;
+    clearTimeout(limite);
+    aoMudar = null;
+    textos[i] = texto;
+    sair(alvo);
+    resolver();
+  };
+  const conferir = () => { const texto = porDescricao(alvo) || porMutacao(); if (texto) fim(texto); };
+  const limite = setTimeout(() => fim(porDescricao(alvo) || porMutacao()), esperaMs);
+  aoMudar = conferir;
+  entrar(alvo);
+  conferir();
+});
+
+(async () => {
+  observador.observe(document.body, {childList: true, subtree: true, characterData: true});
+  try {
+    for (let i = 0; i < alvos.length; i += lote) await emLote(i);
+    for (let i = 0; i < alvos.length; i++) {
+      if (!textos[i] && alvos[i] && alvos[i].isConnected) await umPorVez(i);
+    }
+  } finally {
+    observador.disconnect();
+    pronto(textos);
+  }
+})();
+"""
+
+def kit_em_texto(texto):
+    """Primeira palavra 'KIT...' de um tooltip ou atributo ('' se não houver)"""
+    for palavra in (texto or "").replace("\n", " ").split():
+        if palavra.startswith("KIT"):
+            return palavra
+    return ""
+
+def cor_status(linha):
+    """VERDE/VERMELHO pela cor calculada do SVG de status; palavras-chave do HTML como reserva"""
+    for cor in linha.get('cores') or []:
+        m = re.match(r"rgba?\((\d+),\s*(\d+),\s*(\d+)", cor)
+        if not m:
+            continue
+        r, g, b = map(int, m.groups())
+        if g >= 100 and g > r * 1.4 and g > b * 1.2:
+            return "VERDE"
+        if r >= 150 and r > g * 1.6 and r > b * 1.6:
+            return "VERMELHO"
+    marcas = linha.get('marcas') or ""
+    if any(p in marcas for p in CORES_VERDES):
+        return "VERDE"
+    if any(p in marcas for p in CORES_VERMELHAS):
+        return "VERMELHO"
+    return "DESCONHECIDO"
+
+def ler_linhas_elementos(driver):
+    """Mesmo formato do SCRIPT_LINHAS, lido célula a célula pelo WebDriver"""
+    rows = driver.find_elements(By.XPATH, "//table//tbody//tr[td]")
+    if not rows:
+        rows = driver.find_elements(By.XPATH, "//tr[contains(@class, 'MuiTableRow') and .//td]")
+    linhas = []
+    for row in rows:
+        linha = {'om': '', 'uso': '', 'celulas': 0, 'svgs': 0, 'cores': [], 'marcas': '', 'dicas': [], 'svg': None}
+        try:
+            cells = row.find_elements(By.TAG_NAME, "td")
+            linha['celulas'] = len(cells)
+            if cells:
+                linha['om'] = cells[0].text.strip()
+            if len(cells) >= 3:
+                linha['uso'] = cells[2].text.strip()
+            svgs = cells[1].find_elements(By.XPATH, ".//svg | .//*[name()='svg']") if len(cells) >= 2 else []
+            linha['svgs'] = len(svgs)
+            if len(svgs) >= 2:
+                linha['svg'] = svgs[1]
+                linha['marcas'] = svgs[1].get_attribute('outerHTML').lower()
+                for elemento in (svgs[1], svgs[1].find_element(By.XPATH, "..")):
+                    for attr in ('title', 'aria-label', 'data-tip'):
+                        valor = elemento.get_attribute(attr)
+                        if valor:
+                            linha['dicas'].append(valor)
+        except Exception:
+            pass
+        linhas.append(linha)
+    return linhas
+
+def ler_linhas(driver):
+    """Linhas da página atual: um execute_script só (PULSAR_LEITURA=script) ou célula a célula"""
+    if PULSAR_LEITURA == "script":
+        try:
+            linhas = driver.execute_script(SCRIPT_LINHAS)
+            if isinstance(linhas, list):
+                return linhas, "script"
+        except Exception as e:
+            print(f"   ⚠️  Leitura por script falhou ({str(e)[:80]}), lendo célula a célula")
+    return ler_linhas_elementos(driver), "elementos"
+
+def kit_por_hover(driver, svg):
+    """Passa o mouse no SVG de status até o tooltip com o KIT aparecer ('' se não aparecer)"""
+    kit_id = ""
+    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", svg)
+    max_tentativas = 5
+    
+    for tentativa in range(max_tentativas):
+        actions = ActionChains(driver)
+        actions.move_to_element(svg).perform()
+        texto = esperas.aguardar(driver, "tooltip KIT", esperas.tooltip_com_texto("KIT"), 3.5)
+        kit_id = kit_em_texto(texto)
+        if kit_id:
+            break
         
-        if clicked_filter:
-            try:
-                time.sleep(1)
-                last_1_day = driver.find_element(By.XPATH, "//*[text()='Last 1 Day']")
-                last_1_day.click()
-                print("   ✓ 'Last 1 Day' selecionado")
-                time.sleep(1.5)
-                
-                apply_btns = driver.find_elements(By.XPATH, "//button[text()='Apply' or contains(text(), 'Apply')]")
-                for apply_btn in apply_btns:
-                    if apply_btn.is_displayed():
-                        apply_btn.click()
-                        print("   ✓ Apply clicado")
-                        break
-                
-                time.sleep(8)
-                print("   ✅ Filtro aplicado!")
-                
-            except Exception as e2:
-                print(f"   ⚠️  Erro ao aplicar filtro: {e2}")
-                actions.send_keys(Keys.ESCAPE).perform()
-                time.sleep(2)
+        if tentativa < max_tentativas - 1:
+            # Tira o mouse para o tooltip poder abrir de novo
+            ActionChains(driver).move_by_offset(200, 0).perform()
+    
+    ActionChains(driver).move_by_offset(100, 100).perform()
+    return kit_id
+
+def kits_por_eventos(driver, svgs):
+    """KIT de cada SVG pelos tooltips abertos com eventos sintéticos ('' onde não abriu), na mesma ordem"""
+    inicio = time.monotonic()
+    driver.set_script_timeout(30 + len(svgs) * TOOLTIP_ESPERA_MS / 1000 * 2)
+    textos = driver.execute_async_script(SCRIPT_TOOLTIPS, svgs, TOOLTIP_ESPERA_MS, TOOLTIP_LOTE) or []
+    kits = [kit_em_texto(t) for t in textos] + [""] * (len(svgs) - len(textos))
+    encontrados = sum(1 for k in kits if k)
+    manifesto.registrar("espera", "tooltips KIT em lote", time.monotonic() - inicio,
+                        "ok" if encontrados == len(svgs) else "timeout", quantidade=len(svgs), encontrados=encontrados)
+    print(f"   💬 Tooltips em lote: {encontrados}/{len(svgs)} KIT(s) em {time.monotonic() - inicio:.1f}s")
+    return kits
+
+def linha_valida(linha):
+    """Linha com OM de verdade (fora cabeçalhos de grupo e 'No service line')"""
+    om = linha['om']
+    if linha['celulas'] < 2:
+        return False
+    return bool(om) and "SERVICE LINE" not in om.upper() and "NO SERVICE" not in om.upper() and len(om) >= 3
+
+def kits_da_pagina(driver, linhas, nomes_vistos):
+    """
+    {índice da linha: (KIT, origem)}. Origem: "atributo" (title/aria-label/data-tip), "cache"
+    (pulsar_kits, só a cor é lida) ou "tooltip" (eventos em lote). O que ficar sem KIT vai para o mouse,
+    assim como "reconfirmar": KIT em cache que precisa ser visto de novo no portal para ser renovado.
+    nomes_vistos: service lines das páginas anteriores (nome repetido é ambíguo e não usa o cache).
+    """
+    validas = [idx for idx, linha in enumerate(linhas) if linha_valida(linha) and linha['svg'] is not None]
+    repetidos = {linhas[i]['om'] for i in validas
+                 if linhas[i]['om'] in nomes_vistos or sum(linhas[j]['om'] == linhas[i]['om'] for j in validas) > 1}
+
+    kits = {}
+    pendentes = []
+    em_cache = {}
+    for idx in validas:
+        linha = linhas[idx]
+        # Atributos (title/aria-label/data-tip) do SVG e do pai não precisam de hover
+        kit = next((k for k in map(kit_em_texto, linha['dicas']) if k), "")
+        if kit:
+            kits[idx] = (kit, "atributo")
+            continue
+        kit = None if linha['om'] in repetidos else pulsar_kits.consultar(linha['om'], pulsar_kits.assinatura(linha))
+        if kit:
+            em_cache[idx] = kit
         else:
-            print("   ⚠️  Continuando com filtro padrão...")
-            time.sleep(5)
-        
-    except Exception as e:
-        print(f"   ❌ ERRO CRÍTICO NO FILTRO: {e}")
-        driver.quit()
-        exit(1)
+            pendentes.append(idx)
 
-    print("\n[4/5] Extraindo dados...")
+    # As entradas mais antigas vão ao tooltip; se ele não abrir, o KIT do cache vale
+    reconfirmar = pulsar_kits.para_reconfirmar({linhas[i]['om'] for i in em_cache})
+    for idx, kit in em_cache.items():
+        if linhas[idx]['om'] in reconfirmar:
+            kits[idx] = (kit, "reconfirmar")
+            pendentes.append(idx)
+        else:
+            kits[idx] = (kit, "cache")
 
-    print("   ⏳ Aguardando tabela...")
+    if pendentes:
+        print(f"   🗂️  KIT em cache: {len(em_cache)} ({len(reconfirmar)} a reconfirmar) | "
+              f"a descobrir: {len(pendentes) - len(reconfirmar)}" + (f" ({len(repetidos)} nome(s) repetido(s))" if repetidos else ""))
+    if pendentes and PULSAR_TOOLTIP == "eventos":
+        try:
+            for idx, kit in zip(pendentes, kits_por_eventos(driver, [linhas[i]['svg'] for i in pendentes])):
+                if kit:
+                    kits[idx] = (kit, "tooltip")
+        except Exception as e:
+            print(f"   ⚠️  Tooltips por eventos falharam ({str(e)[:80]}), usando o mouse")
+    return kits, repetidos
+
+# Progresso da leitura da tabela, página a página, na pasta de checkpoints do dia:
+# se o coletor cair no meio, a próxima tentativa pula direto para a página seguinte.
+# Só quando o fluxo do relatório liga os checkpoints (checkpoint.ativar_progresso)
+PROGRESSO = "pulsar_progresso"
+
+def salvar_progresso(pagina, linhas_por_pagina, all_data, kit_ids_processados, identificadores, nomes_vistos,
+                     revisar):
     try:
-        WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.XPATH, "//table//tbody//tr"))
-        )
-        time.sleep(5)
-    except Exception as e:
-        print(f"   ❌ Tabela não carregou: {str(e)[:100]}")
-        driver.quit()
-        exit(1)
+        checkpoint.salvar(PROGRESSO, {
+            "pagina": pagina,
+            "linhas_por_pagina": linhas_por_pagina,
+            "registros": all_data,
+            "kits": {kit: list(v) for kit, v in kit_ids_processados.items()},
+            "identificadores": sorted(identificadores),
+            "nomes": sorted(nomes_vistos),
+            "revisar": revisar,
+        })
+    except OSError as e:
+        print(f"   ⚠️  Não foi possível salvar o progresso do Pulsar: {e}")
 
-    print("   🔍 Aplicando zoom 50%...")
+def botao_pagina_anterior(driver):
+    """Botão 'Previous page' habilitado, ou None na primeira página"""
+    botoes = driver.find_elements(By.XPATH, "//button[@aria-label='Previous page' or contains(@aria-label, 'previous') or contains(@class, 'prev')]")
+    if not botoes or botoes[0].get_attribute('disabled'):
+        return None
+    return botoes[0]
+
+def kit_contestado(driver, svg):
+    """KIT relido pelo mouse numa linha cujo KIT em cache o portal contradisse ('' se o tooltip não abrir)"""
     try:
-        driver.execute_script("document.body.style.zoom='50%'")
-        time.sleep(2)
-    except:
-        pass
+        return kit_por_hover(driver, svg)
+    except Exception:
+        return ""
 
+def reler_kits(driver, pagina_atual, revisar):
+    """
+    Volta ('Previous page') às páginas já lidas que têm linhas com KIT em cache contradito
+    depois e relê o KIT delas pelo mouse.
+    revisar: [página, índice da linha, posição em all_data, OM]
+    Retorna {posição: (KIT, linha)}; o que não der para reler fica de fora.
+    """
+    relidos = {}
+    pagina = pagina_atual
+    for alvo in sorted({p for p, _, _, _ in revisar}, reverse=True):
+        while pagina > alvo:
+            anterior = botao_pagina_anterior(driver)
+            if anterior is None:
+                return relidos
+            assinatura = esperas.assinatura_tabela(driver)
+            anterior.click()
+            if not esperas.aguardar(driver, f"revisão: página {pagina - 1}", esperas.tabela_mudou(assinatura), 20):
+                return relidos
+            pagina -= 1
+        esperas.aguardar(driver, "revisão: linhas estáveis", esperas.linhas_estaveis(estabilidade=0.5), 10)
+        linhas, _ = ler_linhas(driver)
+        for p, idx, posicao, om in revisar:
+            # A linha tem que ser a mesma OM de antes: tabela reordenada não recebe KIT de outra
+            if p == alvo and idx < len(linhas) and linhas[idx]['om'] == om and linhas[idx]['svg'] is not None:
+                relidos[posicao] = (kit_contestado(driver, linhas[idx]['svg']), linhas[idx])
+    return relidos
+
+def avancar_paginas(driver, paginas):
+    """Clica 'Next page' n vezes, só esperando a tabela trocar (páginas já lidas numa tentativa anterior)"""
+    for n in range(paginas):
+        proximo = botao_proxima_pagina(driver)
+        if proximo is None:
+            return False
+        assinatura = esperas.assinatura_tabela(driver)
+        proximo.click()
+        if not esperas.aguardar(driver, f"retomada: página {n + 2}", esperas.tabela_mudou(assinatura), 20):
+            return False
+    esperas.aguardar(driver, "retomada: linhas estáveis", esperas.linhas_estaveis(estabilidade=0.5), 10)
+    return True
+
+def extrair_tabela(driver):
+    """Leitura da tabela na tela, página a página (hover no status só quando o KIT não vem nos atributos)"""
+    print("   🔍 Aplicando zoom 50%...")
     try:
+        # execute_script é síncrono: zoom e rolagem já valem no retorno
+        driver.execute_script("document.body.style.zoom='50%'")
         driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(2)
     except:
         pass
 
+    # Maior opção de 'Rows per page': menos páginas para virar
+    tamanho = selecionar_maior_pagina(driver)
+    if tamanho:
+        print(f"   ✓ {tamanho} linhas por página")
+        esperas.aguardar(driver, "tabela: linhas por página", esperas.linhas_estaveis(estabilidade=1.0), 15)
+    linhas_por_pagina = len(driver.find_elements(By.XPATH, "//table//tbody//tr[td]"))
+
     all_data = []
-    kit_ids_processados = set()
+    kit_ids_processados = {}    # KIT -> (posição em all_data, origem do KIT, página, índice da linha)
+    revisar = []                # linhas de páginas anteriores com KIT em cache contradito (ver reler_kits)
     identificadores_processados = set()
+    nomes_vistos = set()
     current_page = 1
     has_next_page = True
 
+    # Só no fluxo 'report': 'collect' e 'report --only' rodam sem checkpoints
+    usar_progresso = checkpoint.progresso_ativo()
+    progresso = checkpoint.carregar(PROGRESSO) if usar_progresso else None
+    if progresso and progresso.get("linhas_por_pagina") == linhas_por_pagina:
+        print(f"   ♻️  Retomando depois da página {progresso['pagina']} ({len(progresso['registros'])} registros já lidos)")
+        if avancar_paginas(driver, progresso["pagina"]):
+            all_data = progresso["registros"]
+            kit_ids_processados = {kit: tuple(v) for kit, v in progresso["kits"].items()}
+            identificadores_processados = set(progresso["identificadores"])
+            nomes_vistos = set(progresso["nomes"])
+            revisar = progresso.get("revisar", [])
+            current_page = progresso["pagina"] + 1
+        else:
+            # A tabela mudou desde a tentativa anterior: a próxima recomeça da primeira página
+            checkpoint.remover(PROGRESSO)
+            raise RuntimeError(f"Pulsar: não foi possível voltar à página {progresso['pagina'] + 1}, "
+                               f"progresso descartado")
+    elif progresso:
+        checkpoint.remover(PROGRESSO)
+
     while has_next_page:
         print(f"\n   📄 Página {current_page}...")
+        inicio_pagina = time.monotonic()
         
-        rows = driver.find_elements(By.XPATH, "//table//tbody//tr[td]")
-        
-        if not rows or len(rows) == 0:
-            rows = driver.find_elements(By.XPATH, "//tr[contains(@class, 'MuiTableRow') and .//td]")
+        linhas, leitura = ler_linhas(driver)
         
-        print(f"   ✓ {len(rows)} linhas encontradas\n")
+        print(f"   ✓ {len(linhas)} linhas encontradas\n")
         
-        if len(rows) == 0:
+        if len(linhas) == 0:
             print("   ❌ Nenhuma linha!")
             break
         
-        for idx, row in enumerate(rows):
+        kits, repetidos = kits_da_pagina(driver, linhas, nomes_vistos)
+        for om in repetidos:
+            pulsar_kits.invalidar(om)
+        linhas_pagina = {}      # posição em all_data -> linha desta página (SVG ainda válido para o hover)
+        
+        for idx, linha in enumerate(linhas):
+            inicio_linha = time.monotonic()
+            om = linha['om']
+            origem = ""
+            resultado_linha = "ignorada"
             try:
-                cells = row.find_elements(By.TAG_NAME, "td")
-                
-                if len(cells) < 2:
-                    continue
-                
-                om = cells[0].text.strip()
-                
-                if not om or "SERVICE LINE" in om.upper() or "NO SERVICE" in om.upper() or len(om) < 3:
+                if not linha_valida(linha):
                     continue
                 
-                status_cell = cells[1]
-                svgs = status_cell.find_elements(By.XPATH, ".//svg | .//*[name()='svg']")
-                
-                kit_id = ""
+                kit_id, origem = kits.get(idx, ("", ""))
                 status_cor = "DESCONHECIDO"
                 
-                if len(svgs) >= 2:
-                    segundo_svg = svgs[1]
-                    
+                if linha['svg'] is not None:
                     try:
-                        driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});", segundo_svg)
-                        time.sleep(0.8)
-                        
-                        tooltip_found = False
-                        max_tentativas = 5
-                        
-                        for tentativa in range(max_tentativas):
-                            if tooltip_found:
-                                break
-                            
-                            actions = ActionChains(driver)
-                            actions.move_to_element(segundo_svg).perform()
-                            time.sleep(3.5)
-                            
-                            try:
-                                tooltips = driver.find_elements(By.XPATH, "//div[@role='tooltip']")
-                                visible_tooltips = [t for t in tooltips if t.is_displayed() and t.size['height'] > 0 and t.size['width'] > 0]
-                                
-                                if visible_tooltips:
-                                    tooltip = visible_tooltips[-1]
-                                    tooltip_text = tooltip.text.strip()
-                                    if tooltip_text and "KIT" in tooltip_text:
-                                        words = tooltip_text.replace("\n", " ").split()
-                                        for word in words:
-                                            if word.startswith("KIT"):
-                                                kit_id = word
-                                                tooltip_found = True
-                                                break
-                                        if tooltip_found:
-                                            break
-                            except:
-                                pass
-                            
-                            if not tooltip_found:
-                                try:
-                                    tooltips = driver.find_elements(By.XPATH, "//*[contains(@class, 'tooltip') or contains(@class, 'Tooltip') or contains(@class, 'Popper')]")
-                                    for tooltip in tooltips:
-                                        if tooltip.is_displayed() and tooltip.size['height'] > 0:
-                                            tooltip_text = tooltip.text.strip()
-                                            if tooltip_text and "KIT" in tooltip_text:
-                                                words = tooltip_text.replace("\n", " ").split()
-                                                for word in words:
-                                                    if word.startswith("KIT"):
-                                                        kit_id = word
-                                                        tooltip_found = True
-                                                        break
-                                                if tooltip_found:
-                                                    break
-                                except:
-                                    pass
-                            
-                            if not tooltip_found:
-                                try:
-                                    parent = segundo_svg.find_element(By.XPATH, "..")
-                                    title_attr = parent.get_attribute('title')
-                                    aria_label_attr = parent.get_attribute('aria-label')
-                                    data_tip = parent.get_attribute('data-tip')
-                                    
-                                    for attr in [title_attr, aria_label_attr, data_tip]:
-                                        if attr and "KIT" in attr:
-                                            words = attr.split()
-                                            for word in words:
-                                                if word.startswith("KIT"):
-                                                    kit_id = word
-                                                    tooltip_found = True
-                                                    break
-                                            if tooltip_found:
-                                                break
-                                except:
-                                    pass
-                            
-                            if not tooltip_found:
-                                title_attr = segundo_svg.get_attribute('title')
-                                aria_label_attr = segundo_svg.get_attribute('aria-label')
-                                data_tip = segundo_svg.get_attribute('data-tip')
-                                
-                                for attr in [title_attr, aria_label_attr, data_tip]:
-                                    if attr and "KIT" in attr:
-                                        words = attr.split()
-                                        for word in words:
-                                            if word.startswith("KIT"):
-                                                kit_id = word
-                                                tooltip_found = True
-                                                break
-                                        if tooltip_found:
-                                            break
-                            
-                            if not tooltip_found and tentativa < max_tentativas - 1:
-                                actions = ActionChains(driver)
-                                actions.move_by_offset(200, 0).perform()
-                                time.sleep(0.5)
+                        if not kit_id or origem == "reconfirmar":
+                            lido = kit_por_hover(driver, linha['svg'])
+                            if lido or not kit_id:
+                                kit_id, origem = lido, "hover"
+                            else:
+                                # O tooltip não abriu: fica o KIT do cache, ainda dentro da validade
+                                origem = "cache"
                         
-                        svg_html = segundo_svg.get_attribute('outerHTML').lower()
-                        
-                        if 'green' in svg_html or '#00ff00' in svg_html or '#0f0' in svg_html or '#00e676' in svg_html or '#4caf50' in svg_html:
-                            status_cor = "VERDE"
-                        elif 'red' in svg_html or '#ff0000' in svg_html or '#f00' in svg_html or '#f44336' in svg_html or '#e53935' in svg_html:
-                            status_cor = "VERMELHO"
-                        
-                        actions.move_by_offset(100, 100).perform()
-                        time.sleep(0.1)
+                        status_cor = cor_status(linha)
                         
                     except Exception as e:
                         pass
+                if origem == "reconfirmar":
+                    origem = "cache"
                 
-                usage = cells[2].text.strip() if len(cells) >= 3 else ""
-                
+                if kit_id and kit_id in kit_ids_processados and origem == "cache":
+                    # O portal mostrou este KIT em outra linha: o cache desta estava errado, relê pelo mouse
+                    pulsar_kits.invalidar(om)
+                    kit_id, origem = kit_contestado(driver, linha['svg']), "hover"
                 if kit_id and kit_id in kit_ids_processados:
-                    continue
+                    anterior, origem_anterior, *local = kit_ids_processados[kit_id]
+                    if origem_anterior != "cache":
+                        continue
+                    # A linha anterior recebeu este KIT do cache e o portal o mostrou aqui: ela é relida pelo
+                    # mouse agora (mesma página) ou no fim da leitura (reler_kits)
+                    pulsar_kits.invalidar(all_data[anterior]['om'])
+                    del kit_ids_processados[kit_id]
+                    all_data[anterior]['pop'] = "N/A"
+                    if anterior in linhas_pagina:
+                        lido = kit_contestado(driver, linhas_pagina[anterior]['svg'])
+                        if lido and lido not in kit_ids_processados:
+                            all_data[anterior]['pop'] = lido
+                            kit_ids_processados[lido] = (anterior, "hover", current_page, local[1] if local else None)
+                            pulsar_kits.registrar(all_data[anterior]['om'], pulsar_kits.assinatura(linhas_pagina[anterior]), lido)
+                            if lido == kit_id:
+                                # O cache estava certo: esta linha é que repete o KIT
+                                continue
+                    elif local:
+                        revisar.append([local[0], local[1], anterior, all_data[anterior]['om']])
                 
                 identificador = f"{om}|{kit_id}" if kit_id else f"{om}|{idx}"
                 
@@ -420,8 +748,11 @@ def extrair_dados_starlink(headless=False):
                     continue
                 
                 identificadores_processados.add(identificador)
+                linhas_pagina[len(all_data)] = linha
                 if kit_id:
-                    kit_ids_processados.add(kit_id)
+                    kit_ids_processados[kit_id] = (len(all_data), origem, current_page, idx)
+                    if origem != "cache" and om not in repetidos:
+                        pulsar_kits.registrar(om, pulsar_kits.assinatura(linha), kit_id)
                 
                 all_data.append({
                     'om': om,
@@ -432,9 +763,22 @@ def extrair_dados_starlink(headless=False):
                 
                 emoji = "🟢" if status_cor == "VERDE" else ("🔴" if status_cor == "VERMELHO" else "⚪")
                 print(f"   {idx+1:2d}. {om[:32]:<32} | {kit_id:<17} | {emoji}")
+                resultado_linha = status_cor
                 
             except Exception as e:
+                resultado_linha = "erro"
                 continue
+            finally:
+                manifesto.registrar("pulsar_linha", om or f"linha {idx+1}", time.monotonic() - inicio_linha,
+                                    resultado_linha, pagina=current_page, kit=origem or None)
+        
+        nomes_vistos.update(linha['om'] for linha in linhas if linha_valida(linha))
+        pulsar_kits.salvar()
+        if usar_progresso:
+            salvar_progresso(current_page, linhas_por_pagina, all_data, kit_ids_processados,
+                             identificadores_processados, nomes_vistos, revisar)
+        manifesto.registrar("pulsar_pagina", f"página {current_page}", time.monotonic() - inicio_pagina,
+                            linhas=len(linhas), leitura=leitura)
         
         try:
             next_button = driver.find_element(By.XPATH, "//button[@aria-label='Next page' or contains(@aria-label, 'next') or contains(@class, 'next')]")
@@ -445,36 +789,197 @@ def extrair_dados_starlink(headless=False):
                 has_next_page = False
                 print(f"\n   ✓ Última página ({current_page})")
             else:
+                assinatura = esperas.assinatura_tabela(driver)
                 next_button.click()
                 print(f"\n   ➡️  Página {current_page + 1}...")
-                time.sleep(8)
-                current_page += 1
                 
-                try:
-                    WebDriverWait(driver, 15).until(
-                        EC.presence_of_element_located((By.XPATH, "//table//tbody//tr[td]"))
-                    )
-                    time.sleep(3)
-                except:
-                    time.sleep(5)
+                # Tabela que não trocou seria lida de novo como a página seguinte
+                if not esperas.aguardar(driver, f"página {current_page + 1}: tabela nova", esperas.tabela_mudou(assinatura), 20):
+                    raise RuntimeError(f"a tabela não mudou para a página {current_page + 1}")
+                current_page += 1
+                esperas.aguardar(driver, f"página {current_page}: linhas estáveis", esperas.linhas_estaveis(estabilidade=0.5), 10)
                 
                 driver.execute_script("window.scrollTo(0, 0);")
-                time.sleep(2)
                 
-        except:
-            # Se deu erro ao tentar mudar de página, não assuma que acabou. Aborte.
-            print(f"\n   ❌ ERRO AO MUDAR DE PÁGINA (Tentando reiniciar...)")
-            driver.quit()
-            exit(1)
+        except Exception as e:
+            # Se deu erro ao tentar mudar de página, não assuma que acabou. O progresso fica
+            # salvo e a próxima tentativa continua da página seguinte.
+            print(f"\n   ❌ ERRO AO MUDAR DE PÁGINA" + (f" (progresso salvo até a página {current_page})"
+                                                       if usar_progresso else ""))
+            raise RuntimeError(f"Pulsar: falha ao sair da página {current_page}: {str(e)[:100]}") from e
+
+    if revisar:
+        print(f"\n   🔁 Relendo o KIT de {len(revisar)} linha(s) com cache contradito em páginas anteriores...")
+        for posicao, (kit, linha) in reler_kits(driver, current_page, revisar).items():
+            if kit and kit not in kit_ids_processados:
+                all_data[posicao]['pop'] = kit
+                kit_ids_processados[kit] = (posicao, "hover")
+                pulsar_kits.registrar(linha['om'], pulsar_kits.assinatura(linha), kit)
+        pulsar_kits.salvar()
+
+    if usar_progresso:
+        checkpoint.remover(PROGRESSO)
+    return all_data
+
+def extrair_dados_starlink(headless=False):
+    print("="*75)
+    print(" "*20 + "EXTRATOR STARLINK")
+    print("="*75)
 
-    driver.quit()
+    if PULSAR_MODO == "api":
+        print("\n[API] Consultando o Pulsar sem navegador...")
+        try:
+            dados = pulsar_api.buscar_terminais()
+            print(f"\n✅ {len(dados)} registros extraídos!")
+            return dados
+        except Exception as e:
+            print(f"   ⚠️  API do Pulsar indisponível ({str(e)[:150]}), seguindo pelo navegador")
+
+    # Verificação prévia
+    if headless:
+        check_errors = navegador.verificar_instalacao()
+        if check_errors:
+            print("\n   ❌ PROBLEMAS DETECTADOS:")
+            for error in check_errors:
+                print(f"   • {error}")
+            print("\n   💡 Execute o teste primeiro: python3 test_chrome_ubuntu.py")
+            raise RuntimeError("Chrome/ChromeDriver não está configurado corretamente")
+
+    # Navegador (no modo serviço continua aberto e logado desde a última execução)
+    driver = recursos.obter("pulsar.driver", lambda: iniciar_navegador(headless), valido=recursos.navegador_ativo)
+    try:
+        all_data = extrair_no_navegador(driver)
+    except BaseException:
+        # Navegador em estado desconhecido: fecha em vez de guardar para a próxima execução
+        recursos.descartar("pulsar.driver", driver)
+        raise
+    recursos.liberar("pulsar.driver", driver)
 
     if not all_data:
         print("\n❌ NENHUM DADO EXTRAÍDO!")
-        exit(1)
+        raise RuntimeError("Pulsar: nenhum dado extraído")
 
     print(f"\n✅ {len(all_data)} registros extraídos!")
     print(all_data)
     return all_data
 
+def extrair_no_navegador(driver):
+    """Login (se preciso), filtro 'Last 1 Day' e leitura dos terminais; levanta RuntimeError se não der"""
+    actions = ActionChains(driver)
+
+    origem_sessao = reaproveitar_sessao(driver)
+    if origem_sessao:
+        print(f"\n[1/5] Sessão ainda válida ({origem_sessao}), login dispensado")
+    else:
+        print("\n[1/5] Fazendo login...")
+        driver.get(LOGIN_URL)
+        esperas.aguardar(driver, "login: formulário", esperas.elemento_presente(By.NAME, "userName"), 30)
+
+        try:
+            email_input = driver.find_element(By.NAME, "userName")
+            pass_input = driver.find_element(By.NAME, "password")
+            email_input.send_keys(USER_EMAIL)
+            pass_input.send_keys(USER_PASSWORD)
+
+            login_button = driver.find_element(By.XPATH, "//button[contains(@class, 'loginButton')]")
+            login_button.click()
+            if esperas.aguardar(driver, "login: saída da página de login", esperas.url_nao_contem("/login"), 30):
+                print("   ✓ Login realizado")
+                # Próximas execuções (e o modo api) entram com estes cookies, sem novo login
+                pulsar_api.salvar_cookies_navegador(driver.get_cookies())
+            else:
+                print("   ⚠️  Ainda na página de login após 30 s, seguindo mesmo assim")
+        except Exception as e:
+            print(f"   ❌ Erro no login: {e}")
+            raise RuntimeError(f"Pulsar: erro no login: {str(e)[:150]}") from e
+
+    print("\n[2/5] Navegando para Starlink...")
+    coletor = None
+    if origem_sessao:
+        # sessao_ativa() já deixou o mapa carregado (e o log só com esta carga)
+        if PULSAR_MODO in ("rede", "api"):
+            coletor = pulsar_rede.ColetorRespostas(driver)
+    else:
+        if PULSAR_MODO in ("rede", "api"):
+            # Log de execuções anteriores (navegador aquecido) não pode se misturar com o desta
+            pulsar_rede.descartar_log(driver)
+            coletor = pulsar_rede.ColetorRespostas(driver)
+        driver.get(STARLINK_URL)
+        esperas.aguardar(driver, "starlink: carga inicial", esperas.rede_ociosa(1.0), 45)
+
+    print("\n[3/5] Aplicando filtro 'Last 1 Day'...")
+    try:
+        esperas.aguardar(driver, "filtro: botão de período", esperas.elemento_presente(
+            By.XPATH, "//button[contains(., 'Day') or contains(., 'MTD')]"), 20)
+        WebDriverWait(driver, 20).until(
+            EC.presence_of_element_located((By.XPATH, "//button"))
+        )
+        
+        date_buttons = driver.find_elements(By.XPATH, "//button")
+        
+        clicked_filter = False
+        for btn in date_buttons:
+            btn_text = btn.text.strip()
+            if 'Day' in btn_text or 'MTD' in btn_text:
+                try:
+                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
+                    btn.click()
+                    print(f"   ✓ Filtro clicado: '{btn_text}'")
+                    clicked_filter = True
+                    break
+                except:
+                    continue
+        
+        if clicked_filter:
+            try:
+                last_1_day = esperas.aguardar(driver, "filtro: opção 'Last 1 Day'", esperas.elemento_visivel(
+                    By.XPATH, "//*[text()='Last 1 Day']"), 10, obrigatoria=True)
+                last_1_day.click()
+                print("   ✓ 'Last 1 Day' selecionado")
+                esperas.aguardar(driver, "filtro: botão Apply", esperas.elemento_visivel(
+                    By.XPATH, "//button[text()='Apply' or contains(text(), 'Apply')]"), 10)
+                
+                apply_btns = driver.find_elements(By.XPATH, "//button[text()='Apply' or contains(text(), 'Apply')]")
+                if coletor:
+                    # Só interessam as respostas já com 'Last 1 Day'
+                    pulsar_rede.descartar_log(driver)
+                for apply_btn in apply_btns:
+                    if apply_btn.is_displayed():
+                        apply_btn.click()
+                        print("   ✓ Apply clicado")
+                        break
+                
+                esperas.aguardar(driver, "filtro: recarga da tabela", esperas.rede_ociosa(1.0), 30)
+                print("   ✅ Filtro aplicado!")
+                
+            except Exception as e2:
+                print(f"   ⚠️  Erro ao aplicar filtro: {e2}")
+                actions.send_keys(Keys.ESCAPE).perform()
+                esperas.aguardar(driver, "filtro: menu fechado", esperas.rede_ociosa(0.5), 5)
+        else:
+            print("   ⚠️  Continuando com filtro padrão...")
+        
+    except Exception as e:
+        print(f"   ❌ ERRO CRÍTICO NO FILTRO: {e}")
+        raise RuntimeError(f"Pulsar: erro no filtro: {str(e)[:150]}") from e
+
+    print("\n[4/5] Extraindo dados...")
+
+    print("   ⏳ Aguardando tabela...")
+    try:
+        WebDriverWait(driver, 30).until(
+            EC.presence_of_element_located((By.XPATH, "//table//tbody//tr"))
+        )
+        esperas.aguardar(driver, "tabela: linhas estáveis", esperas.linhas_estaveis(estabilidade=1.0), 15)
+    except Exception as e:
+        print(f"   ❌ Tabela não carregou: {str(e)[:100]}")
+        raise RuntimeError(f"Pulsar: tabela não carregou: {str(e)[:100]}") from e
+
+    all_data = []
+    if coletor:
+        all_data = extrair_via_rede(driver, coletor)
+    if not all_data:
+        all_data = extrair_tabela(driver)
+    return all_data
+
 
@@ -0,0 +1,287 @@
+"""
+PULSAR SEM NAVEGADOR (PULSAR_MODO=api)
+Login por HTTP com PULSAR_EMAIL/PULSAR_PASSWORD e leitura direta da lista de terminais.
+    - Endpoint dos terminais: PULSAR_API_TERMINAIS ou o descoberto pelo modo 'rede'
+      (output/pulsar_api.json, gravado com a URL já filtrada em 'Last 1 Day').
+    - Login: PULSAR_API_LOGIN (POST JSON). Token e cookies ficam em output/pulsar_sessao.json
+      até expirar (claim 'exp' do JWT, 'expiresIn' ou PULSAR_API_TTL_HORAS); os cookies
+      do navegador do modo 'rede' também servem, enquanto valerem.
+Os registros saem no formato de sempre ({'om', 'pop', 'status', 'OCORRÊNCIA'}), pelo mesmo
+interpretador de payloads do modo 'rede'. Qualquer falha levanta exceção e o pulsar.py
+segue pelo navegador.
+"""
+import base64
+import datetime
+import json
+import os
+import re
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+from modules import manifesto, pulsar_rede
+
+USER_EMAIL = os.getenv("PULSAR_EMAIL")
+USER_PASSWORD = os.getenv("PULSAR_PASSWORD")
+API_LOGIN = os.getenv("PULSAR_API_LOGIN")
+API_TERMINAIS = os.getenv("PULSAR_API_TERMINAIS")
+POR_PAGINA = int(os.getenv("PULSAR_API_POR_PAGINA", "500"))
+TTL_HORAS = float(os.getenv("PULSAR_API_TTL_HORAS", "8"))
+TIMEOUT = 30
+MAX_PAGINAS = 200
+
+SESSAO_PATH = Path("output/pulsar_sessao.json")
+DESCOBERTA_PATH = Path("output/pulsar_api.json")
+
+CHAVES_PAGINA = ("page", "pagenumber", "pageindex", "pageno")
+CHAVES_TAMANHO = ("size", "pagesize", "limit", "perpage", "per_page", "rows")
+CHAVES_OFFSET = ("offset", "skip")
+CHAVES_TOKEN = ("token", "accesstoken", "access_token", "jwt", "idtoken", "id_token")
+
+# Datas absolutas na query da URL descoberta (ISO ou epoch em s/ms) andam junto com o relógio.
+# Só valores de chaves com cara de data (startDate, from, until...) ou que caem perto do
+# momento da captura: IDs numéricos de 10/13 dígitos passam intactos.
+DATA_ISO = re.compile(r"^\d{4}-\d{2}-\d{2}(T[\d:.]+)?(Z|[+-]\d{2}:?\d{2})?$")
+PALAVRAS_DATA = {"from", "to", "start", "end", "date", "since", "until", "begin", "time", "timestamp"}
+JANELA_CAPTURA = 3 * 86400
+
+def _gravar_json(caminho, dados):
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho.with_suffix(".tmp")
+    temporario.write_text(json.dumps(dados, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.chmod(temporario, 0o600)
+    os.replace(temporario, caminho)
+
+def _ler_json(caminho):
+    try:
+        return json.loads(caminho.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+# --- DESCOBERTA (modo rede) E SESSÃO ---
+
+def salvar_descoberta(url_api):
+    """Chamado pelo modo 'rede': guarda o endpoint dos terminais e quando ele foi visto"""
+    try:
+        _gravar_json(DESCOBERTA_PATH, {"url": url_api, "capturada_em": time.time()})
+    except OSError as e:
+        print(f"   ⚠️  Não foi possível gravar {DESCOBERTA_PATH}: {e}")
+
+def salvar_cookies_navegador(cookies):
+    """Cookies do navegador logado (driver.get_cookies()) para o modo api reaproveitar"""
+    expiracoes = [c["expiry"] for c in cookies if c.get("expiry")]
+    expira = min(expiracoes) if expiracoes else time.time() + TTL_HORAS * 3600
+    try:
+        _gravar_json(SESSAO_PATH, {"origem": "navegador", "token": None, "expira": expira,
+                                   "cookies": [{k: c.get(k) for k in ("name", "value", "domain", "path")}
+                                               for c in cookies]})
+    except OSError as e:
+        print(f"   ⚠️  Não foi possível gravar {SESSAO_PATH}: {e}")
+
+def _expiracao_jwt(token):
+    """Claim 'exp' de um JWT (None se o token não for JWT)"""
+    try:
+        carga = token.split(".")[1]
+        carga += "=" * (-len(carga) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(carga)).get("exp")
+        return float(exp) if exp else None
+    except (IndexError, ValueError, AttributeError):
+        return None
+
+def _procurar(payload, chaves):
+    """Primeiro valor (string) de uma das chaves, em qualquer nível do JSON"""
+    pendentes = [payload]
+    while pendentes:
+        atual = pendentes.pop(0)
+        if isinstance(atual, dict):
+            for chave, valor in atual.items():
+                if str(chave).lower() in chaves and isinstance(valor, (str, int, float)) and valor != "":
+                    return valor
+            pendentes.extend(v for v in atual.values() if isinstance(v, (dict, list)))
+        elif isinstance(atual, list):
+            pendentes.extend(atual)
+    return None
+
+def _aplicar_sessao(http, sessao):
+    if sessao.get("token"):
+        http.headers["Authorization"] = f"Bearer {sessao['token']}"
+    for cookie in sessao.get("cookies") or []:
+        http.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain") or "",
+                         path=cookie.get("path") or "/")
+
+def login(http):
+    """POST em PULSAR_API_LOGIN; guarda token/cookies em SESSAO_PATH"""
+    if not API_LOGIN:
+        raise RuntimeError("PULSAR_API_LOGIN não definido e não há sessão válida em cache")
+    if not USER_EMAIL or not USER_PASSWORD:
+        raise RuntimeError("PULSAR_EMAIL/PULSAR_PASSWORD não definidos")
+    with manifesto.etapa("pulsar_api", "login"):
+        resposta = http.post(API_LOGIN, json={"userName": USER_EMAIL, "email": USER_EMAIL,
+                                              "password": USER_PASSWORD}, timeout=TIMEOUT)
+        resposta.raise_for_status()
+    try:
+        payload = resposta.json()
+    except ValueError:
+        payload = {}
+    token = _procurar(payload, CHAVES_TOKEN)
+    token = str(token) if token else None
+    if not token and not http.cookies:
+        raise RuntimeError("Login no Pulsar sem token nem cookie de sessão na resposta")
+
+    expira = _expiracao_jwt(token) if token else None
+    validade = _procurar(payload, ("expiresin", "expires_in"))
+    if not expira and isinstance(validade, (int, float)):
+        expira = time.time() + validade
+    sessao = {"origem": "api", "token": token, "expira": expira or time.time() + TTL_HORAS * 3600,
+              "cookies": [{"name": c.name, "value": c.value, "domain": c.domain, "path": c.path} for c in http.cookies]}
+    _gravar_json(SESSAO_PATH, sessao)
+    http.headers.pop("Authorization", None)
+    _aplicar_sessao(http, sessao)
+    print("   ✓ Login na API do Pulsar realizado (sessão guardada)")
+
+def sessao_salva():
+    """Sessão em cache (token/cookies) se ainda valer por mais 5 min; None se expirou ou não existe"""
+    sessao = _ler_json(SESSAO_PATH)
+    if sessao and (sessao.get("expira") or 0) > time.time() + 300:
+        return sessao
+    return None
+
+def autenticar(http, forcar_login=False):
+    """Usa a sessão em cache se ainda valer; senão faz login"""
+    sessao = None if forcar_login else sessao_salva()
+    if sessao:
+        _aplicar_sessao(http, sessao)
+        print(f"   ♻️  Sessão do Pulsar em cache ({sessao.get('origem')}), login dispensado")
+        return
+    http.cookies.clear()
+    login(http)
+
+# --- TERMINAIS ---
+
+def endpoint_terminais():
+    """(url, capturada_em): PULSAR_API_TERMINAIS tem prioridade sobre a descoberta do modo rede"""
+    if API_TERMINAIS:
+        return API_TERMINAIS, None
+    descoberta = _ler_json(DESCOBERTA_PATH)
+    if descoberta and descoberta.get("url"):
+        return descoberta["url"], descoberta.get("capturada_em")
+    raise RuntimeError("Endpoint dos terminais desconhecido: defina PULSAR_API_TERMINAIS "
+                       "ou rode uma vez com PULSAR_MODO=rede")
+
+def chave_de_data(chave):
+    """'startDate', 'date_from', 'until' -> True; 'customerId', 'token' -> False"""
+    palavras = re.findall(r"[a-z]+", re.sub(r"([a-z])([A-Z])", r"\1 \2", chave).lower())
+    return any(p in PALAVRAS_DATA for p in palavras)
+
+def _deslocar_data(valor, segundos, capturada_em=None, chave_data=False):
+    """
+    Avança uma data absoluta da query pelo tempo desde a captura (mantém 'Last 1 Day' relativo a agora).
+    Sem chave de data, só desloca valores a menos de JANELA_CAPTURA do momento da captura.
+    """
+    def plausivel(epoch):
+        return chave_data or (capturada_em is not None and abs(epoch - capturada_em) <= JANELA_CAPTURA)
+
+    if re.fullmatch(r"\d{13}", valor):
+        return str(int(valor) + int(segundos * 1000)) if plausivel(int(valor) / 1000) else valor
+    if re.fullmatch(r"\d{10}", valor):
+        return str(int(valor) + int(segundos)) if plausivel(int(valor)) else valor
+    if DATA_ISO.match(valor):
+        try:
+            data = datetime.datetime.fromisoformat(valor.replace("Z", "+00:00"))
+        except ValueError:
+            return valor
+        referencia = data if data.tzinfo else data.replace(tzinfo=datetime.timezone.utc)
+        if not plausivel(referencia.timestamp()):
+            return valor
+        novo = (data + datetime.timedelta(seconds=segundos)).isoformat()
+        if valor.endswith("Z"):
+            novo = novo.replace("+00:00", "Z")
+        if "T" not in valor:
+            novo = novo[:10]
+        return novo
+    return valor
+
+def montar_consultas(url, capturada_em=None):
+    """
+    Gerador de URLs das páginas: mesma query da URL base, com tamanho POR_PAGINA e
+    página/offset avançando. Sem parâmetro de paginação, uma URL só.
+    """
+    partes = urlsplit(url)
+    params = parse_qsl(partes.query, keep_blank_values=True)
+    if capturada_em:
+        atraso = round(time.time() - capturada_em)
+        params = [(k, v if k.lower() in CHAVES_PAGINA + CHAVES_TAMANHO + CHAVES_OFFSET
+                   else _deslocar_data(v, atraso, capturada_em, chave_de_data(k)))
+                  for k, v in params]
+
+    chaves = {k.lower(): k for k, _ in params}
+    chave_pagina = next((chaves[c] for c in CHAVES_PAGINA if c in chaves), None)
+    chave_offset = next((chaves[c] for c in CHAVES_OFFSET if c in chaves), None)
+    chave_tamanho = next((chaves[c] for c in CHAVES_TAMANHO if c in chaves), None)
+    valores = dict(params)
+    pagina_inicial = int(valores.get(chave_pagina, 0)) if chave_pagina and str(valores.get(chave_pagina)).isdigit() else 0
+
+    for n in range(MAX_PAGINAS):
+        novos = []
+        for k, v in params:
+            if k == chave_tamanho:
+                v = str(POR_PAGINA)
+            elif k == chave_pagina:
+                v = str(pagina_inicial + n)
+            elif k == chave_offset:
+                v = str(n * POR_PAGINA)
+            novos.append((k, v))
+        yield urlunsplit(partes._replace(query=urlencode(novos)))
+        if not chave_pagina and not chave_offset:
+            return
+
+def buscar_terminais():
+    """Lista de terminais pela API (levanta exceção em qualquer falha, para o pulsar.py cair no navegador)"""
+    url_base, capturada_em = endpoint_terminais()
+    print(f"   📡 API do Pulsar: {urlsplit(url_base).netloc}{urlsplit(url_base).path}")
+    http = requests.Session()
+    http.headers["Accept"] = "application/json"
+    try:
+        autenticar(http)
+        dados = {}
+        total = None
+        relogado = False
+        consultas = montar_consultas(url_base, capturada_em)
+        url = next(consultas)
+        pagina = 1
+        while True:
+            with manifesto.etapa("pulsar_pagina", f"página {pagina}", modo="api") as etapa:
+                resposta = http.get(url, timeout=TIMEOUT)
+                if resposta.status_code in (401, 403) and not relogado:
+                    # Sessão do cache expirou antes da hora: um login novo e a mesma página de novo
+                    relogado = True
+                    autenticar(http, forcar_login=True)
+                    resposta = http.get(url, timeout=TIMEOUT)
+                resposta.raise_for_status()
+                registros, total_pagina = pulsar_rede.extrair_registros(resposta.json())
+                etapa["linhas"] = len(registros)
+            total = total_pagina if total_pagina is not None else total
+            novos = 0
+            for chave, r in pulsar_rede.chaves_registros(registros):
+                if chave not in dados:
+                    dados[chave] = r
+                    novos += 1
+            if not registros or not novos or (total is not None and len(dados) >= total):
+                break
+            url = next(consultas, None)
+            if url is None:
+                break
+            pagina += 1
+    finally:
+        http.close()
+
+    if not dados:
+        raise RuntimeError("API do Pulsar não devolveu terminais reconhecíveis")
+    if total is not None and len(dados) < total:
+        raise RuntimeError(f"API do Pulsar devolveu {len(dados)} de {total} terminais")
+    for r in dados.values():
+        manifesto.registrar("pulsar_linha", r['om'], 0.0, r['status'], modo="api")
+    print(f"   ✓ {len(dados)} terminais pela API em {pagina} página(s)")
+    return list(dados.values())
@@ -0,0 +1,100 @@
+"""
+KIT IDS DO PULSAR
+    - pulsar_oms.json: KIT id -> nome da OM no relatório (antes o MAPEAMENTO_OM fixo no código).
+    - output/pulsar_kits.json: cache service line -> KIT id, aprendido nas leituras da tabela.
+Linha com KIT em cache (mesmo nome, mesma assinatura, confirmada há menos de PULSAR_KITS_DIAS)
+não precisa de hover: só a cor do status é lida. Nome repetido na tabela é ambíguo e sempre
+passa pelo tooltip. A entrada só é renovada quando o portal mostra o KIT (atributo ou tooltip):
+a cada leitura, as entradas confirmadas há mais tempo (PULSAR_KITS_RECONFIRMAR, fração dos
+acertos da página) voltam ao tooltip, para não vencerem todas no mesmo dia. Entrada que o portal contradiz (o KIT aparece em outra linha, ou o tooltip
+mostra outro KIT) é descartada.
+"""
+import json
+import math
+import os
+import time
+from pathlib import Path
+
+OMS_JSON = os.getenv("PULSAR_OMS_JSON", "pulsar_oms.json")
+CACHE_PATH = Path("output/pulsar_kits.json")
+VALIDADE_DIAS = float(os.getenv("PULSAR_KITS_DIAS", "7"))
+RECONFIRMAR = float(os.getenv("PULSAR_KITS_RECONFIRMAR", "0.25"))
+
+_cache = None
+_alterado = False
+
+def carregar_mapeamento():
+    """{KIT id: nome da OM} do pulsar_oms.json ({} se não existir ou estiver inválido)"""
+    try:
+        with open(OMS_JSON, 'r', encoding='utf-8') as f:
+            mapeamento = json.load(f)
+    except FileNotFoundError:
+        print(f"   ⚠️  {OMS_JSON} não encontrado: OMs do Pulsar saem com o nome do portal")
+        return {}
+    except ValueError as e:
+        print(f"   ⚠️  {OMS_JSON} inválido ({e}): OMs do Pulsar saem com o nome do portal")
+        return {}
+    return {str(k).strip(): str(v) for k, v in mapeamento.items()}
+
+# --- CACHE SERVICE LINE -> KIT ---
+
+def _linhas():
+    global _cache
+    if _cache is None:
+        try:
+            _cache = json.loads(CACHE_PATH.read_text(encoding="utf-8")).get("linhas", {})
+        except (OSError, ValueError, AttributeError):
+            _cache = {}
+    return _cache
+
+def assinatura(linha):
+    """O que não muda numa linha de um dia para o outro: nº de células e de SVGs na coluna de status"""
+    return f"{linha.get('celulas', 0)}:{linha.get('svgs', 0)}"
+
+def consultar(om, assinatura_linha):
+    """KIT em cache para a service line, ou None (sem entrada, assinatura diferente ou vencida)"""
+    entrada = _linhas().get(om)
+    if not entrada or entrada.get("assinatura") != assinatura_linha:
+        return None
+    if time.time() - entrada.get("confirmado_em", 0) > VALIDADE_DIAS * 86400:
+        return None
+    return entrada.get("kit")
+
+def para_reconfirmar(oms):
+    """Das service lines com KIT em cache, as confirmadas há mais tempo (fração RECONFIRMAR, ao menos uma)"""
+    if not oms or RECONFIRMAR <= 0:
+        return set()
+    linhas = _linhas()
+    antigas = sorted(oms, key=lambda om: linhas[om].get("confirmado_em", 0))
+    return set(antigas[:math.ceil(len(antigas) * min(RECONFIRMAR, 1))])
+
+def registrar(om, assinatura_linha, kit):
+    """KIT lido no portal (atributo ou tooltip) para a service line; troca a entrada se divergir"""
+    global _alterado
+    linhas = _linhas()
+    anterior = linhas.get(om)
+    if anterior and anterior.get("kit") != kit:
+        print(f"   ♻️  KIT de '{om[:32]}' mudou ({anterior.get('kit')} -> {kit}), cache atualizado")
+    # O mesmo KIT em outra service line: aquela entrada ficou velha
+    for outro in [n for n, e in linhas.items() if e.get("kit") == kit and n != om]:
+        del linhas[outro]
+    linhas[om] = {"kit": kit, "assinatura": assinatura_linha, "confirmado_em": time.time()}
+    _alterado = True
+
+def invalidar(om):
+    global _alterado
+    if _linhas().pop(om, None) is not None:
+        _alterado = True
+
+def salvar():
+    global _alterado
+    if not _alterado:
+        return
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        temporario = CACHE_PATH.with_suffix(".tmp")
+        temporario.write_text(json.dumps({"linhas": _linhas()}, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(temporario, CACHE_PATH)
+        _alterado = False
+    except OSError as e:
+        print(f"   ⚠️  Não foi possível gravar {CACHE_PATH}: {e}")
@@ -0,0 +1,189 @@
+"""
+PULSAR PELO TRÁFEGO JSON
+O mapa Starlink é uma SPA: a tabela é montada a partir de respostas JSON da API do portal.
+Aqui ficam:
+    - a leitura dessas respostas no log de performance do Chrome (goog:loggingPrefs)
+      + Network.getResponseBody, sem hover nem leitura da tabela linha a linha;
+    - o interpretador dos payloads, que procura listas de terminais (nome da service line,
+      KIT e estado online) sem depender do formato exato da resposta.
+Os registros saem no mesmo formato de pulsar.extrair_dados_starlink: {'om', 'pop', 'status', 'OCORRÊNCIA'}.
+"""
+import json
+
+from modules import esperas
+
+# Nomes de campos conhecidos (comparados sem diferenciar maiúsculas); o primeiro encontrado vence
+CHAVES_NOME = ("servicelinename", "servicelinenickname", "nickname", "servicelinealias", "name")
+CHAVES_KIT = ("kitserialnumber", "kitid", "kitnumber", "kit", "userterminalid", "terminalid", "serialnumber")
+CHAVES_ONLINE = ("online", "isonline", "connected", "isconnected")
+CHAVES_ESTADO = ("status", "state", "connectionstatus", "connectivitystatus")
+CHAVES_TOTAL = ("total", "totalcount", "totalelements", "totalitems", "count")
+
+ESTADOS_VERDES = ("online", "connected", "active", "up")
+ESTADOS_VERMELHOS = ("offline", "disconnected", "inactive", "down")
+
+def _achatar(item, destino=None, profundidade=0):
+    """Campos de um dict e dos dicts aninhados (até 3 níveis) num só: chave minúscula -> primeiro valor"""
+    destino = {} if destino is None else destino
+    # Campos do próprio nível primeiro: 'name' do terminal vence o 'name' de um objeto aninhado
+    for chave, valor in item.items():
+        if not isinstance(valor, (dict, list)):
+            destino.setdefault(str(chave).lower(), valor)
+    if profundidade < 3:
+        for valor in item.values():
+            if isinstance(valor, dict):
+                _achatar(valor, destino, profundidade + 1)
+    return destino
+
+def _primeiro(campos, chaves):
+    for chave in chaves:
+        valor = campos.get(chave)
+        if valor not in (None, ""):
+            return valor
+    return None
+
+def _kit(campos):
+    valor = _primeiro(campos, CHAVES_KIT)
+    if isinstance(valor, str) and valor.upper().startswith("KIT"):
+        return valor
+    # Sem campo conhecido: qualquer valor que pareça um KIT id (o tooltip mostra 'KIT...')
+    for valor in campos.values():
+        if isinstance(valor, str) and valor.upper().startswith("KIT") and " " not in valor:
+            return valor
+    return None
+
+def _status(campos):
+    online = _primeiro(campos, CHAVES_ONLINE)
+    if isinstance(online, bool):
+        return "VERDE" if online else "VERMELHO"
+    estado = _primeiro(campos, CHAVES_ESTADO)
+    if isinstance(estado, str):
+        estado = estado.strip().lower()
+        if estado in ESTADOS_VERDES:
+            return "VERDE"
+        if estado in ESTADOS_VERMELHOS:
+            return "VERMELHO"
+    return "DESCONHECIDO"
+
+def registro_terminal(item):
+    """
+    Um item da API -> registro do relatório (None se não tiver nome).
+    Sem KIT o registro fica com pop "N/A", como a linha equivalente da tabela.
+    """
+    if not isinstance(item, dict):
+        return None
+    campos = _achatar(item)
+    nome = _primeiro(campos, CHAVES_NOME)
+    if not isinstance(nome, str) or not nome.strip():
+        return None
+    return {'om': nome.strip(), 'pop': _kit(campos) or "N/A", 'status': _status(campos), 'OCORRÊNCIA': ''}
+
+def chaves_registros(registros):
+    """
+    (chave, registro) para deduplicar entre respostas: o KIT; sem KIT, o nome e a
+    ocorrência dele na mesma resposta (terminais sem KIT não se fundem num só).
+    """
+    ocorrencias = {}
+    for r in registros:
+        if r['pop'] != "N/A":
+            yield r['pop'], r
+        else:
+            ocorrencias[r['om']] = ocorrencias.get(r['om'], 0) + 1
+            yield ("N/A", r['om'], ocorrencias[r['om']]), r
+
+def extrair_registros(payload):
+    """
+    Procura listas de terminais em qualquer ponto do JSON.
+    Retorna (registros, total): total é o tamanho informado pela API (None se não houver).
+    """
+    registros = []
+    total = None
+    pendentes = [payload]
+    while pendentes:
+        atual = pendentes.pop()
+        if isinstance(atual, dict):
+            if total is None:
+                for chave, valor in atual.items():
+                    if str(chave).lower() in CHAVES_TOTAL and isinstance(valor, int) and not isinstance(valor, bool):
+                        total = valor
+                        break
+            pendentes.extend(v for v in atual.values() if isinstance(v, (dict, list)))
+        elif isinstance(atual, list):
+            encontrados = [r for r in (registro_terminal(item) for item in atual) if r]
+            # É lista de terminais se ao menos um item tiver KIT (nome sozinho pode ser qualquer coisa)
+            if any(r['pop'] != "N/A" for r in encontrados):
+                registros.extend(encontrados)
+            else:
+                pendentes.extend(v for v in atual if isinstance(v, (dict, list)))
+    return registros, total
+
+# --- LOG DE PERFORMANCE DO CHROME ---
+
+def ativar_captura(options):
+    """Liga o log de performance (eventos Network.*) nas opções do Chrome"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+def descartar_log(driver):
+    """Esvazia o buffer do log (o que veio antes, como a carga com o filtro padrão, não interessa)"""
+    try:
+        driver.get_log("performance")
+    except Exception:
+        pass
+
+def _eventos(driver):
+    for entrada in driver.get_log("performance"):
+        try:
+            mensagem = json.loads(entrada["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        yield mensagem.get("method"), mensagem.get("params", {})
+
+class ColetorRespostas:
+    """
+    Acumula respostas JSON (XHR/fetch) vistas no log de performance e devolve os corpos
+    já baixados. Os eventos chegam em qualquer ordem entre chamadas: a resposta só é lida
+    depois do Network.loadingFinished correspondente.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._respostas = {}    # requestId -> url (JSON de XHR/fetch)
+        self._concluidas = set()
+        self._lidas = set()
+
+    def _processar_log(self):
+        for metodo, params in _eventos(self.driver):
+            if metodo == "Network.responseReceived":
+                resposta = params.get("response", {})
+                if params.get("type") in ("XHR", "Fetch") and "json" in (resposta.get("mimeType") or "") \
+                        and resposta.get("status", 200) < 400:
+                    self._respostas[params["requestId"]] = resposta.get("url", "")
+            elif metodo == "Network.loadingFinished":
+                self._concluidas.add(params.get("requestId"))
+
+    def novos_payloads(self):
+        """[(url, payload)] das respostas concluídas desde a última chamada"""
+        self._processar_log()
+        saida = []
+        for request_id, url in list(self._respostas.items()):
+            if request_id in self._lidas or request_id not in self._concluidas:
+                continue
+            self._lidas.add(request_id)
+            try:
+                corpo = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                saida.append((url, json.loads(corpo["body"])))
+            except Exception:
+                # Corpo já descartado pelo Chrome ou não era JSON de verdade
+                continue
+        return saida
+
+    def aguardar_registros(self, timeout=20, intervalo=0.25):
+        """Espera até chegar uma resposta com terminais. Retorna (registros, total, url) ou ([], None, None)"""
+        def condicao(_driver):
+            for url, payload in self.novos_payloads():
+                registros, total = extrair_registros(payload)
+                if registros:
+                    return registros, total, url
+            return None
+        resultado = esperas.aguardar(self.driver, "rede: resposta com terminais", condicao, timeout, intervalo)
+        return resultado or ([], None, None)
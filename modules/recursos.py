@@ -0,0 +1,105 @@
+"""
+RECURSOS REUTILIZÁVEIS
+Navegadores (Selenium) e sessões autenticadas (Zabbix/Grafana) usados pelos coletores.
+No modo serviço (main.py servico) eles ficam vivos entre uma execução e outra;
+fora dele, liberar() fecha o recurso na hora, como sempre foi.
+"""
+import threading
+
+_lock = threading.Lock()
+_livres = {}      # chave -> recurso aguardando a próxima execução
+_em_uso = {}      # id(recurso) -> recurso emprestado a um coletor
+_persistente = False
+
+def ativar_persistencia(ativo=True):
+    global _persistente
+    _persistente = ativo
+
+def persistencia_ativa():
+    return _persistente
+
+def _fechar(recurso):
+    """Fecha drivers (quit), sessões (close) ou tuplas deles, ignorando erros"""
+    itens = recurso if isinstance(recurso, tuple) else (recurso,)
+    for item in itens:
+        try:
+            if hasattr(item, "quit"):
+                item.quit()
+            elif hasattr(item, "close"):
+                item.close()
+        except Exception:
+            pass
+
+def navegador_ativo(driver):
+    """Validação barata para um webdriver guardado: o processo do Chrome ainda responde?"""
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+def obter(chave, criar, valido=None):
+    """
+    Devolve o recurso guardado em 'chave' (se ainda for válido) ou cria um novo com criar().
+    O recurso fica emprestado ao chamador até liberar(); dois coletores nunca usam o mesmo.
+    """
+    with _lock:
+        recurso = _livres.pop(chave, None)
+
+    if recurso is not None:
+        try:
+            reaproveitar = valido is None or valido(recurso)
+        except Exception:
+            reaproveitar = False
+        if reaproveitar:
+            print(f"   ♻️  Reaproveitando recurso aquecido: {chave}")
+        else:
+            _fechar(recurso)
+            recurso = None
+
+    if recurso is None:
+        recurso = criar()
+    if recurso is not None:
+        with _lock:
+            _em_uso[id(recurso)] = recurso
+    return recurso
+
+def reaproveitado(chave, recurso):
+    """True se o recurso veio do cache (útil para pular login, por exemplo)"""
+    return getattr(recurso, "_orf_chave", None) == chave
+
+def liberar(chave, recurso):
+    """Devolve o recurso: guarda no modo serviço, fecha caso contrário"""
+    if recurso is None:
+        return
+    with _lock:
+        _em_uso.pop(id(recurso), None)
+        guardar = _persistente and chave not in _livres
+        if guardar:
+            _livres[chave] = recurso
+    if guardar:
+        try:
+            recurso._orf_chave = chave
+        except AttributeError:
+            pass
+    else:
+        _fechar(recurso)
+
+def descartar(chave, recurso):
+    """Fecha o recurso sem guardar (ex: sessão expirada, navegador travado)"""
+    with _lock:
+        _em_uso.pop(id(recurso), None)
+    _fechar(recurso)
+
+def encerrar_todos():
+    """Fecha tudo, inclusive recursos ainda emprestados a coletores que estouraram o prazo"""
+    with _lock:
+        recursos = list(_livres.values()) + list(_em_uso.values())
+        _livres.clear()
+        _em_uso.clear()
+    for recurso in recursos:
+        _fechar(recurso)
+
+def resumo():
+    with _lock:
+        return {"aquecidos": sorted(_livres), "em_uso": len(_em_uso)}
@@ -4,6 +4,8 @@ import urllib3
 import unicodedata
 from dotenv import load_dotenv
 
+from modules import manifesto, recursos
+
 load_dotenv() 
 
 # --- CONFIGURAÇÕES ---
@@ -59,23 +61,33 @@ def clean_host_key(text):
     except:
         return str(text).upper()
 
+def login_zabbix_api():
+    """Faz user.login na API e retorna (sessão, token) ou None"""
+    sess = requests.Session()
+    resp = sess.post(ZABBIX_API_URL, json={
+        "jsonrpc": "2.0", 
+        "method": "user.login", 
+        "params": {"user": USERNAME, "password": PASSWORD}, 
+        "id": 1
+    }, verify=False)
+    
+    auth = resp.json().get('result')
+    if not auth:
+        sess.close()
+        return None
+    return sess, auth
+
 def download_zabbix_ips():
     """
     Conecta na API do Zabbix e cria um mapa {nome_host: ip}.
     Usa várias chaves (nome original, nome limpo) para garantir que o IP seja encontrado.
+    No modo serviço o token do user.login é reaproveitado entre execuções.
     """
-    sess = requests.Session()
+    conexao = None
     try:
-        # 1. Autenticação
-        resp = sess.post(ZABBIX_API_URL, json={
-            "jsonrpc": "2.0", 
-            "method": "user.login", 
-            "params": {"user": USERNAME, "password": PASSWORD}, 
-            "id": 1
-        }, verify=False)
-        
-        auth = resp.json().get('result')
-        if not auth: 
+        # 1. Autenticação (ou token aquecido)
+        conexao = recursos.obter("zabbix_api", login_zabbix_api)
+        if not conexao: 
             print("Erro auth Zabbix")
             return {}
 
@@ -84,10 +96,20 @@ def download_zabbix_ips():
             "jsonrpc": "2.0",
             "method": "host.get",
             "params": {"output": ["host", "name"], "selectInterfaces": ["ip"]},
-            "auth": auth,
+            "auth": conexao[1],
             "id": 2
         }
-        hosts = sess.post(ZABBIX_API_URL, json=payload, verify=False).json().get('result', [])
+        resposta = conexao[0].post(ZABBIX_API_URL, json=payload, verify=False).json()
+        if 'error' in resposta:
+            # Token guardado expirou: refaz o login uma vez
+            recursos.descartar("zabbix_api", conexao)
+            conexao = recursos.obter("zabbix_api", login_zabbix_api)
+            if not conexao:
+                print("Erro auth Zabbix")
+                return {}
+            payload["auth"] = conexao[1]
+            resposta = conexao[0].post(ZABBIX_API_URL, json=payload, verify=False).json()
+        hosts = resposta.get('result', [])
         
         # 3. Cria Mapa Inteligente
         mapa = {}
@@ -99,9 +121,12 @@ def download_zabbix_ips():
                 mapa[h['name']] = ip_final
                 mapa[clean_host_key(h['host'])] = ip_final 
                 mapa[clean_host_key(h['name'])] = ip_final
+        recursos.liberar("zabbix_api", conexao)
         return mapa
     except Exception as e:
         print(f"Erro ao baixar IPs: {e}")
+        if conexao:
+            recursos.descartar("zabbix_api", conexao)
         return {}
 
 def query_grafana_status(target_config):
@@ -181,7 +206,9 @@ def collect_reme_data():
     """
     print(">>> Módulo REME: Iniciando coleta de dados...")
     
-    mapa_ips = download_zabbix_ips()
+    with manifesto.etapa("zabbix_api", "host.get") as et:
+        mapa_ips = download_zabbix_ips()
+        et["hosts"] = len(mapa_ips)
     
     headers = {"Authorization": f"Bearer {GRAFANA_TOKEN}"}
     try:
@@ -223,10 +250,12 @@ def collect_reme_data():
             nome_om_grafana = panel.get('title', 'Sem Nome')
             
             # 1. Consulta Status
-            host_tec, valor, item_nome = query_grafana_status(target)
-            
-            # 2. Define Texto e Cor
-            status_txt, status_cor = get_status_tuple(valor, item_nome)
+            with manifesto.etapa("painel_grafana", nome_om_grafana, secao=secao_atual["titulo"]) as et:
+                host_tec, valor, item_nome = query_grafana_status(target)
+                
+                # 2. Define Texto e Cor
+                status_txt, status_cor = get_status_tuple(valor, item_nome)
+                et["resultado"] = status_txt
 
             # 3. Descobre o IP correto
             # Tenta pelo nome técnico, depois pelo nome visível, depois pela chave limpa
@@ -0,0 +1,132 @@
+"""
+MODO SERVIÇO
+Mantém o processo vivo com navegadores e sessões aquecidos (modules/recursos.py).
+Gera o relatório no horário agendado e sob demanda por um socket Unix local:
+    python3 main.py servico          # inicia o serviço
+    python3 main.py disparar         # pede um relatório agora
+    python3 main.py status           # estado do serviço
+"""
+import datetime
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+
+from modules import checkpoint, recursos
+
+SOCKET_PATH = Path(os.getenv("SERVICO_SOCKET", "output/orf.sock"))
+HORARIO = os.getenv("SERVICO_HORARIO", "05:50")
+# Pausa entre tentativas quando a coleta fica incompleta (mesmo valor do launcher.sh)
+ESPERA_RETRY = int(os.getenv("SERVICO_ESPERA_RETRY", "60"))
+
+_execucao_lock = threading.Lock()
+_estado = {"inicio": None, "ultima_execucao": None, "ultimo_resultado": None,
+           "ultimo_relatorio": None, "executando": False, "proxima_agendada": None}
+
+def proximo_horario(agora=None):
+    agora = agora or datetime.datetime.now()
+    hora, minuto = (int(x) for x in HORARIO.split(":"))
+    alvo = agora.replace(hour=hora, minute=minuto, second=0, microsecond=0)
+    if alvo <= agora:
+        alvo += datetime.timedelta(days=1)
+    return alvo
+
+def executar_relatorio(gerar_relatorio, origem):
+    """
+    Roda o relatório repetindo as tentativas como o launcher.sh faria
+    (só os coletores sem checkpoint são refeitos). Retorna (resultado, arquivo).
+    """
+    if not _execucao_lock.acquire(blocking=False):
+        return "ocupado", None
+    try:
+        _estado["executando"] = True
+        print(f"\n>>> [Serviço] Relatório solicitado ({origem}) em {datetime.datetime.now():%d/%m/%Y %H:%M:%S}")
+        arquivo = None
+        resultado = "erro"
+        for tentativa in range(checkpoint.MAX_TENTATIVAS):
+            try:
+                arquivo = gerar_relatorio()
+                resultado = "ok"
+                break
+            except SystemExit as e:
+                if e.code in (0, None):
+                    resultado = "ok"
+                    break
+                print(f">>> [Serviço] Coleta incompleta, nova tentativa em {ESPERA_RETRY} s...")
+                time.sleep(ESPERA_RETRY)
+            except Exception as e:
+                print(f"❌ [Serviço] Erro na geração do relatório: {e}")
+                resultado = f"erro: {e}"
+                break
+        _estado.update(ultima_execucao=datetime.datetime.now().isoformat(timespec="seconds"),
+                       ultimo_resultado=resultado, ultimo_relatorio=arquivo)
+        return resultado, arquivo
+    finally:
+        _estado["executando"] = False
+        _execucao_lock.release()
+
+class _ComandoHandler(socketserver.StreamRequestHandler):
+    """Protocolo de uma linha: 'relatorio' ou 'status'; resposta em JSON"""
+    gerar_relatorio = None
+
+    def handle(self):
+        comando = self.rfile.readline().decode("utf-8").strip().lower()
+        if comando == "relatorio":
+            resultado, arquivo = executar_relatorio(self.gerar_relatorio, "socket")
+            resposta = {"resultado": resultado, "arquivo": arquivo}
+        elif comando == "status":
+            resposta = dict(_estado, recursos=recursos.resumo())
+        else:
+            resposta = {"resultado": "erro", "mensagem": f"comando desconhecido: {comando}"}
+        self.wfile.write((json.dumps(resposta, ensure_ascii=False) + "\n").encode("utf-8"))
+
+def executar_servico(gerar_relatorio):
+    """Loop principal do serviço: agenda diária + socket de comandos"""
+    recursos.ativar_persistencia()
+    SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+    if SOCKET_PATH.exists():
+        SOCKET_PATH.unlink()
+
+    handler = type("Handler", (_ComandoHandler,), {"gerar_relatorio": staticmethod(gerar_relatorio)})
+    servidor = socketserver.ThreadingUnixStreamServer(str(SOCKET_PATH), handler)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+    parar = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: parar.set())
+    signal.signal(signal.SIGINT, lambda *_: parar.set())
+
+    _estado["inicio"] = datetime.datetime.now().isoformat(timespec="seconds")
+    print(f">>> [Serviço] Ativo. Socket: {SOCKET_PATH} | Relatório diário às {HORARIO}")
+    try:
+        while not parar.is_set():
+            alvo = proximo_horario()
+            _estado["proxima_agendada"] = alvo.isoformat(timespec="minutes")
+            if parar.wait(max(0, (alvo - datetime.datetime.now()).total_seconds())):
+                break
+            executar_relatorio(gerar_relatorio, "agenda")
+    finally:
+        print(">>> [Serviço] Encerrando: fechando navegadores e sessões...")
+        servidor.shutdown()
+        servidor.server_close()
+        if SOCKET_PATH.exists():
+            SOCKET_PATH.unlink()
+        recursos.encerrar_todos()
+
+def enviar_comando(comando, timeout=None):
+    """Cliente do socket (usado por 'main.py disparar' e 'main.py status')"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as cliente:
+        cliente.settimeout(timeout)
+        cliente.connect(str(SOCKET_PATH))
+        cliente.sendall((comando + "\n").encode("utf-8"))
+        resposta = b""
+        while not resposta.endswith(b"\n"):
+            parte = cliente.recv(65536)
+            if not parte:
+                break
+            resposta += parte
+    return json.loads(resposta.decode("utf-8"))
@@ -1,18 +1,25 @@
 import hashlib
 import re
 import json
+import math
 import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 from pathlib import Path
 
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
 # Selenium Imports
-from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+
+from modules import fingerprint, historico_sites, manifesto, navegador, preflight, recursos
 
 try:
     from bs4 import BeautifulSoup
@@ -20,10 +27,65 @@ try:
 except ImportError:
     _BS4_AVAILABLE = False
 
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Formato antigo (um .txt por URL); hoje só lido na importação para modules/historico_sites.py
 HASH_DIR = Path("output/hashes")
-HASH_DIR.mkdir(parents=True, exist_ok=True)
 JSON_FILE = "sites.json"
 
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
+
+# --- VERIFICAÇÃO HTTP (caminho rápido) ---
+# Conexões reaproveitadas e vários sites ao mesmo tempo; o navegador só entra
+# para sites marcados como JS no sites.json ou quando a resposta HTTP não é conclusiva.
+HTTP_WORKERS = int(os.getenv("SITES_HTTP_WORKERS", "16"))
+HTTP_TIMEOUT = float(os.getenv("SITES_HTTP_TIMEOUT", "20"))
+# Abaixo disso (texto visível, em caracteres) e com <script> na página, o conteúdo provavelmente vem do JS
+MIN_TEXTO_HTTP = int(os.getenv("SITES_MIN_TEXTO_HTTP", "200"))
+
+# --- POOL DE NAVEGADORES (fallback) ---
+# Vários Chrome headless dividem a fila de sites; o tamanho é limitado pela memória livre
+# (MemAvailable - reserva) / memória por navegador, para caber na VM.
+NAVEGADORES_MAX = int(os.getenv("SITES_NAVEGADORES", "4"))
+MB_POR_NAVEGADOR = int(os.getenv("SITES_MB_POR_NAVEGADOR", "300"))
+MEMORIA_RESERVA_MB = int(os.getenv("SITES_MEMORIA_RESERVA_MB", "512"))
+
+# --- TIMEOUTS ADAPTATIVOS E CIRCUITO ---
+# Com histórico suficiente (modules/historico_sites.py, tabela saude), o timeout de carga de cada
+# site sai do próprio tempo de carga: 3x a média + 4 desvios, entre os limites abaixo.
+TIMEOUT_CARGA_MAX = float(os.getenv("SITES_TIMEOUT_CARGA_MAX", "30"))
+TIMEOUT_CARGA_MIN = float(os.getenv("SITES_TIMEOUT_CARGA_MIN", "10"))
+AMOSTRAS_MINIMAS = 3
+# Site que falhou nas últimas CIRCUITO_FALHAS execuções só recebe uma sonda rápida;
+# se ela também falhar, o site entra como inacessível sem gastar navegador
+CIRCUITO_FALHAS = int(os.getenv("SITES_CIRCUITO_FALHAS", "3"))
+SONDA_TIMEOUT = float(os.getenv("SITES_SONDA_TIMEOUT", "5"))
+SITE_INACESSIVEL = "Site inacessível / Timeout"
+# Pré-verificação DNS/TCP/TLS (modules/preflight.py) antes do HTTP e do navegador; 0 desliga
+PREFLIGHT = os.getenv("SITES_PREFLIGHT", "1") != "0"
+
+# --- PERFIL ENXUTO DO NAVEGADOR ---
+# A verificação só usa o DOM e o atributo src das imagens: imagens, fontes e mídia são
+# bloqueadas na rede (o src continua no HTML), junto com rastreadores de terceiros.
+# Scripts de outros domínios (jQuery/plugins de carrossel em CDN) continuam liberados,
+# porque montam parte do DOM e mudariam o hash de referência do navegador.
+# SITES_NAVEGADOR_ENXUTO=0 volta ao perfil completo.
+PERFIL_ENXUTO = os.getenv("SITES_NAVEGADOR_ENXUTO", "1") != "0"
+# Com page load "eager" o get() volta no DOMContentLoaded; depois disso espera o onload no máximo este tempo
+ESPERA_ONLOAD = float(os.getenv("SITES_ESPERA_ONLOAD", "5"))
+EXTENSOES_BLOQUEADAS = [
+    "png", "jpg", "jpeg", "gif", "webp", "avif", "bmp", "ico", "svg",     # imagens
+    "woff", "woff2", "ttf", "otf", "eot",                                # fontes
+    "mp4", "webm", "ogg", "ogv", "mp3", "wav", "m4a",                    # áudio e vídeo
+]
+# "*.png" e "*.png?*": com query string também, sem pegar "jquery.iconpicker.js" por engano
+URLS_BLOQUEADAS = [f"*.{ext}{sufixo}" for ext in EXTENSOES_BLOQUEADAS for sufixo in ("", "?*")] + [
+    # rastreadores, anúncios e players embutidos
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*clarity.ms*",
+    "*youtube.com/embed*", "*player.vimeo.com*",
+]
+
 def load_sites_list():
     """Lê o arquivo sites.json e retorna a lista de URLs"""
     if not os.path.exists(JSON_FILE):
@@ -38,6 +100,16 @@ def load_sites_list():
         print(f"ERRO ao ler JSON: {e}")
         return []
 
+def parse_site_entry(item):
+    """
+    Entradas do sites.json: "https://..." ou {"url": "https://...", "navegador": true}
+    (navegador=true para sites que só montam o conteúdo via JavaScript).
+    Retorna (url, exige_navegador).
+    """
+    if isinstance(item, dict):
+        return item["url"], bool(item.get("navegador"))
+    return item, False
+
 def extract_om_name(url):
     try:
         parsed = urlparse(url)
@@ -55,9 +127,13 @@ def sanitize_filename(url):
     name = re.sub(r"[^0-9a-zA-Z.-]", "_", name)
     return name[:120]
 
-def get_hash_file_path(url):
-    return HASH_DIR / f"{sanitize_filename(url)}.txt"
+def get_hash_file_path(url, metodo="navegador"):
+    """Arquivo de hash do formato antigo (usado só na importação para o banco)"""
+    sufixo = ".http.txt" if metodo == "http" else ".txt"
+    return HASH_DIR / f"{sanitize_filename(url)}{sufixo}"
 
+# normalize_html e extract_image_sets são a referência do hash (BeautifulSoup);
+# a verificação usa modules/fingerprint.py, que produz o mesmo resultado numa passada só.
 def normalize_html(html):
     if _BS4_AVAILABLE:
         soup = BeautifulSoup(html, "html.parser")
@@ -91,16 +167,357 @@ def create_driver():
     options.add_argument("--no-sandbox")
     options.add_argument("--ignore-certificate-errors")
     options.add_argument("--log-level=3")
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36")
+    options.add_argument(f"user-agent={USER_AGENT}")
+    if PERFIL_ENXUTO:
+        options.page_load_strategy = "eager"
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-background-networking")
+        options.add_argument("--disable-component-update")
+        options.add_argument("--disable-default-apps")
+        options.add_argument("--disable-sync")
+        options.add_argument("--mute-audio")
+        options.add_argument("--autoplay-policy=user-gesture-required")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        # Cada site é visto uma vez por execução: cache em disco só gasta memória e I/O
+        options.add_argument("--disk-cache-size=1")
+        options.add_argument("--media-cache-size=1")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+            "profile.default_content_setting_values.geolocation": 2,
+        })
+    driver = navegador.criar_driver(options)
+    if PERFIL_ENXUTO:
+        configure_lean_network(driver)
+    return driver
+
+def configure_lean_network(driver):
+    """Bloqueio de recursos pesados e cache desligado via DevTools (só Chrome/Chromium)"""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": URLS_BLOQUEADAS})
+        driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+    except Exception as e:
+        # Sem CDP o navegador funciona igual, só sem o bloqueio
+        print(f"   ⚠️  Bloqueio de recursos indisponível: {str(e)[:80]}")
+
+def wait_onload(driver):
+    """Com page load eager, dá ao onload a chance de terminar de montar o DOM (sem travar em recursos lentos)"""
+    try:
+        WebDriverWait(driver, ESPERA_ONLOAD).until(
+            lambda d: d.execute_script("return document.readyState") == "complete")
+    except Exception:
+        pass
+
+def verificar_destino(url, final_url):
+    """Redirecionamento externo ou caminho de erro no endereço final. Retorna a ocorrência ou None"""
+    orig_p = urlparse(url)
+    fin_p = urlparse(final_url)
+    
+    # Lógica Redirecionamento
+    if orig_p.netloc.lower() != fin_p.netloc.lower():
+        return f"Redirecionado para externo: {fin_p.netloc}"
+    path_lower = fin_p.path.lower()
+    if "/error" in path_lower or "/404" in path_lower or "pagina-nao-encontrada" in path_lower:
+        return f"Página de erro: {fin_p.path}"
+    return None
+
+def analisar_pagina(url, final_url, html, metodo, validadores=None):
+    """
+    Regras comuns aos dois métodos. Retorna a mensagem de ocorrência ou None.
+    Redirecionamento externo, caminho de erro, texto de 404 do IIS e mudança do hash.
+    'validadores' (só no http) vão junto com o hash para a próxima revalidação.
+    """
+    ocorrencia = verificar_destino(url, final_url)
+    if ocorrencia:
+        return ocorrencia
+
+    # Lógica Hash/Conteúdo
+    if "404 - File or directory not found" in html:
+        return "Erro 404 detectado"
+    # Mesmo hash de normalize_html + extract_image_sets, numa passada só.
+    # O HTML cru do requests e o DOM do Chrome nunca têm o mesmo hash: cada método tem sua referência
+    impressao = fingerprint.calcular(html)
+    if historico_sites.registrar(url, metodo, impressao, validadores=validadores) == "alterado":
+        return "Alteração visual detectada"
+    return None
+
+def create_http_session(workers=HTTP_WORKERS):
+    sessao = requests.Session()
+    adaptador = HTTPAdapter(pool_connections=workers, pool_maxsize=workers, max_retries=0)
+    sessao.mount("http://", adaptador)
+    sessao.mount("https://", adaptador)
+    sessao.headers["User-Agent"] = USER_AGENT
+    # Mesmo comportamento do Chrome com --ignore-certificate-errors
+    sessao.verify = False
+    return sessao
+
+def decode_html(resposta):
+    """Decodifica como o navegador: charset do cabeçalho, depois <meta charset>, depois UTF-8"""
+    charset = None
+    if "charset=" in resposta.headers.get("Content-Type", "").lower():
+        charset = resposta.encoding
+    else:
+        m = re.search(rb'<meta[^>]+charset=["\']?([\w-]+)', resposta.content[:4096], re.I)
+        if m:
+            charset = m.group(1).decode("ascii")
+    try:
+        return resposta.content.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        return resposta.content.decode("utf-8", errors="replace")
+
+def is_js_dependent(html):
+    """Página que o requests não consegue avaliar: redireciona/monta o conteúdo no navegador"""
+    if re.search(r'<meta[^>]+http-equiv=["\']?refresh', html, re.I):
+        return True
+    if "<script" not in html.lower():
+        return False
+    texto = re.sub(r"<script[\s\S]*?</script>|<style[\s\S]*?</style>|<[^>]+>", " ", html, flags=re.I)
+    return len(" ".join(texto.split())) < MIN_TEXTO_HTTP
+
+def conditional_headers(cache):
+    """If-None-Match / If-Modified-Since a partir dos validadores guardados"""
+    headers = {}
+    if cache and cache.get("etag"):
+        headers["If-None-Match"] = cache["etag"]
+    if cache and cache.get("last_modified"):
+        headers["If-Modified-Since"] = cache["last_modified"]
+    return headers
+
+def check_site_http(sessao, url, timeout=None):
+    """
+    Verificação rápida via HTTP. Retorna {"conclusivo", "ocorrencia", "duracao", "revalidacao"}.
+    Erros de rede, status >= 400 e páginas dependentes de JS ficam para o navegador,
+    que dá o veredito final com as regras de sempre.
+    Revalidação: com validadores da última análise, a requisição é condicional; um 304 ou
+    um corpo com o mesmo sha256 significa a mesma página, então normalização e hash são pulados
+    (o veredito do conteúdo é o da análise anterior: sem alteração).
+    """
+    inicio = time.monotonic()
+    verificacao = {"metodo": "http", "conclusivo": False, "ocorrencia": None, "revalidacao": None}
+    try:
+        cache = historico_sites.validadores(url, "http")
+        resposta = sessao.get(url, timeout=timeout or HTTP_TIMEOUT, allow_redirects=True,
+                              headers=conditional_headers(cache))
+        if resposta.status_code == 304:
+            # 304 sem validadores enviados não tem o que revalidar: fica para o navegador
+            if cache:
+                verificacao["revalidacao"] = "304"
+        elif resposta.status_code < 400:
+            digest = hashlib.sha256(resposta.content).hexdigest()
+            if cache and cache.get("digest_corpo") == digest:
+                verificacao["revalidacao"] = "digest"
+            else:
+                html = decode_html(resposta)
+                if not is_js_dependent(html):
+                    validadores = {"etag": resposta.headers.get("ETag"),
+                                   "last_modified": resposta.headers.get("Last-Modified"),
+                                   "digest_corpo": digest}
+                    verificacao["ocorrencia"] = analisar_pagina(url, resposta.url, html, "http", validadores)
+                    verificacao["conclusivo"] = True
+
+        if verificacao["revalidacao"]:
+            # O endereço final ainda pode ter mudado (redirecionamento novo antes do 304)
+            verificacao["ocorrencia"] = verificar_destino(url, resposta.url)
+            verificacao["conclusivo"] = True
+            historico_sites.confirmar(url, "http")
+    except requests.RequestException as e:
+        verificacao["erro_rede"] = type(e).__name__
+    verificacao["duracao"] = time.monotonic() - inicio
+    return verificacao
+
+def probe_site(sessao, url, timeout=SONDA_TIMEOUT):
+    """Sonda barata (HEAD, sem seguir redirecionamentos): o servidor responde alguma coisa?"""
+    inicio = time.monotonic()
+    verificacao = {"metodo": "sonda", "conclusivo": False, "ocorrencia": None}
     try:
-        service = Service(ChromeDriverManager().install())
-        return webdriver.Chrome(service=service, options=options)
-    except:
-        return webdriver.Chrome(options=options)
+        sessao.head(url, timeout=timeout, allow_redirects=False)
+    except requests.RequestException as e:
+        verificacao["erro_rede"] = type(e).__name__
+    verificacao["duracao"] = time.monotonic() - inicio
+    return verificacao
+
+def run_preflight(entradas):
+    """{índice: verificação} dos sites que falharam na pré-verificação (com a causa na ocorrência)"""
+    inicio = time.monotonic()
+    try:
+        alcance = preflight.verificar([url for url, _ in entradas])
+    except Exception as e:
+        print(f"⚠ Pré-verificação indisponível, seguindo sem ela: {e}")
+        return {}
+    falhas = {}
+    for i, (url, _) in enumerate(entradas):
+        resultado = alcance.get(url)
+        if resultado and resultado["falha"] and preflight.fatal(resultado):
+            falhas[i] = {"metodo": "preflight", "conclusivo": True, "ocorrencia": preflight.mensagem(resultado),
+                         "duracao": resultado["duracao"], "preflight": resultado["falha"],
+                         "detalhe": resultado["detalhe"]}
+    hosts = {(r["host"], r["porta"]) for r in alcance.values()}
+    print(f">>> Módulo Sites: pré-verificação de {len(hosts)} host(s) em {time.monotonic() - inicio:.1f} s, "
+          f"{len(falhas)} site(s) inalcançável(is)")
+    return falhas
+
+def is_unreachable(ocorrencia):
+    """Ocorrência de site fora do ar (navegador, circuito ou pré-verificação), a que conta para o circuito"""
+    return bool(ocorrencia) and ocorrencia.startswith("Site inacessível")
+
+def check_site_fast(sessao, url, exige_navegador, circuito_aberto):
+    """
+    Etapa HTTP de um site. Circuito aberto: timeout curto (ou só a sonda, para sites JS);
+    se nem isso responder, o veredito sai aqui mesmo e o navegador não é usado.
+    """
+    if not circuito_aberto:
+        return None if exige_navegador else check_site_http(sessao, url)
+    if exige_navegador:
+        verificacao = probe_site(sessao, url)
+    else:
+        verificacao = check_site_http(sessao, url, timeout=SONDA_TIMEOUT)
+    verificacao["circuito"] = "aberto"
+    if verificacao.get("erro_rede"):
+        verificacao.update(conclusivo=True, ocorrencia=SITE_INACESSIVEL)
+    return verificacao
+
+def get_page_timeout(estatistica):
+    """Timeout de carga do site a partir do histórico (TIMEOUT_CARGA_MAX enquanto não houver amostras suficientes)"""
+    if not estatistica or (estatistica.get("amostras") or 0) < AMOSTRAS_MINIMAS:
+        return TIMEOUT_CARGA_MAX
+    desvio = math.sqrt(max(estatistica.get("variancia_carga") or 0.0, 0.0))
+    estimado = 3 * estatistica["media_carga"] + 4 * desvio
+    return round(min(TIMEOUT_CARGA_MAX, max(TIMEOUT_CARGA_MIN, estimado)), 1)
+
+def check_site_browser(driver, url, timeout=None):
+    """Verificação pelo Chrome (sites JS ou inconclusivos no HTTP)"""
+    timeout = timeout or TIMEOUT_CARGA_MAX
+    inicio = time.monotonic()
+    msg_erro = None
+    duracao_carga = None
+    try:
+        driver.set_page_load_timeout(timeout)
+        driver.get(url)
+        duracao_carga = time.monotonic() - inicio
+        
+        try: WebDriverWait(driver, min(15, timeout / 2)).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        except: pass 
+        if PERFIL_ENXUTO:
+            wait_onload(driver)
+
+        msg_erro = analisar_pagina(url, driver.current_url, driver.page_source, "navegador")
+    except Exception as e:
+        msg_erro = SITE_INACESSIVEL
+    return {"metodo": "navegador", "conclusivo": True, "ocorrencia": msg_erro,
+            "duracao": time.monotonic() - inicio, "duracao_carga": duracao_carga, "timeout": timeout}
+
+def get_available_memory_mb():
+    """MemAvailable do /proc/meminfo em MB (None fora do Linux)"""
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for linha in f:
+                if linha.startswith("MemAvailable:"):
+                    return int(linha.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def get_browser_pool_size(pendentes):
+    """Quantos Chrome abrir: SITES_NAVEGADORES, limitado pela memória livre e pelos sites pendentes"""
+    limite = NAVEGADORES_MAX
+    livre = get_available_memory_mb()
+    if livre is not None:
+        limite = min(limite, (livre - MEMORIA_RESERVA_MB) // MB_POR_NAVEGADOR)
+    return max(1, min(limite, pendentes))
+
+def browser_worker(slot, fila, entradas, verificacoes, timeouts=None):
+    """
+    Um Chrome consumindo a fila compartilhada. O resultado vai para verificacoes[i],
+    então a ordem do sites.json se mantém qualquer que seja o navegador que terminou antes.
+    'timeouts[i]': timeout de carga adaptativo do site (TIMEOUT_CARGA_MAX sem ele).
+    """
+    chave = f"sites.driver.{slot}"
+    driver = None
+    try:
+        driver = recursos.obter(chave, create_driver, valido=recursos.navegador_ativo)
+        while True:
+            try:
+                i = fila.get_nowait()
+            except queue.Empty:
+                break
+            url = entradas[i][0]
+            print(f"Checking [{i + 1}] {extract_om_name(url)}...", end="\r")
+            anterior = verificacoes[i]
+            verificacoes[i] = check_site_browser(driver, url, timeouts[i] if timeouts else None)
+            if anterior:
+                verificacoes[i]["duracao"] += anterior["duracao"]
+                if anterior.get("circuito"):
+                    verificacoes[i]["circuito"] = "meio-aberto"
+    except Exception as e:
+        # Os outros navegadores continuam esvaziando a fila
+        print(f"\nErro Crítico Selenium (navegador {slot}): {e}")
+    finally:
+        recursos.liberar(chave, driver)
+
+def build_results(sites, verificacoes):
+    """
+    Monta a tabela e as ocorrências na ordem do sites.json.
+    Ocorrências com a mesma mensagem compartilham o ID (numeradas na ordem em que aparecem).
+    """
+    resultados = []
+    lista_ocorrencias = []
+    ocorrencias_unicas = {}
+
+    for idx, ((om, url), verificacao) in enumerate(zip(sites, verificacoes), start=1):
+        msg_erro = verificacao["ocorrencia"]
+        status_text = "S/A"
+        cor_status = "GREEN"
+        id_oc = "-"
+        if msg_erro:
+            status_text = "C.O."
+            cor_status = "RED"
+            if msg_erro not in ocorrencias_unicas:
+                ocorrencias_unicas[msg_erro] = str(len(ocorrencias_unicas) + 1)
+                lista_ocorrencias.append([ocorrencias_unicas[msg_erro], msg_erro, "-"])
+            id_oc = ocorrencias_unicas[msg_erro]
+
+        resultados.append([str(idx), om, url, status_text, id_oc, cor_status])
+        manifesto.registrar("site", url, verificacao["duracao"], status_text,
+                            ocorrencia=msg_erro, metodo=verificacao["metodo"],
+                            revalidacao=verificacao.get("revalidacao"), timeout=verificacao.get("timeout"),
+                            circuito=verificacao.get("circuito"), preflight=verificacao.get("detalhe"))
+    return resultados, lista_ocorrencias
+
+def update_site_health(entradas, verificacoes):
+    """
+    Fecha a execução na tabela saude: falha (inacessível) ou sucesso com o tempo de carga do navegador.
+    Sites não verificados (navegador indisponível) não contam nem como falha nem como sucesso.
+    """
+    registros = []
+    for (url, _), verificacao in zip(entradas, verificacoes):
+        if is_unreachable(verificacao["ocorrencia"]):
+            registros.append((url, None, verificacao["ocorrencia"]))
+        elif verificacao["conclusivo"]:
+            registros.append((url, verificacao.get("duracao_carga"), None))
+    try:
+        historico_sites.atualizar_saude(registros)
+    except Exception as e:
+        print(f"⚠ Não foi possível atualizar o histórico de carga: {e}")
+
+def import_legacy_hashes(urls):
+    """Leva os output/hashes/*.txt para o banco (uma vez só; os nomes de arquivo são derivados da URL)"""
+    arquivos = {}
+    if HASH_DIR.is_dir():
+        for url in urls:
+            for metodo in ("navegador", "http"):
+                caminho = get_hash_file_path(url, metodo)
+                if caminho.exists():
+                    arquivos[(url, metodo)] = caminho
+    try:
+        historico_sites.importar_arquivos(arquivos)
+    except Exception as e:
+        print(f"⚠ Importação de output/hashes falhou: {e}")
 
 def collect_sites_data():
     """
-    Carrega sites do JSON, roda Selenium e retorna dados para o PDF.
+    Carrega sites do JSON, verifica via HTTP (Selenium só quando necessário) e retorna dados para o PDF.
     Retorno: (dados_tabela, dados_ocorrencias)
     """
     urls_do_arquivo = load_sites_list()
@@ -108,85 +525,68 @@ def collect_sites_data():
     if not urls_do_arquivo:
         return [], [["-", "ERRO: Lista de sites vazia ou arquivo JSON não encontrado", "-"]]
 
-    SITES_PARA_MONITORAR = [(extract_om_name(url), url) for url in urls_do_arquivo]
-    
-    driver = None
-    resultados = []
-    lista_ocorrencias = []
-    ocorrencias_unicas = {}
-    proximo_id = 1
+    entradas = [parse_site_entry(item) for item in urls_do_arquivo]
+    SITES_PARA_MONITORAR = [(extract_om_name(url), url) for url, _ in entradas]
+    import_legacy_hashes([url for url, _ in entradas])
 
     print(f">>> Módulo Sites: Iniciando verificação de {len(SITES_PARA_MONITORAR)} endereços...")
-    
+
+    # Histórico de cada site: timeout de carga e circuito (falhou nas últimas CIRCUITO_FALHAS execuções)
     try:
-        driver = create_driver()
-        
-        for idx, (om, url) in enumerate(SITES_PARA_MONITORAR, start=1):
-            print(f"Checking [{idx}] {om}...", end="\r")
-            status_text = "S/A"
-            cor_status = "GREEN"
-            id_oc = "-"
-            msg_erro = None
+        estatisticas = historico_sites.saude([url for url, _ in entradas])
+    except Exception as e:
+        print(f"⚠ Histórico de carga indisponível, usando timeouts fixos: {e}")
+        estatisticas = {}
+    timeouts = [get_page_timeout(estatisticas.get(url)) for url, _ in entradas]
+    circuito = [(estatisticas.get(url) or {}).get("falhas_seguidas", 0) >= CIRCUITO_FALHAS for url, _ in entradas]
+    if any(circuito):
+        print(f">>> Módulo Sites: {sum(circuito)} site(s) com circuito aberto, verificados primeiro por sonda rápida")
 
-            try:
-                original_url = url
-                driver.set_page_load_timeout(30)
-                driver.get(url)
-                
-                try: WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                except: pass 
-
-                final_url = driver.current_url
-                orig_p = urlparse(original_url)
-                fin_p = urlparse(final_url)
-                
-                # Lógica Redirecionamento
-                if orig_p.netloc.lower() != fin_p.netloc.lower():
-                    msg_erro = f"Redirecionado para externo: {fin_p.netloc}"
-                else:
-                    path_lower = fin_p.path.lower()
-                    if "/error" in path_lower or "/404" in path_lower or "pagina-nao-encontrada" in path_lower:
-                         msg_erro = f"Página de erro: {fin_p.path}"
-
-                # Lógica Hash/Conteúdo
-                if not msg_erro:
-                    html = driver.page_source
-                    if "404 - File or directory not found" in html:
-                        msg_erro = "Erro 404 detectado"
-                    else:
-                        norm = normalize_html(html)
-                        imgs = extract_image_sets(html)
-                        comb = f"TEXT:{norm}|IMAGES:{sorted(imgs.items())}"
-                        curr_hash = hashlib.sha256(comb.encode("utf-8")).hexdigest()
-                        
-                        hf = get_hash_file_path(url)
-                        if hf.exists():
-                            if curr_hash != hf.read_text(encoding="utf-8").strip():
-                                msg_erro = "Alteração visual detectada"
-                                hf.write_text(curr_hash, encoding="utf-8")
-                        else:
-                            hf.write_text(curr_hash, encoding="utf-8")
-
-            except Exception as e:
-                msg_erro = "Site inacessível / Timeout"
-            
-            if msg_erro:
-                status_text = "C.O."
-                cor_status = "RED"
-                if msg_erro in ocorrencias_unicas:
-                    id_oc = ocorrencias_unicas[msg_erro]
-                else:
-                    id_oc = str(proximo_id)
-                    ocorrencias_unicas[msg_erro] = id_oc
-                    lista_ocorrencias.append([id_oc, msg_erro, "-"])
-                    proximo_id += 1
-
-            resultados.append([str(idx), om, url, status_text, id_oc, cor_status])
+    # 0. Pré-verificação: DNS, TCP e TLS de todos os hosts ao mesmo tempo; quem não alcança já tem veredito
+    verificacoes = [None] * len(entradas)
+    if PREFLIGHT:
+        for i, verificacao in run_preflight(entradas).items():
+            verificacoes[i] = verificacao
 
-    except Exception as e:
-        print(f"\nErro Crítico Selenium: {e}")
+    # 1. Caminho rápido: HTTP em paralelo (e sondas dos circuitos abertos)
+    etapa_http = [i for i, (_, exige_navegador) in enumerate(entradas)
+                  if verificacoes[i] is None and (not exige_navegador or circuito[i])]
+    sessao = create_http_session()
+    try:
+        with ThreadPoolExecutor(max_workers=HTTP_WORKERS, thread_name_prefix="sites-http") as executor:
+            tarefas = executor.map(manifesto.propagar(lambda i: check_site_fast(sessao, entradas[i][0], entradas[i][1], circuito[i])), etapa_http)
+            for i, verificacao in zip(etapa_http, tarefas):
+                verificacoes[i] = verificacao
     finally:
-        if driver: driver.quit()
+        sessao.close()
+
+    # 2. Navegador: sites marcados como JS e respostas HTTP inconclusivas
+    pendentes = [i for i, v in enumerate(verificacoes) if v is None or not v["conclusivo"]]
+    revalidados = sum(1 for v in verificacoes if v and v.get("revalidacao"))
+    via_http = sum(1 for v in verificacoes if v and v["conclusivo"] and v["metodo"] == "http")
+    print(f">>> Módulo Sites: {via_http} verificados via HTTP "
+          f"({revalidados} sem mudança pelo cache), {len(pendentes)} pelo navegador")
+    if pendentes and any(t < TIMEOUT_CARGA_MAX for t in timeouts):
+        print(f">>> Módulo Sites: timeouts de carga adaptativos entre "
+              f"{min(timeouts[i] for i in pendentes):.0f} e {max(timeouts[i] for i in pendentes):.0f} s")
+
+    if pendentes:
+        fila = queue.Queue()
+        for i in pendentes:
+            fila.put(i)
+        navegadores = get_browser_pool_size(len(pendentes))
+        print(f">>> Módulo Sites: {navegadores} navegador(es) em paralelo")
+        with ThreadPoolExecutor(max_workers=navegadores, thread_name_prefix="sites-navegador") as executor:
+            for slot in range(1, navegadores + 1):
+                executor.submit(manifesto.propagar(browser_worker), slot, fila, entradas, verificacoes, timeouts)
+
+    # Navegador não abriu: o site entra como ocorrência em vez de sumir do relatório
+    for i, v in enumerate(verificacoes):
+        if v is None or not v["conclusivo"]:
+            verificacoes[i] = {"metodo": "navegador", "conclusivo": False,
+                               "ocorrencia": "Não verificado: navegador indisponível",
+                               "duracao": v["duracao"] if v else 0}
 
+    update_site_health(entradas, verificacoes)
     print("\n>>> Módulo Sites: Finalizado.")
-    return resultados, lista_ocorrencias
\ No newline at end of file
+    return build_results(SITES_PARA_MONITORAR, verificacoes)
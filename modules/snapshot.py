@@ -0,0 +1,85 @@
+"""
+SNAPSHOT DOS DADOS COLETADOS
+Guarda tudo o que entrou no relatório em output/snapshots/<data>/snapshot.json
+(gráficos como .png ao lado, no mesmo formato dos checkpoints).
+Com ele o 'main.py render' refaz o PDF (e reenvia, se pedido) sem coletar de novo.
+"""
+import datetime
+import json
+import os
+import shutil
+from pathlib import Path
+
+from modules import checkpoint
+
+SNAPSHOT_DIR = Path("output/snapshots")
+ARQUIVO = "snapshot.json"
+# Sobe quando o formato dos dados de algum coletor mudar de forma incompatível
+VERSAO = 1
+RETENCAO_DIAS = int(os.getenv("SNAPSHOT_RETENCAO_DIAS", "30"))
+
+def get_pasta(data=None):
+    data = data or datetime.datetime.now().strftime('%Y-%m-%d')
+    return SNAPSHOT_DIR / data
+
+def resolver_pasta(referencia=None):
+    """Aceita None (hoje), uma data YYYY-MM-DD ou o caminho da pasta/arquivo do snapshot"""
+    if referencia:
+        caminho = Path(referencia)
+        if caminho.name == ARQUIVO:
+            return caminho.parent
+        if caminho.is_dir():
+            return caminho
+    return get_pasta(referencia)
+
+def salvar(resultados, data=None, **extra):
+    """
+    Grava o snapshot do dia a partir do retorno de coleta.executar_coletores.
+    A pasta é montada ao lado e trocada no fim, para não misturar PNGs de execuções diferentes.
+    """
+    pasta = get_pasta(data)
+    tmp = pasta.with_name(pasta.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    coletores = {}
+    for nome, r in resultados.items():
+        coletores[nome] = {"status": r["status"], "erro": r["erro"],
+                           "duracao": r["duracao"], "prazo": r.get("prazo"),
+                           "dados": checkpoint.codificar(r["dados"], tmp, nome, [0])}
+    conteudo = {"versao": VERSAO, "data": pasta.name,
+                "gerado_em": datetime.datetime.now().isoformat(timespec="seconds"),
+                "coletores": coletores}
+    conteudo.update(extra)
+    (tmp / ARQUIVO).write_text(json.dumps(conteudo, ensure_ascii=False, indent=1), encoding="utf-8")
+
+    shutil.rmtree(pasta, ignore_errors=True)
+    os.replace(tmp, pasta)
+    _remover_antigos()
+    print(f">> Snapshot dos dados: {pasta / ARQUIVO}")
+    return pasta
+
+def carregar(referencia=None):
+    """
+    Lê o snapshot e devolve (data, resultados) no mesmo formato de coleta.executar_coletores.
+    Levanta FileNotFoundError se não existir e ValueError se a versão for desconhecida.
+    """
+    pasta = resolver_pasta(referencia)
+    conteudo = json.loads((pasta / ARQUIVO).read_text(encoding="utf-8"))
+    versao = conteudo.get("versao")
+    if versao != VERSAO:
+        raise ValueError(f"snapshot versão {versao} não suportada (esperada {VERSAO})")
+
+    resultados = {}
+    for nome, r in conteudo["coletores"].items():
+        resultados[nome] = dict(r, dados=checkpoint.decodificar(r["dados"], pasta))
+    return conteudo["data"], resultados
+
+def _remover_antigos():
+    if RETENCAO_DIAS <= 0:
+        return
+    limite = (datetime.datetime.now() - datetime.timedelta(days=RETENCAO_DIAS)).strftime('%Y-%m-%d')
+    for pasta in SNAPSHOT_DIR.iterdir():
+        # Nomes de pasta são datas ISO: a comparação de strings basta
+        if pasta.is_dir() and not pasta.name.endswith(".tmp") and pasta.name < limite:
+            shutil.rmtree(pasta, ignore_errors=True)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Os módulos são importados como 'modules.x', a partir da raiz do projeto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
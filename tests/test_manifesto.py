@@ -0,0 +1,40 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from modules import coleta, manifesto
+
+
+def test_pool_de_workers_herda_o_coletor():
+    def coletor():
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="sites-http") as executor:
+            list(executor.map(manifesto.propagar(lambda i: manifesto.registrar("site", f"s{i}", 0.1)), range(3)))
+        return True
+
+    manifesto.iniciar()
+    resultados = coleta.executar_coletores([("sites", coletor)])
+
+    assert resultados["sites"]["status"] == "ok"
+    assert {e["coletor"] for e in manifesto.etapas("site")} == {"sites"}
+    assert manifesto.etapas("coletor")[0]["coletor"] is None
+
+
+def test_thread_abandonada_nao_escreve_na_proxima_execucao(monkeypatch):
+    monkeypatch.setenv("COLETA_TIMEOUT_LENTO", "0.05")
+    liberar = threading.Event()
+
+    def lento():
+        liberar.wait(5)
+        manifesto.registrar("grafico", "atrasado", 0.1)
+        return True
+
+    manifesto.iniciar(tentativa=1)
+    assert coleta.executar_coletores([("lento", lento)])["lento"]["status"] == "timeout"
+
+    manifesto.iniciar(tentativa=2)
+    thread = coleta._threads["lento"]
+    liberar.set()
+    thread.join(5)
+    manifesto.registrar("grafico", "atual", 0.1)
+
+    assert [e["nome"] for e in manifesto.etapas("grafico")] == ["atual"]
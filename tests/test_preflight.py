@@ -0,0 +1,21 @@
+from modules import preflight, sites
+
+
+def _resultado(falha):
+    return {"host": "h", "porta": 443, "falha": falha, "detalhe": "x", "duracao": 0.1}
+
+
+def test_falha_tls_segue_para_http_e_navegador(monkeypatch):
+    alcance = {"https://legado": _resultado("tls"), "https://fora": _resultado("recusada"),
+               "https://ok": _resultado(None)}
+    monkeypatch.setattr(preflight, "verificar", lambda urls: alcance)
+
+    falhas = sites.run_preflight([("https://legado", False), ("https://fora", False), ("https://ok", False)])
+
+    assert list(falhas) == [1]
+    assert sites.is_unreachable(falhas[1]["ocorrencia"])
+
+
+def test_handshake_aceita_servidores_legados():
+    contexto = preflight._contexto_tls()
+    assert contexto.minimum_version == preflight.ssl.TLSVersion.MINIMUM_SUPPORTED
@@ -0,0 +1,41 @@
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from modules import pulsar_api
+
+
+def _params(url):
+    return {k: v[0] for k, v in parse_qs(urlsplit(url).query).items()}
+
+
+def test_id_numerico_passa_intacto():
+    capturada_em = time.time() - 3600
+    inicio = int(capturada_em) - 86400
+    url = (f"https://portal/api/terminals?customerId=1234567890&accountId=9876543210123"
+           f"&startDate={inicio}&page=0&size=50")
+
+    params = _params(next(pulsar_api.montar_consultas(url, capturada_em)))
+
+    assert params["customerId"] == "1234567890"
+    assert params["accountId"] == "9876543210123"
+    assert abs(int(params["startDate"]) - (inicio + 3600)) <= 1
+
+
+def test_epoch_perto_da_captura_desloca_mesmo_sem_chave_de_data():
+    capturada_em = time.time() - 600
+    valor = str(int(capturada_em * 1000))
+    novo = pulsar_api._deslocar_data(valor, 600, capturada_em)
+    assert int(novo) - int(valor) == 600_000
+
+
+def test_data_iso_fora_da_janela_fica():
+    assert pulsar_api._deslocar_data("2020-01-01", 3600, time.time()) == "2020-01-01"
+    assert pulsar_api._deslocar_data("2020-01-01", 86400, time.time(), chave_data=True) == "2020-01-02"
+
+
+def test_chave_de_data():
+    assert pulsar_api.chave_de_data("startDate")
+    assert pulsar_api.chave_de_data("date_from")
+    assert pulsar_api.chave_de_data("until")
+    assert not pulsar_api.chave_de_data("customerId")
+    assert not pulsar_api.chave_de_data("token")
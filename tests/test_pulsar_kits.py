@@ -0,0 +1,125 @@
+import time
+
+import pytest
+
+from modules import checkpoint, esperas, pulsar, pulsar_kits
+
+
+class Botao:
+    def __init__(self, driver, passo):
+        self.driver = driver
+        self.passo = passo
+
+    def get_attribute(self, nome):
+        destino = self.driver.pagina + self.passo
+        return None if 0 <= destino < len(self.driver.paginas) else "true"
+
+    def click(self):
+        self.driver.pagina += self.passo
+
+
+class DriverFalso:
+    """Páginas de linhas (OM, KIT real); o KIT só aparece no tooltip (sem atributos no SVG)"""
+
+    def __init__(self, paginas):
+        self.paginas = paginas
+        self.pagina = 0
+        self.hovers = []
+
+    def kit(self, svg):
+        pagina, i = svg
+        return self.paginas[pagina][i][1]
+
+    def execute_script(self, script, *args):
+        if script == pulsar.SCRIPT_LINHAS:
+            return [{'om': om, 'uso': '', 'celulas': 4, 'svgs': 2, 'cores': [], 'marcas': 'green',
+                     'dicas': [], 'svg': (self.pagina, i)} for i, (om, _) in enumerate(self.paginas[self.pagina])]
+        if "table tbody tr" in script:
+            return f"página {self.pagina}"
+        return None
+
+    def find_element(self, *args):
+        return Botao(self, 1)
+
+    def find_elements(self, by, seletor):
+        if "Next" in seletor:
+            return [Botao(self, 1)]
+        if "Previous" in seletor:
+            return [Botao(self, -1)]
+        return [1, 2, 3]
+
+
+@pytest.fixture(autouse=True)
+def ambiente(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(pulsar, "selecionar_maior_pagina", lambda driver: None)
+    monkeypatch.setattr(esperas, "aguardar", lambda driver, nome, condicao, timeout, **kw: condicao(driver) or None)
+    monkeypatch.setattr(pulsar, "kits_por_eventos", lambda driver, svgs: [driver.kit(s) for s in svgs])
+
+    def hover(driver, svg):
+        driver.hovers.append(svg)
+        return driver.kit(svg)
+    monkeypatch.setattr(pulsar, "kit_por_hover", hover)
+    checkpoint.ativar_progresso(False)
+
+
+def semear(monkeypatch, reconfirmar=0, **kits):
+    monkeypatch.setattr(pulsar_kits, "RECONFIRMAR", reconfirmar)
+    agora = time.time()
+    monkeypatch.setattr(pulsar_kits, "_cache", {om: {"kit": kit, "assinatura": "4:2", "confirmado_em": agora}
+                                                for om, kit in kits.items()})
+
+
+@pytest.mark.parametrize("paginas", [
+    [[("OM A", "KIT1"), ("OM B", "KIT2")]],
+    [[("OM A", "KIT1")], [("OM B", "KIT2")]],
+], ids=["mesma página", "página anterior"])
+def test_cache_vencido_na_linha_anterior_e_relido(monkeypatch, paginas):
+    # O cache ainda diz que o KIT2 é da OM A; o portal mostra o KIT2 na OM B
+    semear(monkeypatch, **{"OM A": "KIT2"})
+    driver = DriverFalso(paginas)
+
+    dados = pulsar.extrair_tabela(driver)
+
+    assert {r['om']: r['pop'] for r in dados} == {"OM A": "KIT1", "OM B": "KIT2"}
+    assert pulsar_kits.consultar("OM A", "4:2") == "KIT1"
+
+
+def test_cache_contradito_na_propria_linha_e_relido(monkeypatch):
+    semear(monkeypatch, **{"OM B": "KIT1"})
+    driver = DriverFalso([[("OM A", "KIT1"), ("OM B", "KIT2")]])
+
+    dados = pulsar.extrair_tabela(driver)
+
+    assert {r['om']: r['pop'] for r in dados} == {"OM A": "KIT1", "OM B": "KIT2"}
+    assert driver.hovers == [(0, 1)]
+    assert pulsar_kits.consultar("OM B", "4:2") == "KIT2"
+
+
+def test_so_o_kit_visto_no_portal_renova_a_entrada(monkeypatch):
+    monkeypatch.setattr(pulsar_kits, "RECONFIRMAR", 0.25)
+    dias = 86400
+    agora = time.time()
+    monkeypatch.setattr(pulsar_kits, "_cache", {
+        f"OM {i}": {"kit": f"KIT{i}", "assinatura": "4:2", "confirmado_em": agora - (6 - i * 0.1) * dias}
+        for i in range(8)})
+    driver = DriverFalso([[(f"OM {i}", f"KIT{i}") for i in range(8)]])
+
+    dados = pulsar.extrair_tabela(driver)
+
+    assert [r['pop'] for r in dados] == [f"KIT{i}" for i in range(8)]
+    linhas = pulsar_kits._linhas()
+    # As duas mais antigas passaram pelo tooltip e foram renovadas; as outras continuam com a data antiga
+    assert [linhas[f"OM {i}"]["confirmado_em"] > agora for i in range(8)] == [True, True] + [False] * 6
+
+
+def test_tooltip_que_nao_abre_mantem_o_kit_do_cache(monkeypatch):
+    monkeypatch.setattr(pulsar, "kits_por_eventos", lambda driver, svgs: [""] * len(svgs))
+    monkeypatch.setattr(pulsar, "kit_por_hover", lambda driver, svg: "")
+    semear(monkeypatch, reconfirmar=1, **{"OM A": "KIT1"})
+    confirmado = pulsar_kits._linhas()["OM A"]["confirmado_em"]
+
+    dados = pulsar.extrair_tabela(DriverFalso([[("OM A", "KIT1")]]))
+
+    assert dados[0]['pop'] == "KIT1"
+    assert pulsar_kits._linhas()["OM A"]["confirmado_em"] == confirmado
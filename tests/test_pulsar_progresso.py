@@ -0,0 +1,69 @@
+import pytest
+
+from modules import checkpoint, esperas, pulsar, pulsar_kits
+
+
+class Botao:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def get_attribute(self, nome):
+        return "true" if self.driver.pagina == self.driver.paginas - 1 else None
+
+    def click(self):
+        if self.driver.pagina != self.driver.travar_em:
+            self.driver.pagina += 1
+
+
+class DriverFalso:
+    """Tabela com 'paginas' páginas de 3 linhas; em 'travar_em' o Next não troca a página"""
+
+    def __init__(self, paginas=3, travar_em=None):
+        self.paginas = paginas
+        self.travar_em = travar_em
+        self.pagina = 0
+
+    def execute_script(self, script, *args):
+        if script == pulsar.SCRIPT_LINHAS:
+            return [{'om': f'OM {self.pagina}-{i}', 'uso': '', 'celulas': 4, 'svgs': 2, 'cores': [],
+                     'marcas': 'green', 'dicas': [f'KIT{self.pagina}{i}'], 'svg': object()} for i in range(3)]
+        if "table tbody tr" in script:
+            return f"página {self.pagina}"
+        return None
+
+    def find_element(self, *args):
+        return Botao(self)
+
+    def find_elements(self, by, seletor):
+        return [Botao(self)] if "Next" in seletor else [1, 2, 3]
+
+
+@pytest.fixture(autouse=True)
+def ambiente(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(pulsar_kits, "_cache", None)
+    monkeypatch.setattr(pulsar, "selecionar_maior_pagina", lambda driver: None)
+    # Sem espera de verdade: a condição vale ou não na primeira checagem
+    monkeypatch.setattr(esperas, "aguardar", lambda driver, nome, condicao, timeout, **kw: condicao(driver) or None)
+    yield
+    checkpoint.ativar_progresso(False)
+
+
+def test_pagina_que_nao_troca_nao_avanca_o_progresso():
+    checkpoint.ativar_progresso(True)
+    with pytest.raises(RuntimeError):
+        pulsar.extrair_tabela(DriverFalso(travar_em=1))
+    progresso = checkpoint.carregar(pulsar.PROGRESSO)
+    assert progresso["pagina"] == 2
+    assert len(progresso["registros"]) == 6
+
+    # A próxima tentativa pula as duas páginas lidas e termina
+    dados = pulsar.extrair_tabela(DriverFalso())
+    assert [r['pop'] for r in dados] == [f"KIT{p}{i}" for p in range(3) for i in range(3)]
+    assert checkpoint.carregar(pulsar.PROGRESSO) is None
+
+
+def test_sem_fluxo_do_relatorio_nao_usa_progresso():
+    with pytest.raises(RuntimeError):
+        pulsar.extrair_tabela(DriverFalso(travar_em=1))
+    assert checkpoint.carregar(pulsar.PROGRESSO) is None
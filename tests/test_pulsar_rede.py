@@ -0,0 +1,84 @@
+import pytest
+
+from modules import pulsar, pulsar_kits, pulsar_rede
+
+# (nome da service line, KIT ou None, online)
+TERMINAIS = [
+    ("4º BIS - DEF - Epitaciolândia", "KIT304059859", True),
+    ("7º BIS - Base Kaianaú", None, False),
+    ("HGuT", "KIT304039751", False),
+    ("5º BIS – 3º PEF - São Joaquim", None, True),
+    ("34º BIS - Oiapoque", "KIT304132549", True),
+]
+
+VERDE = "rgb(76, 175, 80)"
+VERMELHO = "rgb(244, 67, 54)"
+
+
+def payload():
+    itens = []
+    for nome, kit, online in TERMINAIS:
+        item = {"serviceLineName": nome, "online": online}
+        if kit:
+            item["kitSerialNumber"] = kit
+        itens.append(item)
+    return {"content": itens, "totalElements": len(itens)}
+
+
+def linhas_tabela():
+    return [{'om': nome, 'uso': '', 'celulas': 4, 'svgs': 2, 'cores': [VERDE if online else VERMELHO],
+             'marcas': '', 'dicas': [kit] if kit else [], 'svg': object()}
+            for nome, kit, online in TERMINAIS]
+
+
+class Botao:
+    def get_attribute(self, nome):
+        return "true"
+
+
+class DriverFalso:
+    def execute_script(self, script, *args):
+        return linhas_tabela() if script == pulsar.SCRIPT_LINHAS else None
+
+    def find_element(self, *args):
+        return Botao()
+
+    def find_elements(self, *args):
+        return []
+
+    def get_cookies(self):
+        return []
+
+
+class ColetorFalso:
+    def aguardar_registros(self, timeout=20):
+        registros, total = pulsar_rede.extrair_registros(payload())
+        return registros, total, "https://portal/api/terminals"
+
+
+@pytest.fixture(autouse=True)
+def pasta_temporaria(tmp_path, monkeypatch):
+    # output/ (descoberta da API, cache de KITs, progresso) fica fora do projeto
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(pulsar_kits, "_cache", None)
+    monkeypatch.setattr(pulsar, "PULSAR_TOOLTIP", "mouse")
+    monkeypatch.setattr(pulsar, "kit_por_hover", lambda driver, svg: "")
+
+
+def test_terminal_sem_kit_fica_como_na():
+    registros, total = pulsar_rede.extrair_registros(payload())
+    assert total == len(TERMINAIS)
+    assert [(r['om'], r['pop']) for r in registros] == [(nome, kit or "N/A") for nome, kit, _ in TERMINAIS]
+
+
+def test_lista_sem_nenhum_kit_nao_e_de_terminais():
+    registros, _ = pulsar_rede.extrair_registros({"usuarios": [{"name": "Fulano"}, {"name": "Beltrano"}]})
+    assert registros == []
+
+
+def test_rede_e_tabela_dao_o_mesmo_resultado():
+    pela_rede = pulsar.extrair_via_rede(DriverFalso(), ColetorFalso())
+    pela_tabela = pulsar.extrair_tabela(DriverFalso())
+
+    assert len(pela_rede) == len(TERMINAIS)
+    assert pela_rede == pela_tabela